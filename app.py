@@ -1,1115 +1,1208 @@
-import streamlit as st
-import pandas as pd
-import io
-import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go 
-import time 
-
-# ==============================================================================
-# 1. CONFIGURACIÓN Y TÍTULO GLOBAL (NAVBAR)
-# ==============================================================================
-st.set_page_config(page_title="FTE App", layout="wide")
-
-st.markdown("""
-    <style>
-        .block-container {padding-top: 1rem;}
-        .stTabs [data-baseweb="tab-list"] {gap: 10px;}
-        .stTabs [data-baseweb="tab"] {height: 50px; white-space: pre-wrap; background-color: #f0f2f6; border-radius: 4px 4px 0px 0px; gap: 1px; padding-top: 10px; padding-bottom: 10px;}
-        .stTabs [aria-selected="true"] {background-color: #ffffff; border-bottom: 2px solid #ff4b4b;}
-    </style>
-""", unsafe_allow_html=True)
-
-
-st.markdown("---") 
-
-# PESTAÑAS
-tab1, tab2, tab_diario, tab_demanda, tab_contingencia, tab_desglose, tab3 = st.tabs([
-    "✅ Validación de Pesos", 
-    "⏱️ Productividad FTE MENSUAL", 
-    "⏱️ Productividad FTE DIARIO", 
-    "📈 Demanda FTE (Caso Estándar)", 
-    "🚨 Demanda FTE (Caso Contingencia)",
-    "📊 Desglose de Tiempos",
-    "🗓️ Días Trabajados"
-])
-
-# ==============================================================================
-# BARRA LATERAL
-# ==============================================================================
-st.sidebar.title("📊 FTE App")
-st.sidebar.markdown("---") 
-st.sidebar.header("📂 Carga de Archivos")
-file_solicitudes = st.sidebar.file_uploader("1. Excel Solicitudes (Power APP)", type=['xlsx'])
-st.sidebar.markdown("--") 
-file_pesos = st.sidebar.file_uploader("2. Excel Pesos", type=['xlsx'])
-st.sidebar.markdown("--") 
-file_prod = st.sidebar.file_uploader("3. Excel Días Trabajados (Contiene las vacaciones)", type=['xlsx'])
-
-def limpiar_texto(texto):
-    if pd.isna(texto):
-        return ""
-    texto_str = str(texto).upper().strip()
-    texto_str = texto_str.replace('\xa0', ' ')
-    texto_str = " ".join(texto_str.split())
-    return texto_str
-
-# ==============================================================================
-# PESTAÑA 1: VALIDACIÓN
-# ==============================================================================
-with tab1:
-    st.subheader("🕵️ Validación de Pesos y Solicitudes")
-    st.info("Acá verificamos que todos los procesos del PowerAPP tienen su peso respectivo en el excel de Pesos")
-    if file_solicitudes and file_pesos:
-        st.info("Analizando coincidencias...")
-        try:
-            df_sol = pd.read_excel(file_solicitudes)
-            df_pesos_data = pd.read_excel(file_pesos)
-        except Exception as e:
-            st.error(f"Error al leer archivos: {e}")
-            st.stop()
-
-        df_sol.columns = df_sol.columns.str.strip()
-        col_resolutor = None
-        for posible in ['Resolutor', 'RESOLUTOR', 'Nombre Resolutor', 'Nombre Técnico']:
-            if posible in df_sol.columns:
-                col_resolutor = posible
-                break
-        
-        if col_resolutor:
-            df_sol.rename(columns={col_resolutor: 'Resolutor'}, inplace=True)
-            empleados_permitidos = [
-                "JESSICA ACUNA VELASQUEZ", "ALEJANDRA MATUS DURAN", "DIANA CARRASCO HERRERA",
-                "CLEMENTINA GALAZ MATTA", "BRENDA OLGUIN QUIROZ", 
-                "STEPHANIE CIFUENTES LUENGO", "KARINNA ALVAREZ MORALES"
-            ]
-            df_sol['Resolutor'] = df_sol['Resolutor'].astype(str).str.upper().str.strip()
-            df_sol = df_sol[df_sol['Resolutor'].isin(empleados_permitidos)].copy()
-            st.success(f"✅ Filtro de personal aplicado: {len(df_sol)} registros.")
-        else:
-            st.warning("⚠️ No encontré columna 'Resolutor'.")
-
-        if 'Tipo de Pedido' not in df_sol.columns:
-            st.error("Falta la columna 'Tipo de Pedido'.")
-            st.stop()
-        
-        df_sol['Tipo de Pedido Normalizado'] = df_sol['Tipo de Pedido'].apply(limpiar_texto)
-
-        correcciones_manuales = {
-            "1. SOLICITUDES NIVEL 2": "SOLICITUDES NIVEL 2",
-            "ACLARACIONES DE CARGOS ABONOS": "ACLARACIONES DE CARGOS Y ABONOS",
-            "CERTIFICADO DE SALDO": "CERTIFICADO DE SALDOS",
-            "CONDONACION DE GASTOS": "CONDONACIÓN DE GASTOS",
-            "ENTREGA DE PAGARES ABOGADO ASIGNADO": "ENTREGA DE PAGARÉS ABOGADO ASIGNADO",
-            "INICIO - TERMINO DE DÍA CONTABLE": "INICIO - TÉRMINO DE DÍA CONTABLE",
-            "SIMULACIÓN DE CRÉDITOS": "SIMULACIÓN DE CRÉDITO",
-            "PAGO DE HONORARIOS": "PAGO HONORARIOS",
-            "SOLICITUD EMISIÓN DE PAGARÉ": "SOLICITUD EMISIÓN PAGARÉ",
-            "APLICACIÓN DE REMATE, DACIÓN EN PAGO O CONSIGNACIONES": "APLICACIÓN DE REMATE, DACIÓN EN PAGO O CONSIGNAC",
-            "EMISIÓN DE VALE VISTA VIRTUAL O ABONO A CUENTA BCI U OTRO BANCO": "EMISIÓN DE VALE VISTA VIRTUAL O ABONO A CUENTA BCI",
-            "ANB EMISIÓN DE VALE VISTA VIRTUAL O ABONO A CUENTA BCI U OTRO BANCO": "EMISIÓN DE VALE VISTA VIRTUAL O ABONO A CUENTA BCI",
-            "FOGAPE: CURSES PRORROGAS , MODIFICACIONES Y SEGUIMIENTO": "FOGAPE: CURSES PRÓRROGAS, MODIFICACIONES Y SEGUI",
-            "PROCESO LIR - CONDONACIÓN POR SENTENCIA DE TÉRMINO": "PROCESO LIR - CONDONACIÓN POR SENTENCIA DE TÉRMI",
-            "TRASLADO DE PAGARES": "RECEPCIÓN PAGARÉS OFICINA", 
-            "INICIO DE DÍA CONTABLE": "INICIO - TÉRMINO DE DÍA CONTABLE"
-        }
-        df_sol['Tipo de Pedido Normalizado'] = df_sol['Tipo de Pedido Normalizado'].replace(correcciones_manuales)
-
-        df_pesos_data.columns = df_pesos_data.columns.str.strip()
-        df_pesos_data['TIPO DE PEDIDO'] = df_pesos_data['TIPO DE PEDIDO'].apply(limpiar_texto)
-        dict_scores = df_pesos_data.set_index('TIPO DE PEDIDO')['Score'].to_dict()
-
-        df_sol['Score_Encontrado'] = df_sol['Tipo de Pedido Normalizado'].map(dict_scores)
-        df_faltantes = df_sol[df_sol['Score_Encontrado'].isna()].copy()
-
-        if len(df_faltantes) > 0:
-            st.error(f"⛔ Faltan {len(df_faltantes)} Scores.")
-            resumen_faltantes = df_faltantes['Tipo de Pedido Normalizado'].value_counts().reset_index()
-            resumen_faltantes.columns = ['NOMBRE EXACTO A COPIAR', 'CANTIDAD']
-            st.warning(f"""1. Copia el nombre y agrega el proceso al excel de Pesos
-2. Asignale un Peso 
-3. Cambiale la columna Peso y Score (IMPORTANTE CAMBIAR AMBOS)
-4. Sube el archivo actualizado""")
-            st.table(resumen_faltantes)
-        else:
-            st.success("✅ Todos los procesos tienen Score.")
-            df_sol['Score_Final'] = df_sol['Score_Encontrado'] + 2.5 
-            
-            buffer = io.BytesIO()
-            with pd.ExcelWriter(buffer) as writer:
-                df_sol.to_excel(writer, index=False)
-            
-            st.download_button("📥 Descargar Excel Scores", data=buffer, file_name="Solicitudes_Scores.xlsx")
-    else:
-        st.warning("👈 Carga 'Solicitudes' y 'Pesos' en la barra lateral.")
-
-# ==============================================================================
-# PESTAÑA 2: CÁLCULO DE FTE MENSUAL
-# ==============================================================================
-with tab2:
-    st.subheader("🚀 Cálculo de FTE Mensual")
-    st.markdown("Cruce de **Scores** + **Tiempos** para calcular carga laboral.")
-    
-    with st.form("formulario_configuracion_mensual"):
-        st.write("Configuración de parámetros:")
-        col_conf1, col_conf2, col_conf3 = st.columns(3)
-        with col_conf1:
-            OLE_USADO_M = st.number_input("Factor OLE (Eficiencia)", value=0.66, step=0.01, min_value=0.1, max_value=1.0, key="ole_m")
-        with col_conf2:
-            HORA_DIARIA_M = st.number_input("Horas Diarias Contrato", value=7.9, step=0.01, key="hora_m")
-        with col_conf3:
-            ANIO_SELECCIONADO_M = st.number_input("📅 Año a Procesar", value=2025, step=1, min_value=2023, max_value=2030, key="anio_m")
-        st.caption("Ajusta los valores y presiona el botón.")
-        submitted_m = st.form_submit_button("🔄 Calcular FTE Mensual", type="primary")
-
-    if submitted_m:
-        if not (file_solicitudes and file_pesos and file_prod):
-            st.warning("⚠️ Faltan archivos. Por favor carga **Solicitudes**, **Pesos** y **Días Trabajados** en el menú lateral.")
-        else:
-            try:
-                progress_text = "Iniciando motor de cálculo..."
-                my_bar = st.progress(0, text=progress_text)
-                
-                my_bar.progress(10, text="📂 Leyendo archivos Excel...")
-                df_s = pd.read_excel(file_solicitudes)
-                df_p = pd.read_excel(file_pesos)
-                
-                my_bar.progress(30, text="🧹 Limpiando y asignando Scores...")
-                col_fecha = None
-                for c in df_s.columns:
-                    if 'fin real' in c.lower():
-                        col_fecha = c
-                        break
-                if col_fecha == None:
-                    for c in df_s.columns:
-                        if 'fecha de creación' in c.lower():
-                            col_fecha = c
-                            break
-                if not col_fecha:
-                    st.error("❌ No encontré la columna de 'Fin Real'.")
-                    st.stop()
-                
-                df_s[col_fecha] = pd.to_datetime(df_s[col_fecha], errors='coerce')
-                df_s['Mes_Num'] = df_s[col_fecha].dt.month
-                df_s['Año'] = df_s[col_fecha].dt.year
-                df_s = df_s.dropna(subset=['Mes_Num', 'Año']) 
-                df_s['Mes_Num'] = df_s['Mes_Num'].astype(int)
-                df_s['Año'] = df_s['Año'].astype(int)
-                df_s = df_s[df_s['Año'] == ANIO_SELECCIONADO_M].copy()
-                
-                if len(df_s) == 0:
-                    st.error(f"⚠️ No hay registros en Solicitudes para el año {ANIO_SELECCIONADO_M}.")
-                    st.stop()
-
-                col_res = [c for c in df_s.columns if 'Resolutor' in c or 'Técnico' in c][0]
-                df_s.rename(columns={col_res: 'Resolutor'}, inplace=True)
-                df_s['Resolutor'] = df_s['Resolutor'].astype(str).str.upper().str.strip()
-                
-                df_s['Tipo Limpio'] = df_s['Tipo de Pedido'].apply(limpiar_texto)
-                df_s['Tipo Limpio'] = df_s['Tipo Limpio'].replace(correcciones_manuales)
-                
-                df_p['TIPO DE PEDIDO'] = df_p['TIPO DE PEDIDO'].apply(limpiar_texto)
-                scores_dict = df_p.set_index('TIPO DE PEDIDO')['Score'].to_dict()
-                
-                df_s['Score_Unitario'] = df_s['Tipo Limpio'].map(scores_dict)
-                df_s['Score_Unitario'] = df_s['Score_Unitario'].fillna(0) + 2.5 
-                
-                df_pedidos_resumen = df_s.groupby(['Resolutor', 'Mes_Num'])['Score_Unitario'].sum().reset_index()
-
-                my_bar.progress(60, text="⏱️ Calculando tiempos de reuniones y chats...")
-                MAPA_EMPLEADOS = {
-                    "JACUNVE": "JESSICA ACUNA VELASQUEZ", "AMATUSD": "ALEJANDRA MATUS DURAN",
-                    "DCARRAH": "DIANA CARRASCO HERRERA", "CGALAZ": "CLEMENTINA GALAZ MATTA",
-                    "BOLGUIQ": "BRENDA OLGUIN QUIROZ", "SCIFUEN": "STEPHANIE CIFUENTES LUENGO",
-                    "KARINNA": "KARINNA ALVAREZ MORALES"
-                }
-                
-                try:
-                    df_prod_raw = pd.read_excel(file_prod, sheet_name='HorasTotales')
-                except:
-                    df_prod_raw = pd.read_excel(file_prod)
-                
-                col_anio_prod = None
-                for c in df_prod_raw.columns:
-                    if str(c).strip().lower() in ['año', 'anio', 'year', 'ano']:
-                        col_anio_prod = c
-                        break
-                if col_anio_prod:
-                    df_prod_raw = df_prod_raw[df_prod_raw[col_anio_prod] == ANIO_SELECCIONADO_M].copy()
-
-                if "Nombre Técnico" in df_prod_raw.columns:
-                     df_prod_raw["Resolutor"] = df_prod_raw["Nombre Técnico"].map(MAPA_EMPLEADOS)
-                
-                df_equipo = df_prod_raw.dropna(subset=['Resolutor']).copy()
-                tabla_dias = df_equipo.pivot_table(index='Resolutor', columns='Número Mes', values='Dias Trabajados', aggfunc='sum').fillna(0)
-                
-                REU_SEMANAL_TOTAL = (20 * 3) + 50 + 50 
-                MINUTOS_REU_DIARIA = REU_SEMANAL_TOTAL / 5
-                tabla_reuniones = tabla_dias * MINUTOS_REU_DIARIA
-                for m in [1, 7]:
-                    if m in tabla_reuniones.columns:
-                        tabla_reuniones.loc[tabla_reuniones[m] > 0, m] += 60 
-                        
-                MIN_CHAT_STD = 47
-                MIN_CHAT_ESP = 90
-                tabla_chats = tabla_dias * MIN_CHAT_STD
-                if "BRENDA OLGUIN QUIROZ" in tabla_chats.index:
-                    tabla_chats.loc["BRENDA OLGUIN QUIROZ"] = tabla_dias.loc["BRENDA OLGUIN QUIROZ"] * MIN_CHAT_ESP
-
-                my_bar.progress(85, text="🔄 Cruzando datos y generating KPI...")
-                def pivotar_tabla(df_wide, nombre_valor):
-                    df_wide = df_wide.reset_index()
-                    df_wide.columns = [str(c) for c in df_wide.columns]
-                    vars_cols = [c for c in df_wide.columns if c != 'Resolutor']
-                    df_melted = df_wide.melt(id_vars=['Resolutor'], value_vars=vars_cols, var_name='Mes_Num', value_name=nombre_valor)
-                    df_melted['Mes_Num'] = pd.to_numeric(df_melted['Mes_Num'], errors='coerce')
-                    return df_melted.dropna(subset=['Mes_Num'])
-
-                df_reuniones_long = pivotar_tabla(tabla_reuniones, 'Minutos_Reunion')
-                df_dias_long = pivotar_tabla(tabla_dias, 'Dias_Trabajados')
-                df_chat_long = pivotar_tabla(tabla_chats, 'Minutos_Chat')
-
-                df_final = pd.merge(df_reuniones_long, df_pedidos_resumen, on=['Resolutor', 'Mes_Num'], how='left').fillna(0)
-                df_final = pd.merge(df_final, df_dias_long, on=['Resolutor', 'Mes_Num'], how='left').fillna(0)
-                df_final = pd.merge(df_final, df_chat_long, on=['Resolutor', 'Mes_Num'], how='left').fillna(0)
-
-                df_final = df_final[ (df_final['Dias_Trabajados'] > 0) | (df_final['Score_Unitario'] > 0) ]
-
-                def calcular_fte_row(row):
-                    horas_p = HORA_DIARIA_M - 1 if row['Resolutor'] == "STEPHANIE CIFUENTES LUENGO" else HORA_DIARIA_M
-                    denominador = (horas_p * 60 * row['Dias_Trabajados'] * OLE_USADO_M)
-                    if denominador == 0: return 0
-                    numerador = row['Score_Unitario'] + row['Minutos_Reunion'] + row['Minutos_Chat']
-                    return numerador / denominador
-
-                df_final['FTE'] = df_final.apply(calcular_fte_row, axis=1)
-                df_final = df_final.sort_values(by=['Mes_Num', 'Resolutor'])
-
-                df_fte_mes = df_final.groupby(["Mes_Num"])["FTE"].sum().reset_index()
-                df_fte_mes['Personas Efectivas'] = np.ceil(df_fte_mes['FTE']).astype(int)
-                
-                df_final.insert(1, 'Año', ANIO_SELECCIONADO_M)
-                df_fte_mes.insert(0, 'Año', ANIO_SELECCIONADO_M)
-
-                st.session_state['df_fte_final'] = df_final
-                st.session_state['df_fte_mes'] = df_fte_mes
-                st.session_state['anio_calculado'] = ANIO_SELECCIONADO_M
-                st.session_state['calculo_realizado'] = True
-                
-                my_bar.progress(100, text="✅ ¡Cálculo completado!")
-                time.sleep(1)
-                my_bar.empty()
-
-            except Exception as e:
-                st.error(f"Ocurrió un error en el cálculo: {e}")
-                st.write("Detalle del error:", e)
-    
-    if st.session_state.get('calculo_realizado'):
-        df_final = st.session_state['df_fte_final']
-        df_fte_mes = st.session_state['df_fte_mes']
-        anio_actual = st.session_state.get('anio_calculado', '---')
-        
-        st.success(f"Visualizando datos del año: **{anio_actual}**")
-
-        subtab_graf, subtab_datos = st.tabs(["📈 Visualización Gráfica", "📋 Tablas y Descarga"])
-        
-        with subtab_graf:
-            st.markdown("#### Análisis Gráfico de FTE")
-            lista_personas = ["Todos"] + list(df_final['Resolutor'].unique())
-            seleccion = st.selectbox("Filtrar por:", lista_personas)
-            
-            if seleccion == "Todos":
-                df_grafico = df_fte_mes.melt(
-                    id_vars=['Mes_Num', 'Año'], 
-                    value_vars=['FTE', 'Personas Efectivas'],
-                    var_name='Indicador', 
-                    value_name='Valor'
-                )
-                df_grafico['Mes_Num'] = df_grafico['Mes_Num'].astype(str)
-                
-                fig = px.bar(
-                    df_grafico, x='Mes_Num', y='Valor', color='Indicador',
-                    barmode='group', title=f'FTE Mensual {anio_actual} vs Capacidad Mínima',
-                    text_auto='.2f',
-                    color_discrete_map={'FTE': '#1f77b4', 'Personas Efectivas': '#ff7f0e'}
-                )
-                
-                # Línea de capacidad real
-                df_capacidad_linea = df_final[df_final['Dias_Trabajados'] > 0].groupby('Mes_Num')['Resolutor'].nunique().reset_index()
-                df_capacidad_linea.rename(columns={'Resolutor': 'Capacidad_Real'}, inplace=True)
-                
-                if not df_capacidad_linea.empty:
-                    df_capacidad_linea['Mes_Num'] = df_capacidad_linea['Mes_Num'].astype(str)
-                    fig.add_scatter(
-                        x=df_capacidad_linea['Mes_Num'],
-                        y=df_capacidad_linea['Capacidad_Real'],
-                        mode='lines+markers',
-                        name='Capacidad Real (Personas Activas)',
-                        line=dict(color='#00CC96', width=3, dash='dot')
-                    )
-
-                fig.update_layout(xaxis_title="Mes", yaxis_title="Valor FTE / Personas")
-                st.plotly_chart(fig, use_container_width=True)
-                
-            else:
-                df_persona = df_final[df_final['Resolutor'] == seleccion].copy()
-                df_persona['Mes_Num'] = df_persona['Mes_Num'].astype(str)
-                
-                fig = px.bar(
-                    df_persona, x='Mes_Num', y='FTE',
-                    title=f'Evolución FTE {anio_actual}: {seleccion}',
-                    text_auto='.2f',
-                    color_discrete_sequence=['#2ca02c']
-                )
-                fig.add_hline(y=1, line_dash="dash", line_color="red", annotation_text="Límite (1.0)", annotation_position="top right")
-                fig.add_hline(y=0.8, line_dash="dash", line_color="green", annotation_text="Meta (0.8)", annotation_position="bottom right")
-                fig.update_layout(xaxis_title="Mes", yaxis_title="FTE (Carga Laboral)")
-                st.plotly_chart(fig, use_container_width=True)
-
-        with subtab_datos:
-            st.subheader("1. Detalle por Persona y Mes")
-            st.dataframe(df_final.style.format({"FTE": "{:.2f}", "Score_Unitario": "{:.0f}", "Año": "{:.0f}"}), use_container_width=True)
-            st.subheader("2. Resumen Gerencial (FTE Total x Mes)")
-            st.dataframe(df_fte_mes.style.format({"FTE": "{:.2f}", "Año": "{:.0f}"}), use_container_width=True)
-            buffer_fte = io.BytesIO()
-            with pd.ExcelWriter(buffer_fte) as writer:
-                df_final.to_excel(writer, sheet_name="Detalle_FTE", index=False)
-                df_fte_mes.to_excel(writer, sheet_name="Resumen_Mes", index=False)
-            st.download_button("📥 Descargar Reporte FTE Completo", data=buffer_fte, file_name=f"Reporte_FTE_{anio_actual}.xlsx")
-
-# ==============================================================================
-# PESTAÑA 3: CÁLCULO DE FTE DIARIO
-# ==============================================================================
-with tab_diario:
-    st.subheader("⏱️ Cálculo de FTE Diario")
-    st.markdown("Análisis granular día por día para detectar cuellos de botella específicos.")
-
-    with st.form("formulario_configuracion_diario"):
-        st.write("Configuración de parámetros (Diario):")
-        col_d1, col_d2, col_d3 = st.columns(3)
-        with col_d1:
-            OLE_USADO_D = st.number_input("Factor OLE (Eficiencia)", value=0.66, step=0.01, min_value=0.1, max_value=1.0, key="ole_d")
-        with col_d2:
-            HORA_DIARIA_D = st.number_input("Horas Diarias Contrato", value=7.9, step=0.01, key="hora_d")
-        with col_d3:
-            ANIO_SELECCIONADO_D = st.number_input("📅 Año a Procesar", value=2025, step=1, min_value=2023, max_value=2030, key="anio_d")
-            
-        st.caption("Ajusta los valores y presiona el botón.")
-        submitted_d = st.form_submit_button("🔄 Calcular FTE Diario", type="primary")
-
-    if submitted_d:
-        if not (file_solicitudes and file_pesos):
-            st.warning("⚠️ Faltan archivos. Por favor carga **Solicitudes** y **Pesos** en el menú lateral.")
-        else:
-            try:
-                progress_text = "Procesando FTE Diario..."
-                bar_d = st.progress(0, text=progress_text)
-
-                bar_d.progress(10, text="Leyendo datos diarios...")
-                df_s = pd.read_excel(file_solicitudes)
-                df_p = pd.read_excel(file_pesos)
-
-                col_fecha = None
-                for c in df_s.columns:
-                    if 'fin real' in c.lower():
-                        col_fecha = c
-                        break
-                if not col_fecha:
-                    for c in df_s.columns:
-                        if 'fecha de creación' in c.lower():
-                            col_fecha = c
-                            break
-                if not col_fecha:
-                    st.error("No se encontró columna de fecha en Solicitudes.")
-                    st.stop()
-
-                df_s[col_fecha] = pd.to_datetime(df_s[col_fecha], errors='coerce')
-                df_s['Fecha'] = df_s[col_fecha].dt.date
-                df_s['Año'] = df_s[col_fecha].dt.year
-                
-                df_s = df_s.dropna(subset=['Fecha', 'Año'])
-                df_s = df_s[df_s['Año'] == ANIO_SELECCIONADO_D].copy()
-                
-                if len(df_s) == 0:
-                    st.error(f"No hay datos para el año {ANIO_SELECCIONADO_D}")
-                    st.stop()
-
-                col_res = [c for c in df_s.columns if 'Resolutor' in c or 'Técnico' in c][0]
-                df_s.rename(columns={col_res: 'Resolutor'}, inplace=True)
-                df_s['Resolutor'] = df_s['Resolutor'].astype(str).str.upper().str.strip()
-
-                empleados_permitidos_d = [
-                    "JESSICA ACUNA VELASQUEZ", "ALEJANDRA MATUS DURAN", "DIANA CARRASCO HERRERA",
-                    "CLEMENTINA GALAZ MATTA", "BRENDA OLGUIN QUIROZ", 
-                    "STEPHANIE CIFUENTES LUENGO", "KARINNA ALVAREZ MORALES"
-                ]
-                df_s = df_s[df_s['Resolutor'].isin(empleados_permitidos_d)].copy()
-
-                df_s['Tipo Limpio'] = df_s['Tipo de Pedido'].apply(limpiar_texto).replace(correcciones_manuales)
-                df_p['TIPO DE PEDIDO'] = df_p['TIPO DE PEDIDO'].apply(limpiar_texto)
-                scores_dict = df_p.set_index('TIPO DE PEDIDO')['Score'].to_dict()
-                
-                df_s['Score_Unitario'] = df_s['Tipo Limpio'].map(scores_dict).fillna(0) + 2.5 
-
-                bar_d.progress(50, text="Calculando carga diaria...")
-                df_diario = df_s.groupby(['Resolutor', 'Fecha'])['Score_Unitario'].sum().reset_index()
-
-                REU_SEMANAL_TOTAL = (20 * 3) + 50 + 50 
-                MINUTOS_REU_DIARIA = REU_SEMANAL_TOTAL / 5 
-                MIN_CHAT_STD = 47
-                MIN_CHAT_ESP = 90
-
-                def calc_datos_fila(row):
-                    min_chat = MIN_CHAT_ESP if row['Resolutor'] == "BRENDA OLGUIN QUIROZ" else MIN_CHAT_STD
-                    carga_minutos = row['Score_Unitario'] + MINUTOS_REU_DIARIA + min_chat
-                    horas_p = HORA_DIARIA_D - 1 if row['Resolutor'] == "STEPHANIE CIFUENTES LUENGO" else HORA_DIARIA_D
-                    capacidad_minutos_ind = horas_p * 60 * OLE_USADO_D
-                    fte_ind = carga_minutos / capacidad_minutos_ind if capacidad_minutos_ind > 0 else 0
-                    return pd.Series([carga_minutos, fte_ind])
-
-                df_diario[['Carga_Minutos', 'FTE_Diario']] = df_diario.apply(calc_datos_fila, axis=1)
-                df_diario = df_diario.sort_values(by=['Resolutor', 'Fecha'])
-
-                st.session_state['df_diario'] = df_diario
-                st.session_state['anio_diario'] = ANIO_SELECCIONADO_D
-                st.session_state['calc_diario_ok'] = True
-                
-                bar_d.progress(100, text="✅ Terminado")
-                time.sleep(1)
-                bar_d.empty()
-            
-            except Exception as e:
-                st.error(f"Error en cálculo diario: {e}")
-
-    if st.session_state.get('calc_diario_ok'):
-        df_diario = st.session_state['df_diario']
-        anio_d = st.session_state['anio_diario']
-        
-        st.success(f"Visualizando Detalle Diario: **{anio_d}**")
-        tab_d_graf, tab_d_data = st.tabs(["📈 Gráficos de Línea", "📋 Datos Diarios"])
-
-        with tab_d_graf:
-            st.markdown("#### Evolución Diaria de Carga Laboral")
-            lista_personas_d = ["Todos"] + list(df_diario['Resolutor'].unique())
-            seleccion_d = st.selectbox("Filtrar por Resolutor (Diario):", lista_personas_d)
-
-            if seleccion_d == "Todos":
-                df_total_diario = df_diario.groupby('Fecha').agg(Carga_Total=('Carga_Minutos', 'sum')).reset_index()
-                capacidad_estandar_minutos = HORA_DIARIA_D * 60 * OLE_USADO_D
-                
-                if capacidad_estandar_minutos > 0:
-                    df_total_diario['FTE_Logrado'] = df_total_diario['Carga_Total'] / capacidad_estandar_minutos
-                else:
-                    df_total_diario['FTE_Logrado'] = 0
-
-                df_total_diario['Personas_Necesarias'] = np.ceil(df_total_diario['FTE_Logrado'])
-
-                fig_fte = px.line(
-                    df_total_diario, x='Fecha', y='FTE_Logrado',
-                    title=f" Productividad Diaria (FTE) - {anio_d}",
-                    markers=True, color_discrete_sequence=['#ff7f0e'] 
-                )
-                fig_fte.update_layout(yaxis_title="FTE (Exacto)")
-                st.plotly_chart(fig_fte, use_container_width=True)
-
-                st.markdown("---")
-                st.markdown("Si el FTE es de 4,6 lo aproximamos a 5, ya que no existen 4,6 personas. Por ende, acá podemos ver cuanta gente tuvo que trabajar ese día:")
-                
-                fig_comparativo = px.line(
-                    df_total_diario, x='Fecha', y='Personas_Necesarias', 
-                    title=f"Productividad Diaria Redondeada (FTE) - {anio_d}",
-                    markers=True, color_discrete_sequence=['#d62728']
-                )
-                fig_comparativo.update_layout(yaxis_title="Cantidad de Personas", hovermode="x unified")
-                fig_comparativo.update_yaxes(tick0=0, dtick=1)
-                st.plotly_chart(fig_comparativo, use_container_width=True)
-
-            else:
-                df_persona_d = df_diario[df_diario['Resolutor'] == seleccion_d].copy()
-                fig_d = px.line(
-                    df_persona_d, x='Fecha', y='FTE_Diario',
-                    title=f"FTE Diario - {seleccion_d} ({anio_d})",
-                    markers=True, color_discrete_sequence=['#1f77b4'] 
-                )
-                fig_d.add_hline(y=1, line_dash="dash", line_color="red", annotation_text="Límite (1.0)")
-                fig_d.add_hline(y=0.8, line_dash="dash", line_color="green", annotation_text="Meta (0.8)")
-                fig_d.update_layout(yaxis_title="FTE Diario")
-                st.plotly_chart(fig_d, use_container_width=True)
-
-        with tab_d_data:
-            st.dataframe(df_diario.style.format({"FTE_Diario": "{:.2f}", "Carga_Minutos": "{:.0f}"}), use_container_width=True)
-            buffer_dia = io.BytesIO()
-            with pd.ExcelWriter(buffer_dia) as writer:
-                df_diario.to_excel(writer, sheet_name="FTE_Diario_Detalle", index=False)
-            st.download_button("📥 Descargar Excel Diario", data=buffer_dia, file_name=f"FTE_Diario_{anio_d}.xlsx")
-
-# ==============================================================================
-# PESTAÑA 4: DEMANDA FTE (IDEAL)
-# ==============================================================================
-with tab_demanda:
-    st.subheader("🔮 Demanda FTE (Carga Ideal según Días Hábiles)")
-    st.markdown("""
-    Esta simulación calcula cuántas personas se necesitan en un escenario ideal:
-    - **Numerador:** Carga real (Scores) + Carga Administrativa proyectada (Reuniones/Chat x Días Hábiles x Personas).
-    - **Denominador:** Capacidad ideal de una persona trabajando **todos los días hábiles** del mes.
-    """)
-
-    with st.form("form_demanda_ideal"):
-        c_dem1, c_dem2, c_dem3 = st.columns(3)
-        with c_dem1:
-            OLE_DEMANDA = st.number_input("Factor OLE", value=0.66, step=0.01, key="ole_dem")
-        with c_dem2:
-            HORA_DEMANDA = st.number_input("Horas Diarias", value=7.95, step=0.01, key="hor_dem")
-        with c_dem3:
-            ANIO_DEMANDA = st.number_input("📅 Año a Analizar", value=2025, step=1, key="anio_dem")
-            
-        bt_demanda = st.form_submit_button("Calculadora de Demanda Ideal", type="primary")
-
-    if bt_demanda:
-        if not (file_solicitudes and file_pesos):
-             st.warning("⚠️ Carga Solicitudes y Pesos primero.")
-        else:
-            try:
-                df_s = pd.read_excel(file_solicitudes)
-                df_p = pd.read_excel(file_pesos)
-                
-                col_fecha = None
-                for c in df_s.columns:
-                    if 'fin real' in c.lower():
-                        col_fecha = c
-                        break
-                if not col_fecha:
-                      for c in df_s.columns:
-                        if 'fecha de creación' in c.lower():
-                            col_fecha = c
-                            break
-                
-                df_s[col_fecha] = pd.to_datetime(df_s[col_fecha], errors='coerce')
-                df_s['Mes_Num'] = df_s[col_fecha].dt.month
-                df_s['Año'] = df_s[col_fecha].dt.year
-                df_s = df_s[df_s['Año'] == ANIO_DEMANDA].copy()
-                
-                col_res = [c for c in df_s.columns if 'Resolutor' in c or 'Técnico' in c][0]
-                df_s.rename(columns={col_res: 'Resolutor'}, inplace=True)
-                df_s['Resolutor'] = df_s['Resolutor'].astype(str).str.upper().str.strip()
-                
-                empleados_permitidos_dem = [
-                    "JESSICA ACUNA VELASQUEZ", "ALEJANDRA MATUS DURAN", "DIANA CARRASCO HERRERA",
-                    "CLEMENTINA GALAZ MATTA", "BRENDA OLGUIN QUIROZ", 
-                    "STEPHANIE CIFUENTES LUENGO", "KARINNA ALVAREZ MORALES"
-                ]
-                df_s = df_s[df_s['Resolutor'].isin(empleados_permitidos_dem)]
-
-                df_s['Tipo Limpio'] = df_s['Tipo de Pedido'].apply(limpiar_texto).replace(correcciones_manuales)
-                df_p['TIPO DE PEDIDO'] = df_p['TIPO DE PEDIDO'].apply(limpiar_texto)
-                scores_dict = df_p.set_index('TIPO DE PEDIDO')['Score'].to_dict()
-                df_s['Score_Unitario'] = df_s['Tipo Limpio'].map(scores_dict).fillna(0) + 2.5
-                
-                df_base = df_s.groupby(['Resolutor', 'Mes_Num'])['Score_Unitario'].sum().reset_index()
-                resumen_demanda = []
-
-                REU_SEMANAL_TOTAL = (20 * 3) + 50 + 50 
-                MINUTOS_REU_DIARIA = REU_SEMANAL_TOTAL / 5 
-                MIN_CHAT_STD = 47
-                MIN_CHAT_ESP = 90
-                
-                for index, row in df_base.iterrows():
-                    resolutor = row['Resolutor']
-                    mes = int(row['Mes_Num'])
-                    score_tickets = row['Score_Unitario']
-                    
-                    fecha_inicio = f"{int(ANIO_DEMANDA)}-{mes:02d}-01"
-                    inicio = pd.Timestamp(fecha_inicio)
-                    fin = inicio + pd.offsets.MonthEnd(0)
-                    dias_habiles = np.busday_count(inicio.date(), fin.date() + pd.Timedelta(days=1))
-                    
-                    min_chat = MIN_CHAT_ESP if resolutor == "BRENDA OLGUIN QUIROZ" else MIN_CHAT_STD
-                    carga_admin_total = (MINUTOS_REU_DIARIA + min_chat) * dias_habiles
-                    numerador_total = score_tickets + carga_admin_total
-                    
-                    horas_p = HORA_DEMANDA - 1 if resolutor == "STEPHANIE CIFUENTES LUENGO" else HORA_DEMANDA
-                    capacidad_ideal = horas_p * 60 * dias_habiles * OLE_DEMANDA
-                    fte_ideal = numerador_total / capacidad_ideal if capacidad_ideal > 0 else 0
-                    
-                    resumen_demanda.append({
-                        'Mes_Num': mes,
-                        'Resolutor': resolutor,
-                        'Dias_Habiles': dias_habiles,
-                        'Score_Tickets': score_tickets,
-                        'Carga_Admin': carga_admin_total,
-                        'Carga_Total': numerador_total,
-                        'Capacidad_Individual': capacidad_ideal,
-                        'FTE_Ideal': fte_ideal
-                    })
-                
-                df_demanda = pd.DataFrame(resumen_demanda)
-
-                if not df_demanda.empty:
-                    df_demanda_mes = df_demanda.groupby('Mes_Num').agg(
-                        FTE_Ideal_Total=('FTE_Ideal', 'sum'),
-                        Dias_Habiles_Prom=('Dias_Habiles', 'max') 
-                    ).reset_index()
-                    
-                    FACTOR_SHRINKAGE = 0.80
-                    df_demanda_mes['Headcount_Requerido'] = df_demanda_mes['FTE_Ideal_Total'] / FACTOR_SHRINKAGE
-                    df_demanda_mes['Personas_A_Contratar'] = np.ceil(df_demanda_mes['Headcount_Requerido'])
-                    
-                    st.markdown("#### Resultado: Plantilla Necesaria ")
-                    fig_dem = px.bar(
-                        df_demanda_mes, x='Mes_Num', y='Headcount_Requerido',
-                        title=f"Dimensionamiento FTE {int(ANIO_DEMANDA)} (Plantilla Necesaria)",
-                        text_auto='.2f', labels={'Headcount_Requerido': 'Plantilla Exacta (Decimales)'},
-                        color_discrete_sequence=['#ff7f0e'] 
-                    )
-                    
-                    fig_dem.add_trace(go.Bar(
-                        x=df_demanda_mes['Mes_Num'], y=df_demanda_mes['Personas_A_Contratar'],
-                        name='Contratación Sugerida (Redondeo)', text=df_demanda_mes['Personas_A_Contratar'],
-                        textposition='auto', marker_color='rgba(255, 0, 0, 0.3)',
-                        marker_line_width=2, marker_line_color='red'
-                    ))
-
-                    fig_dem.update_layout(barmode='overlay')
-                    st.plotly_chart(fig_dem, use_container_width=True)
-                    
-                    st.write("### Detalle de Cálculo")
-                    st.info("Nota: Se muestra únicamente la **Plantilla Necesaria** (que incluye el Shrinkage de 17%).")
-                    st.dataframe(df_demanda_mes)
-                    
-                    with st.expander("Ver desglose por Resolutor (Ideal)"):
-                        st.dataframe(df_demanda)
-
-                else:
-                    st.warning("No se generaron datos. Revisa el año seleccionado.")
-
-            except Exception as e:
-                st.error(f"Error en Demanda FTE: {e}")
-
-# ==============================================================================
-# PESTAÑA 5: DEMANDA FTE (CONTINGENCIA)
-# ==============================================================================
-with tab_contingencia:
-    st.subheader("🚨 Demanda FTE (Caso Contingencia)")
-    st.markdown("""
-    **Escenario de Emergencia/Contingencia:**
-    - Se eliminan tiempos de reuniones y chats.
-    - Se asume que el personal está **100% dedicado a Procesos (Full Proceso)**.
-    """)
-
-    with st.form("form_demanda_contingencia"):
-        c_cont1, c_cont2, c_cont3 = st.columns(3)
-        with c_cont1:
-            OLE_CONT = st.number_input("Factor OLE", value=0.66, step=0.01, key="ole_cont")
-        with c_cont2:
-            HORA_CONT = st.number_input("Horas Diarias", value=7.95, step=0.01, key="hor_cont")
-        with c_cont3:
-            ANIO_CONT = st.number_input("📅 Año a Analizar", value=2025, step=1, key="anio_cont")
-            
-        bt_contingencia = st.form_submit_button("Calculadora de Contingencia", type="primary")
-
-    if bt_contingencia:
-        if not (file_solicitudes and file_pesos):
-             st.warning("⚠️ Carga Solicitudes y Pesos primero.")
-        else:
-            try:
-                df_s = pd.read_excel(file_solicitudes)
-                df_p = pd.read_excel(file_pesos)
-                
-                col_fecha = None
-                for c in df_s.columns:
-                    if 'fin real' in c.lower():
-                        col_fecha = c
-                        break
-                if not col_fecha:
-                      for c in df_s.columns:
-                        if 'fecha de creación' in c.lower():
-                            col_fecha = c
-                            break
-                
-                df_s[col_fecha] = pd.to_datetime(df_s[col_fecha], errors='coerce')
-                df_s['Mes_Num'] = df_s[col_fecha].dt.month
-                df_s['Año'] = df_s[col_fecha].dt.year
-                df_s = df_s[df_s['Año'] == ANIO_CONT].copy()
-                
-                col_res = [c for c in df_s.columns if 'Resolutor' in c or 'Técnico' in c][0]
-                df_s.rename(columns={col_res: 'Resolutor'}, inplace=True)
-                df_s['Resolutor'] = df_s['Resolutor'].astype(str).str.upper().str.strip()
-                
-                empleados_permitidos_cont = [
-                    "JESSICA ACUNA VELASQUEZ", "ALEJANDRA MATUS DURAN", "DIANA CARRASCO HERRERA",
-                    "CLEMENTINA GALAZ MATTA", "BRENDA OLGUIN QUIROZ", 
-                    "STEPHANIE CIFUENTES LUENGO", "KARINNA ALVAREZ MORALES"
-                ]
-                df_s = df_s[df_s['Resolutor'].isin(empleados_permitidos_cont)]
-
-                df_s['Tipo Limpio'] = df_s['Tipo de Pedido'].apply(limpiar_texto).replace(correcciones_manuales)
-                df_p['TIPO DE PEDIDO'] = df_p['TIPO DE PEDIDO'].apply(limpiar_texto)
-                scores_dict = df_p.set_index('TIPO DE PEDIDO')['Score'].to_dict()
-                df_s['Score_Unitario'] = df_s['Tipo Limpio'].map(scores_dict).fillna(0) + 2.5
-                
-                df_base = df_s.groupby(['Resolutor', 'Mes_Num'])['Score_Unitario'].sum().reset_index()
-                resumen_contingencia = []
-
-                for index, row in df_base.iterrows():
-                    resolutor = row['Resolutor']
-                    mes = int(row['Mes_Num'])
-                    score_tickets = row['Score_Unitario']
-                    
-                    fecha_inicio = f"{int(ANIO_CONT)}-{mes:02d}-01"
-                    inicio = pd.Timestamp(fecha_inicio)
-                    fin = inicio + pd.offsets.MonthEnd(0)
-                    dias_habiles = np.busday_count(inicio.date(), fin.date() + pd.Timedelta(days=1))
-                    
-                    carga_admin_total = 0 
-                    numerador_total = score_tickets + carga_admin_total
-                    
-                    horas_p = HORA_CONT - 1 if resolutor == "STEPHANIE CIFUENTES LUENGO" else HORA_CONT
-                    capacidad_ideal = horas_p * 60 * dias_habiles * OLE_CONT
-                    fte_ideal = numerador_total / capacidad_ideal if capacidad_ideal > 0 else 0
-                    
-                    resumen_contingencia.append({
-                        'Mes_Num': mes,
-                        'Resolutor': resolutor,
-                        'Dias_Habiles': dias_habiles,
-                        'Score_Tickets': score_tickets,
-                        'Carga_Admin': carga_admin_total, 
-                        'Carga_Total': numerador_total,
-                        'Capacidad_Individual': capacidad_ideal,
-                        'FTE_Ideal': fte_ideal
-                    })
-                
-                df_contingencia = pd.DataFrame(resumen_contingencia)
-
-                if not df_contingencia.empty:
-                    df_cont_mes = df_contingencia.groupby('Mes_Num').agg(
-                        FTE_Ideal_Total=('FTE_Ideal', 'sum'),
-                        Dias_Habiles_Prom=('Dias_Habiles', 'max') 
-                    ).reset_index()
-                    
-                    FACTOR_SHRINKAGE = 0.85 
-                    df_cont_mes['Headcount_Requerido'] = df_cont_mes['FTE_Ideal_Total'] / FACTOR_SHRINKAGE
-                    df_cont_mes['Personas_A_Contratar'] = np.ceil(df_cont_mes['Headcount_Requerido'])
-                    
-                    st.markdown("#### Resultado Contingencia: Plantilla Necesaria (Sin Admin Load)")
-                    fig_cont = px.bar(
-                        df_cont_mes, x='Mes_Num', y='Headcount_Requerido',
-                        title=f"Dimensionamiento CONTINGENCIA {int(ANIO_CONT)} (Solo Procesos)",
-                        text_auto='.2f', labels={'Headcount_Requerido': 'Plantilla Exacta (Decimales)'},
-                        color_discrete_sequence=['#ff7f0e']
-                    )
-                    
-                    fig_cont.add_trace(go.Bar(
-                        x=df_cont_mes['Mes_Num'], y=df_cont_mes['Personas_A_Contratar'],
-                        name='Contratación Sugerida (Redondeo)', text=df_cont_mes['Personas_A_Contratar'],
-                        textposition='auto', marker_color='rgba(214, 39, 40, 0.3)', 
-                        marker_line_width=2, marker_line_color='red'
-                    ))
-
-                    fig_cont.update_layout(barmode='overlay')
-                    st.plotly_chart(fig_cont, use_container_width=True)
-                    
-                    st.write("### Detalle de Cálculo (Contingencia)")
-                    st.dataframe(df_cont_mes)
-                    
-                    with st.expander("Ver desglose por Resolutor (Contingencia)"):
-                        st.dataframe(df_contingencia)
-
-                else:
-                    st.warning("No se generaron datos. Revisa el año seleccionado.")
-
-            except Exception as e:
-                st.error(f"Error en Contingencia FTE: {e}")
-
-
-# ==============================================================================
-# PESTAÑA 6: DESGLOSE DE TIEMPOS OLE
-# ==============================================================================
-with tab_desglose:
-    st.subheader("📊 Desglose de Tiempos (Operación, Reuniones y OLE)")
-    st.markdown("""
-    Esta pestaña desglosa la distribución del tiempo total utilizado por el equipo, 
-    agrupando la operación y separando el OLE en sus correspondientes categorías.
-    """)
-
-    # ----------------------------------------------------------------------
-    # A. PANEL DE CONFIGURACIÓN DINÁMICA DEL OLE
-    # ----------------------------------------------------------------------
-    with st.expander("⚙️ Configurar Minutos Diarios del OLE", expanded=False):
-        with st.form("form_config_ole"):
-            st.markdown("Ajusta los tiempos de pérdida diarios para ver el impacto visual y calcular tu OLE Teórico:")
-            c_ole1, c_ole2, c_ole3, c_ole4 = st.columns(4)
-            with c_ole1:
-                val_horas = st.number_input("Horas Diarias", value=7.95, step=0.01)
-                val_almuerzo = st.number_input("Cat A: Alimentación", value=40.0, step=1.0)
-            with c_ole2:
-                val_fisiologicas = st.number_input("Cat A: Necesidades Fisiológicas (Baño)", value=24.0, step=1.0)
-                val_fatiga = st.number_input("Cat A: Fatiga Básica y Variable", value=28.0, step=1.0)
-            with c_ole3:
-                val_fallas = st.number_input("Cat B: Fallas de Sist.", value=10.0, step=1.0)
-            with c_ole4:
-                val_reu_no_est = st.number_input("Cat C: Reu. No Est.", value=30.4, step=0.1)
-                val_micro = st.number_input("Cat C: MicroTareas", value=30.0, step=1.0)
-            
-            btn_recalcular = st.form_submit_button("🔄 Calcular y Actualizar Gráficos")
-            
-        # Cálculo del OLE directamente fuera del if para que siempre se muestre
-        minutos_totales = val_horas * 60
-        minutos_perdidos = val_fisiologicas + val_fatiga + val_almuerzo + val_fallas + val_reu_no_est + val_micro
-        ole_calc = (minutos_totales - minutos_perdidos) / minutos_totales if minutos_totales > 0 else 0
-        
-        st.info(f"📊 **OLE Teórico Calculado:** **{ole_calc:.1%}** (Se restan {minutos_perdidos:.1f} min de un total de {minutos_totales:.0f} min diarios)")
-    
-    if st.session_state.get('calculo_realizado'):
-        df_desglose = st.session_state['df_fte_final'].copy()
-        anio_desglose = st.session_state.get('anio_calculado', '---')
-        
-        # 1. Filtro por Mes
-        meses_disponibles = ["Todos"] + sorted(list(df_desglose['Mes_Num'].unique()))
-        mes_seleccionado = st.selectbox("📅 Filtrar por Mes:", meses_disponibles)
-        
-        if mes_seleccionado != "Todos":
-            df_desglose = df_desglose[df_desglose['Mes_Num'] == mes_seleccionado].copy()
-            st.success(f"Visualizando desglose del año: **{anio_desglose}** - Mes: **{mes_seleccionado}**")
-        else:
-            st.success(f"Visualizando desglose de todo el año: **{anio_desglose}**")
-
-        # 2. Agrupaciones solicitadas: Operación sumando con tickets y sin tickets
-        df_desglose['Operación (Tickets + Sin Tickets)'] = df_desglose['Score_Unitario'] + df_desglose['Minutos_Chat']
-        df_desglose['Reuniones Estandarizadas (Fijas)'] = df_desglose['Minutos_Reunion']
-        
-        # 3. Desglose del OLE dinámico basado en las variables del expander
-        df_desglose['Cat. A: Necesidades Fisiológicas y Fatiga'] = df_desglose['Dias_Trabajados'] * (val_fisiologicas + val_fatiga)
-        df_desglose['Cat. A: Alimentación'] = df_desglose['Dias_Trabajados'] * val_almuerzo
-        
-        df_desglose['Cat. B: Fallas de Sistema'] = df_desglose['Dias_Trabajados'] * val_fallas
-        df_desglose['Cat. C: Reuniones No Estandarizadas'] = df_desglose['Dias_Trabajados'] * val_reu_no_est
-        df_desglose['Cat. C: MicroTareas (Gestión/Cursos/Soporte/Setup)'] = df_desglose['Dias_Trabajados'] * val_micro
-
-        # --- LÓGICA DE CAPACIDAD LIBRE ---
-        # Calculamos el total de minutos teóricos por persona según sus días trabajados y las horas configuradas
-        def calc_capacidad_libre(row):
-            horas_p = val_horas - 1 if row['Resolutor'] == "STEPHANIE CIFUENTES LUENGO" else val_horas
-            minutos_teoricos_totales = horas_p * 60 * row['Dias_Trabajados']
-            
-            # Sumamos todo lo que hemos "consumido"
-            minutos_consumidos = (
-                row['Operación (Tickets + Sin Tickets)'] +
-                row['Reuniones Estandarizadas (Fijas)'] +
-                row['Cat. A: Necesidades Fisiológicas y Fatiga'] +
-                row['Cat. A: Alimentación'] +
-                row['Cat. B: Fallas de Sistema'] +
-                row['Cat. C: Reuniones No Estandarizadas'] +
-                row['Cat. C: MicroTareas (Gestión/Cursos/Soporte/Setup)']
-            )
-            
-            libre = minutos_teoricos_totales - minutos_consumidos
-            return libre if libre > 0 else 0 # Si da negativo, significa que trabajaron más de su horario (horas extras)
-        
-        df_desglose['Capacidad Libre (Ocio / Proyectos)'] = df_desglose.apply(calc_capacidad_libre, axis=1)
-        # ----------------------------------
-
-        cols_base = [
-            'Operación (Tickets + Sin Tickets)', 
-            'Reuniones Estandarizadas (Fijas)',
-            'Cat. C: Reuniones No Estandarizadas',
-            'Cat. B: Fallas de Sistema',
-            'Cat. C: MicroTareas (Gestión/Cursos/Soporte/Setup)',
-            'Capacidad Libre (Ocio / Proyectos)'
-        ]
-        
-        cols_pausas = [
-            'Cat. A: Necesidades Fisiológicas y Fatiga',
-            'Cat. A: Alimentación'
-        ]
-
-        # 4. Toggle para controlar la visualización
-        st.markdown("---")
-        mostrar_pausas = st.toggle("👁️ Mostrar tiempos de Alimentación y Necesidades Fisiológicas en el análisis", value=False)
-        st.caption("Por defecto estos tiempos se ocultan para analizar estrictamente la carga y fricción operativa. Actívalo para ver la jornada en su totalidad.")
-        
-        if mostrar_pausas:
-            cols_analisis = cols_base + cols_pausas
-        else:
-            cols_analisis = cols_base
-
-        # ----------------------------------------------------------------------
-        # A. Análisis General (Total Equipo)
-        # ----------------------------------------------------------------------
-        df_total = df_desglose[cols_analisis].sum().reset_index()
-        df_total.columns = ['Categoría', 'Minutos Totales']
-        df_total['Horas Totales'] = df_total['Minutos Totales'] / 60
-        df_total['%'] = (df_total['Minutos Totales'] / df_total['Minutos Totales'].sum()) * 100
-
-        col_g1, col_g2 = st.columns([1.5, 1])
-        with col_g1:
-            st.markdown("#### ¿En qué se va el tiempo del equipo?")
-            
-            # Asignamos un color específico para 'Capacidad Libre'
-            color_map = {
-                'Operación (Tickets + Sin Tickets)': '#636EFA',
-                'Reuniones Estandarizadas (Fijas)': '#EF553B',
-                'Cat. C: Reuniones No Estandarizadas': '#00CC96',
-                'Cat. B: Fallas de Sistema': '#AB63FA',
-                'Cat. C: MicroTareas (Gestión/Cursos/Soporte/Setup)': '#FFA15A',
-                'Cat. A: Necesidades Fisiológicas y Fatiga': '#19D3F3',
-                'Cat. A: Alimentación': '#FF6692',
-                'Capacidad Libre (Ocio / Proyectos)': "#D3D3D3" # Color distintivo claro
-            }
-            
-            fig_pie = px.pie(
-                df_total, 
-                names='Categoría', 
-                values='Minutos Totales',
-                hole=0.3,
-                color='Categoría',
-                color_discrete_map=color_map
-            )
-            fig_pie.update_traces(textposition='inside', textinfo='percent+label')
-            st.plotly_chart(fig_pie, use_container_width=True)
-            
-        with col_g2:
-            st.markdown("#### Resumen en Horas")
-            st.dataframe(df_total[['Categoría', 'Horas Totales', '%']].style.format({
-                'Horas Totales': "{:,.0f} hrs",
-                '%': "{:.1f}%"
-            }), use_container_width=True)
-            
-            # Tarjeta de resumen de Capacidad Libre
-            if 'Capacidad Libre (Ocio / Proyectos)' in df_total['Categoría'].values:
-                libre_pct = df_total.loc[df_total['Categoría'] == 'Capacidad Libre (Ocio / Proyectos)', '%'].values[0]
-                libre_hrs = df_total.loc[df_total['Categoría'] == 'Capacidad Libre (Ocio / Proyectos)', 'Horas Totales'].values[0]
-                st.info(f"**💡 Capacidad Libre (Ocio / Proyectos):** El equipo tiene un **{libre_pct:.1f}%** ({libre_hrs:,.0f} hrs) de su tiempo disponible o no registrado operativamente.")
-
-        st.markdown("---")
-
-        # ----------------------------------------------------------------------
-        # B. Análisis Detallado por Persona (Resolutor)
-        # ----------------------------------------------------------------------
-        st.markdown("#### Desglose de Tiempos por Resolutor (En Horas)")
-        df_resolutores = df_desglose.groupby('Resolutor')[cols_analisis].sum().reset_index()
-        
-        # Melt para gráfica apilada
-        df_melt = df_resolutores.melt(id_vars='Resolutor', value_vars=cols_analisis, var_name='Categoría', value_name='Minutos')
-        df_melt['Horas'] = df_melt['Minutos'] / 60
-
-        fig_bar = px.bar(
-            df_melt, x='Resolutor', y='Horas', color='Categoría',
-            text_auto='.0f', title="Distribución de Horas por Empleado",
-            color_discrete_map=color_map
-        )
-        st.plotly_chart(fig_bar, use_container_width=True)
-
-        # ----------------------------------------------------------------------
-        # C. Tabla y Descarga
-        # ----------------------------------------------------------------------
-        st.markdown("#### Datos Crudos (Base Mensual)")
-        # Mostramos siempre todas las columnas en la tabla y descarga para no perder data
-        columnas_mostrar = ['Mes_Num', 'Resolutor', 'Dias_Trabajados'] + cols_base + cols_pausas
-        st.dataframe(df_desglose[columnas_mostrar].style.format(precision=1), use_container_width=True)
-
-        buffer_ole = io.BytesIO()
-        with pd.ExcelWriter(buffer_ole) as writer:
-            df_desglose[columnas_mostrar].to_excel(writer, index=False, sheet_name="Desglose_Tiempos")
-        st.download_button("📥 Descargar Base Completa del Desglose OLE", data=buffer_ole, file_name=f"Desglose_Tiempos_OLE_{anio_desglose}.xlsx")
-
-    else:
-        st.warning("⚠️ Debes correr primero el cálculo en la pestaña 'Productividad FTE MENSUAL' (Pestaña 2) para generar los datos de tiempo.")
-
-
-# ==============================================================================
-# PESTAÑA 7: DETALLE DE TIEMPOS
-# ==============================================================================
-with tab3:
-    st.subheader("⚙️ Días Trabajados (Detalle)")
-    
-    col_t3_1, col_t3_2 = st.columns([1, 3])
-    with col_t3_1:
-        ANIO_DETALLE = st.number_input("📅 Filtro Año", value=2025, step=1, key="anio_tab3")
-
-    if file_prod:
-        try:
-            REU_SEMANAL_TOTAL = 160
-            MINUTOS_REU_DIARIA = 32.0
-            
-            try:
-                df_prod_raw = pd.read_excel(file_prod, sheet_name='HorasTotales')
-            except:
-                df_prod_raw = pd.read_excel(file_prod)
-
-            col_anio_prod = None
-            for c in df_prod_raw.columns:
-                if str(c).strip().lower() in ['año', 'anio', 'year', 'ano']:
-                    col_anio_prod = c
-                    break
-            
-            if col_anio_prod:
-                df_prod_raw = df_prod_raw[df_prod_raw[col_anio_prod] == ANIO_DETALLE].copy()
-                st.info(f"Visualizando datos filtrados por año: {ANIO_DETALLE}")
-            else:
-                st.warning("⚠️ No se detectó columna de Año en el Excel. Se muestran todos los registros disponibles.")
-
-            MAPA_EMPLEADOS = {
-                "JACUNVE": "JESSICA ACUNA VELASQUEZ", "AMATUSD": "ALEJANDRA MATUS DURAN",
-                "DCARRAH": "DIANA CARRASCO HERRERA", "CGALAZ": "CLEMENTINA GALAZ MATTA",
-                "BOLGUIQ": "BRENDA OLGUIN QUIROZ", "SCIFUEN": "STEPHANIE CIFUENTES LUENGO",
-                "KARINNA": "KARINNA ALVAREZ MORALES"
-            }
-
-            if "Nombre Técnico" in df_prod_raw.columns:
-                df_prod_raw["Resolutor"] = df_prod_raw["Nombre Técnico"].map(MAPA_EMPLEADOS)
-                df_equipo = df_prod_raw.dropna(subset=['Resolutor']).copy()
-                
-                tabla_dias = df_equipo.pivot_table(index='Resolutor', columns='Número Mes', values='Dias Trabajados', aggfunc='sum').fillna(0).astype(int)
-                st.write("**Días Trabajados:**")
-                st.dataframe(tabla_dias, use_container_width=True)
-                
-                st.markdown("---")
-                st.subheader("👥 Capacidad Real (Personas Disponibles)")
-                st.caption("Cálculo: (Total Días Trabajados del Mes / Días Hábiles del Mes)")
-
-                df_activos = df_equipo[df_equipo['Dias Trabajados'] > 0].copy()
-
-                if not df_activos.empty:
-                    df_capacidad = df_activos.groupby('Número Mes').agg(
-                        Dias_Totales_Trabajados=('Dias Trabajados', 'sum'),
-                        Dias_Habiles_Mes=('Dias Trabajados', 'max'),
-                        Personas_Activas=('Resolutor', 'nunique') 
-                    ).reset_index()
-
-                    df_capacidad['Personas_Reales_Disponibles'] = df_capacidad['Dias_Totales_Trabajados'] / df_capacidad['Dias_Habiles_Mes']
-                    df_capacidad['Mes'] = df_capacidad['Número Mes'].astype(str)
-                    
-                    fig_capacidad = px.bar(
-                        df_capacidad, x='Mes', y='Personas_Reales_Disponibles',
-                        title=f"Capacidad Efectiva del Equipo (FTE Disponible) - {ANIO_DETALLE}",
-                        text_auto='.2f', labels={'Personas_Reales_Disponibles': 'Personas Completas (FTE)'},
-                        color_discrete_sequence=['#00CC96']
-                    )
-                    
-                    fig_capacidad.add_scatter(
-                        x=df_capacidad['Mes'], y=df_capacidad['Personas_Activas'],
-                        mode='lines+markers', name='Personas Activas (Headcount > 0 días)',
-                        line=dict(color='red', width=2, dash='dot')
-                    )
-                    
-                    st.plotly_chart(fig_capacidad, use_container_width=True)
-                    
-                    format_dict = {
-                        'Personas_Reales_Disponibles': '{:.2f}',
-                        'Dias_Totales_Trabajados': '{:.0f}',
-                        'Dias_Habiles_Mes': '{:.0f}',
-                        'Personas_Activas': '{:.0f}'
-                    }
-                    st.dataframe(df_capacidad.style.format(format_dict))
-                else:
-                    st.info("No hay datos de días trabajados para generar el gráfico de capacidad.")
-                
-                st.write("**Cálculo Rápido:**")
-                st.markdown(f"- Minutos Reunión Diarios: **{MINUTOS_REU_DIARIA}**")
-                st.markdown(f"- Minutos Chats y Correos Estándar: **47** (Especial Brenda: 90)")
-            else:
-                st.error("Falta columna 'Nombre Técnico'")
-        except Exception as e:
-            st.error(f"Error: {e}")
-    else:
-        st.warning("👈 Carga 'Productividad' para ver el detalle.")
\ No newline at end of file
+import streamlit as st
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go 
+import os
+
+from motor_fte import motor
+from motor_fte.calendario import CalendarioHabil, leer_feriados
+from motor_fte.calculo import compilar_plantilla, parametros_por_defecto
+from motor_fte.cubo import construir_cubo, cubo_desde_tickets
+from motor_fte.equipo import MIN_CHAT_STD, MINUTOS_REU_DIARIA, leer_plantilla
+from motor_fte.ingesta import (
+    CacheIngesta, compactar, hash_contenido, leer_dias_trabajados, leer_pesos, leer_solicitudes, leer_solicitudes_streaming,
+    resumen_fechas,
+)
+from motor_fte.diagnostico import ETAPAS_CALCULO, Diagnostico, contar_filas, leer_registro
+from motor_fte.decimacion import MAX_PUNTOS_GRAFICO, decimar
+from motor_fte.exportacion import CacheExportaciones, TIPOS_MIME, extension, formatos_disponibles, nombre_archivo
+from motor_fte.incremental import AlmacenTickets, almacen_disponible
+from motor_fte.paralelo import TRABAJADORES_DEFECTO, cargas_en_paralelo
+from motor_fte.snapshots import AlmacenSnapshots, snapshots_disponibles
+from motor_fte.sugerencias import COLUMNAS_SUGERENCIAS, AlmacenCorrecciones, indice_pesos
+
+# ==============================================================================
+# 1. CONFIGURACIÓN Y TÍTULO GLOBAL (NAVBAR)
+# ==============================================================================
+st.set_page_config(page_title="FTE App", layout="wide")
+
+st.markdown("""
+    <style>
+        .block-container {padding-top: 1rem;}
+        .stTabs [data-baseweb="tab-list"] {gap: 10px;}
+        .stTabs [data-baseweb="tab"] {height: 50px; white-space: pre-wrap; background-color: #f0f2f6; border-radius: 4px 4px 0px 0px; gap: 1px; padding-top: 10px; padding-bottom: 10px;}
+        .stTabs [aria-selected="true"] {background-color: #ffffff; border-bottom: 2px solid #ff4b4b;}
+    </style>
+""", unsafe_allow_html=True)
+
+
+st.markdown("---") 
+
+# VISTAS: a diferencia de st.tabs, solo se ejecuta el código de la vista elegida.
+# Las demás conservan sus resultados en session_state hasta que se vuelven a abrir.
+VISTAS = [
+    "✅ Validación de Pesos", 
+    "⏱️ Productividad FTE MENSUAL", 
+    "⏱️ Productividad FTE DIARIO", 
+    "📈 Demanda FTE (Caso Estándar)", 
+    "🚨 Demanda FTE (Caso Contingencia)",
+    "📊 Desglose de Tiempos",
+    "🗓️ Días Trabajados",
+    "🧪 Sensibilidad OLE / Horas"
+]
+vista = st.radio("Vista", VISTAS, horizontal=True, key="vista", label_visibility="collapsed")
+tab1, tab2, tab_diario, tab_demanda, tab_contingencia, tab_desglose, tab3, tab_sensibilidad = (vista == v for v in VISTAS)
+
+# ==============================================================================
+# BARRA LATERAL
+# ==============================================================================
+st.sidebar.title("📊 FTE App")
+st.sidebar.markdown("---") 
+st.sidebar.header("📂 Carga de Archivos")
+file_solicitudes = st.sidebar.file_uploader("1. Excel Solicitudes (Power APP)", type=['xlsx'])
+st.sidebar.markdown("--") 
+file_pesos = st.sidebar.file_uploader("2. Excel Pesos", type=['xlsx'])
+st.sidebar.markdown("--") 
+file_prod = st.sidebar.file_uploader("3. Excel Días Trabajados (Contiene las vacaciones)", type=['xlsx'])
+st.sidebar.markdown("--") 
+file_feriados = st.sidebar.file_uploader("4. Feriados (Opcional, columna 'Fecha')", type=['xlsx', 'csv'])
+st.sidebar.markdown("--") 
+file_plantilla = st.sidebar.file_uploader(
+    "5. Plantilla de Resolutores (Opcional)", type=['xlsx', 'csv'],
+    help="Una fila por persona con las columnas Resolutor, Usuario (del Excel de Días Trabajados), Equipo, Ajuste Horas, Minutos Chat y Minutos Reunión. Sin archivo se usa el equipo de back-office."
+)
+st.sidebar.markdown("--") 
+usar_snapshot = st.sidebar.checkbox(
+    "⚡ Guardar snapshot columnar de Solicitudes",
+    value=False, disabled=not snapshots_disponibles(),
+    help="Guarda una copia Feather del Excel en el servidor; las próximas cargas del mismo archivo la leen sin volver a parsear el XLSX."
+)
+lectura_liviana = st.sidebar.checkbox(
+    "🪶 Lectura liviana de Solicitudes",
+    value=False,
+    help="Lee el Excel en streaming y carga solo Fecha, Resolutor y Tipo de Pedido del personal del equipo. Recomendado para exportaciones muy grandes (la descarga de Scores sale solo con esas columnas)."
+)
+carga_incremental = st.sidebar.checkbox(
+    "📥 Carga incremental de Solicitudes",
+    value=False, disabled=not almacen_disponible(),
+    help="Guarda los tickets en el servidor (uno por ID) y de cada exportación nueva agrega solo los tickets nuevos o modificados; los meses sin cambios no se recalculan. Los resultados incluyen todos los tickets cargados hasta ahora."
+)
+columnas_compactas = st.sidebar.checkbox(
+    "🧮 Columnas compactas",
+    value=False,
+    help="Guarda Resolutor y Tipo de Pedido como categorías (cada nombre una vez, las filas solo con un código) y los enteros en el tipo más chico. Usa bastante menos memoria con exportaciones grandes; los resultados son los mismos."
+)
+# El almacén depende del equipo y las correcciones, que se eligen más abajo: ahí se vacía
+vaciar_tickets = carga_incremental and st.sidebar.button("🗑️ Vaciar tickets guardados")
+almacen_snapshots = AlmacenSnapshots()
+
+def leer_solicitudes_liviana(datos):
+    # Se filtra por toda la plantilla (no por el equipo elegido): cambiar de equipo no vuelve a leer el Excel
+    return leer_solicitudes_streaming(datos, resolutores=plantilla_completa.empleados())
+
+def leer_solicitudes_app(datos):
+    lector = leer_solicitudes_liviana if lectura_liviana else leer_solicitudes
+    if usar_snapshot:
+        sufijo = ("_liviana" if huella_plantilla is None else f"_liviana_{huella_plantilla[:16]}") if lectura_liviana else ""
+        df = almacen_snapshots.obtener(hash_contenido(datos) + sufijo, datos, lector)
+    else:
+        df = lector(datos)
+    return compactar(df) if columnas_compactas else df
+
+st.sidebar.markdown("--") 
+modo_multi_anio = st.sidebar.toggle(
+    "🗓️ Procesar todos los años",
+    value=False,
+    help="Calcula los resultados de todos los años presentes en los archivos en una sola pasada. Después, cambiar de año solo muestra un resultado ya calculado."
+)
+trabajadores = 1
+if modo_multi_anio:
+    trabajadores = int(st.sidebar.number_input(
+        "🧵 Procesos en paralelo", min_value=1, max_value=max(os.cpu_count() or 1, TRABAJADORES_DEFECTO),
+        value=TRABAJADORES_DEFECTO, step=1, key="trabajadores",
+        help="Con más de 1, cada equipo y año se calcula en un proceso aparte y los resultados se juntan. Conviene con muchos equipos o años; con pocos datos, arrancar los procesos cuesta más que el cálculo."
+    ))
+
+# Cada Excel se parsea una sola vez por contenido y se comparte entre pestañas
+cache_ingesta = CacheIngesta(st.session_state)
+
+def cargar_archivo(clave, archivo, lector, copiar=True):
+    if archivo is None:
+        cache_ingesta.descartar(clave)
+        return None
+    return cache_ingesta.obtener(clave, archivo.getvalue(), lector, copiar=copiar)
+
+# La lectura completa y la liviana, compactas o no, se guardan con claves distintas
+VARIANTES_SOLICITUDES = ["solicitudes", "solicitudes_liviana", "solicitudes_compacta", "solicitudes_liviana_compacta"]
+clave_solicitudes = ("solicitudes_liviana" if lectura_liviana else "solicitudes") + ("_compacta" if columnas_compactas else "")
+for variante in VARIANTES_SOLICITUDES:
+    if variante != clave_solicitudes:
+        cache_ingesta.descartar(variante)
+
+# Si se quita un archivo de la barra lateral, su DataFrame sale de la cache
+for clave_archivo, archivo_cargado in [(clave_solicitudes, file_solicitudes), ("pesos", file_pesos), ("dias_trabajados", file_prod)]:
+    if archivo_cargado is None:
+        cache_ingesta.descartar(clave_archivo)
+
+def cargar_solicitudes(copiar=True):
+    return cargar_archivo(clave_solicitudes, file_solicitudes, leer_solicitudes_app, copiar=copiar)
+
+def cargar_pesos(copiar=True):
+    return cargar_archivo("pesos", file_pesos, leer_pesos, copiar=copiar)
+
+def normalizar_solicitudes(df_s):
+    # El resumen de fechas queda junto al cubo: las filas con fecha ilegible no entran al cálculo
+    df_n = motor.normalizar(df_s, empleados, correcciones)
+    st.session_state['_resumen_fechas'] = resumen_fechas(df_n)
+    return df_n
+
+# Cada aviso se muestra una vez por ejecución, aunque varias vistas pidan el cubo
+avisos_mostrados = set()
+
+def aviso_fechas():
+    resumen = st.session_state.get('_resumen_fechas')
+    if resumen is None or not resumen.invalidas or 'fechas' in avisos_mostrados:
+        return
+    avisos_mostrados.add('fechas')
+    ejemplos = ", ".join(f"'{e}'" for e in resumen.ejemplos)
+    st.warning(
+        f"⚠️ {resumen.invalidas} tickets tienen una fecha de cierre que no se pudo leer (p. ej. {ejemplos}) "
+        "y quedan fuera del cálculo."
+        + (f" Otros {resumen.vacias} no tienen fecha." if resumen.vacias else "")
+        + (f" Formato detectado: `{resumen.formato}`." if resumen.formato else "")
+    )
+
+def almacen_tickets():
+    # Un almacén por plantilla, equipo y correcciones: guarda los tickets ya normalizados con ellos
+    clave = hash_contenido(repr((huella_plantilla, equipo, huella_correcciones)).encode())[:16]
+    almacenes = st.session_state.setdefault('_almacenes_tickets', {})
+    if clave not in almacenes:
+        almacenes[clave] = AlmacenTickets(clave=clave)
+    return almacenes[clave]
+
+def actualizar_cubo_incremental(df_s, huella_sol):
+    # El cubo se arma solo con los tickets del equipo elegido. El cubo anterior se reutiliza
+    # (rehaciendo solo los meses tocados) si lo único que cambió es el archivo de Solicitudes
+    almacen = almacen_tickets()
+    clave_previa = st.session_state.get('_cubo_clave')
+    reutilizar = clave_previa is not None and clave_previa[1:] == huella_sol[1:]
+    cubo_previo = st.session_state.get('_cubo') if reutilizar else None
+    cambios = almacen.actualizar(normalizar_solicitudes(df_s))
+    st.toast(f"📥 {cambios.nuevos} tickets nuevos, {cambios.modificados} modificados, {cambios.repetidos} ya cargados.")
+    tickets = almacen.tickets[almacen.tickets['Resolutor'].isin(empleados)]
+    if cubo_previo is None:
+        return cubo_desde_tickets(tickets)
+    # Con los mismos Pesos, el cubo puntuado sigue valiendo fuera de los meses tocados: solo esos se vuelven a puntuar
+    puntuado = st.session_state.get('_cubo_puntuado')
+    if puntuado is not None and st.session_state.get('_cubo_puntuado_clave') == (clave_previa, cache_ingesta.huella("pesos")):
+        puntuado = puntuado.recalcular_particiones(tickets, cambios.particiones)
+        st.session_state['_cubo_por_puntuar'] = (puntuado.compactado() if columnas_compactas else puntuado, cambios.particiones)
+    return cubo_previo.recalcular_particiones(tickets, cambios.particiones)
+
+def cargar_cubo(diagnostico=None):
+    # Cubo Resolutor × Fecha × Tipo: se arma una vez por archivo de Solicitudes
+    # y solo se vuelve a puntuar (sobre el cubo, no los tickets) si cambian los Pesos
+    diagnostico = diagnostico or Diagnostico()
+    with diagnostico.etapa("lectura") as medicion:
+        df_s = cargar_solicitudes(copiar=False)
+        df_p = cargar_pesos(copiar=False)
+        medicion['filas'] = len(df_s) + len(df_p)
+    huella_sol = (
+        cache_ingesta.huella(clave_solicitudes), carga_incremental, huella_plantilla, equipo, huella_correcciones, columnas_compactas
+    )
+    if st.session_state.get('_cubo_clave') != huella_sol:
+        st.session_state.pop('_cubo_por_puntuar', None)
+        with diagnostico.etapa("limpieza") as medicion:
+            if carga_incremental:
+                cubo = actualizar_cubo_incremental(df_s, huella_sol)
+            else:
+                cubo = construir_cubo(normalizar_solicitudes(df_s))
+            st.session_state['_cubo'] = cubo.compactado() if columnas_compactas else cubo
+            medicion['filas'] = len(st.session_state['_cubo'].tabla)
+        st.session_state['_cubo_clave'] = huella_sol
+        st.session_state.pop('_cubo_puntuado_clave', None)
+    clave = (huella_sol, cache_ingesta.huella("pesos"))
+    if st.session_state.get('_cubo_puntuado_clave') != clave:
+        por_puntuar = st.session_state.pop('_cubo_por_puntuar', None)
+        if por_puntuar is not None:
+            cubo, particiones = por_puntuar
+            st.session_state['_cubo_puntuado'] = diagnostico.medir("scores", motor.puntuar_cubo, cubo, df_p, particiones)
+        else:
+            st.session_state['_cubo_puntuado'] = diagnostico.medir("scores", motor.puntuar_cubo, st.session_state['_cubo'], df_p)
+        st.session_state['_cubo_puntuado_clave'] = clave
+    aviso_fechas()
+    diagnostico.omitir("limpieza", filas=len(st.session_state['_cubo'].tabla))
+    diagnostico.omitir("scores", filas=len(st.session_state['_cubo_puntuado'].tabla))
+    return st.session_state['_cubo_puntuado']
+
+def elegir_anio(resultados, clave, preferido):
+    # Con varios años calculados, cambiar de año solo elige un resultado ya calculado
+    anios = sorted(resultados)
+    if len(anios) == 1:
+        return anios[0]
+    indice = anios.index(preferido) if preferido in anios else len(anios) - 1
+    return st.selectbox("📅 Año a visualizar", anios, index=indice, key=clave)
+
+def resultado_vista(clave, entradas, calcular):
+    # Cada vista guarda su último resultado y solo lo recalcula si cambian sus entradas
+    guardado = st.session_state.get('_vista_' + clave)
+    if guardado is None or guardado[0] != entradas:
+        guardado = (entradas, calcular())
+        st.session_state['_vista_' + clave] = guardado
+    return guardado[1]
+
+def cargas_paralelas():
+    # Todas las cargas (mensual, diaria, demanda y contingencia) de todos los equipos y años en una pasada del pool
+    cubo = cargar_cubo()
+    df_prod = cargar_dias_trabajados(copiar=False) if file_prod else None
+    entradas = (st.session_state['_cubo_puntuado_clave'], cache_ingesta.huella("dias_trabajados"),
+                cache_ingesta.huella("feriados"), trabajadores)
+    return resultado_vista(
+        "cargas_paralelo", entradas, lambda: cargas_en_paralelo(cubo, df_prod, calendario, parametros, trabajadores)
+    )
+
+def cargas_vista(clave, anio, calcular, *huellas):
+    # Cargas (minutos y días) por año: dependen de los archivos y del año, no del OLE ni de las horas.
+    # Los parámetros del cálculo se leen en vivo y en cada rerun solo se repite la división final
+    entradas = (st.session_state['_cubo_puntuado_clave'], *huellas, 'todos' if modo_multi_anio else int(anio))
+    return resultado_vista(clave, entradas, calcular)
+
+def diagnostico_vista(nombre):
+    # La barra avanza cuando termina cada etapa real del cálculo y se borra al final del render
+    barra = st.empty()
+
+    def al_medir(medicion, avance):
+        detalle = medicion.nota or f"{medicion.segundos:.2f} s"
+        barra.progress(avance, text=f"⏱️ {medicion.etapa.capitalize()} ({detalle})")
+
+    return Diagnostico(nombre, ETAPAS_CALCULO, al_medir), barra
+
+def panel_diagnostico(diagnostico):
+    # Cada ejecución que recalculó algo queda en el registro local para ver la evolución de los tiempos;
+    # los reruns que salen enteros de la cache no se registran
+    if not diagnostico.mediciones:
+        return
+    if diagnostico.recalculo:
+        try:
+            diagnostico.registrar()
+        except OSError as e:
+            st.caption(f"No se pudo escribir el registro de diagnóstico: {e}")
+    with st.expander(f"🩺 Diagnóstico de etapas ({diagnostico.segundos_totales:.2f} s)"):
+        st.dataframe(diagnostico.tabla(), hide_index=True, use_container_width=True, column_config={
+            "segundos": st.column_config.NumberColumn("Segundos", format="%.3f"),
+            "filas": st.column_config.NumberColumn("Filas", format="%d"),
+            "memoria_mb": st.column_config.NumberColumn("Δ Memoria (MB)", format="%.1f"),
+        })
+        historial = leer_registro(vista=diagnostico.vista)
+        if historial['ejecucion'].nunique() > 1:
+            st.markdown("**Últimas ejecuciones (segundos por etapa)**")
+            historial['ejecucion'] = historial['ejecucion'].factorize()[0] + 1
+            tendencia = historial.pivot_table(index='ejecucion', columns='etapa', values='segundos', aggfunc='sum')
+            st.line_chart(tendencia)
+
+# Exportaciones: se generan al hacer clic en descargar, no en cada rerun
+if '_exportaciones' not in st.session_state:
+    st.session_state['_exportaciones'] = CacheExportaciones()
+cache_exportaciones = st.session_state['_exportaciones']
+
+def boton_descarga(etiqueta, hojas, nombre_base, clave, *parametros):
+    formatos = formatos_disponibles()
+    col_formato, col_boton = st.columns([1, 3])
+    formato = formatos[col_formato.selectbox("Formato", list(formatos), key=f"formato_{clave}", label_visibility="collapsed")]
+    col_boton.download_button(
+        etiqueta, data=lambda: cache_exportaciones.obtener(hojas, formato, *parametros),
+        file_name=nombre_archivo(nombre_base, formato, len(hojas)),
+        mime=TIPOS_MIME[extension(formato, len(hojas))], key=f"descarga_{clave}"
+    )
+
+# Tablas: formatos por column_config en vez de DataFrame.style (no se serializa un Styler)
+# y, en tablas grandes, solo la página visible viaja al navegador
+FILAS_POR_PAGINA = 1_000
+
+def mostrar_tabla(df, clave, formatos=None, decimales=None):
+    formatos = dict(formatos or {})
+    if decimales is not None:
+        for c in df.select_dtypes('number').columns:
+            formatos.setdefault(c, f"%.{decimales}f")
+    config = {c: st.column_config.NumberColumn(format=f) for c, f in formatos.items() if c in df.columns}
+    if len(df) > FILAS_POR_PAGINA:
+        paginas = -(-len(df) // FILAS_POR_PAGINA)
+        pagina = st.number_input(f"Página (de {paginas})", min_value=1, max_value=paginas, value=1, step=1, key=f"pagina_{clave}")
+        inicio = (pagina - 1) * FILAS_POR_PAGINA
+        st.caption(f"Filas {inicio + 1}–{min(inicio + FILAS_POR_PAGINA, len(df))} de {len(df)}")
+        df = df.iloc[inicio:inicio + FILAS_POR_PAGINA]
+    st.dataframe(df, column_config=config, use_container_width=True)
+
+def cargar_dias_trabajados(copiar=True):
+    return cargar_archivo("dias_trabajados", file_prod, leer_dias_trabajados, copiar=copiar)
+
+# Sin archivo de feriados solo se descuentan los fines de semana
+try:
+    df_feriados = cargar_archivo("feriados", file_feriados, leer_feriados)
+except Exception as e:
+    st.sidebar.error(f"No se pudo leer el archivo de feriados: {e}")
+    df_feriados = None
+calendario = CalendarioHabil(df_feriados['Fecha'] if df_feriados is not None else None)
+
+# Plantilla de resolutores compilada a códigos y arreglos por persona; sin archivo, el equipo de motor_fte.equipo
+try:
+    df_plantilla = cargar_archivo("plantilla", file_plantilla, leer_plantilla, copiar=False)
+except Exception as e:
+    st.sidebar.error(f"No se pudo leer la plantilla de resolutores: {e}")
+    df_plantilla = None
+huella_plantilla = cache_ingesta.huella("plantilla") if df_plantilla is not None else None
+parametros = resultado_vista(
+    "parametros", huella_plantilla,
+    lambda: compilar_plantilla(df_plantilla) if df_plantilla is not None else parametros_por_defecto()
+)
+if st.session_state.get('_plantilla_solicitudes', huella_plantilla) != huella_plantilla:
+    # se leyó filtrando por otra plantilla
+    cache_ingesta.descartar("solicitudes_liviana")
+    cache_ingesta.descartar("solicitudes_liviana_compacta")
+st.session_state['_plantilla_solicitudes'] = huella_plantilla
+
+# Con varios equipos en la plantilla, todo el cálculo usa solo las personas del equipo elegido
+plantilla_completa = parametros
+equipos = list(parametros.nombres_equipo)
+equipo = None
+if len(equipos) > 1:
+    eleccion = st.sidebar.selectbox("👥 Equipo", ["Todos"] + equipos, key="equipo")
+    equipo = None if eleccion == "Todos" else eleccion
+parametros = plantilla_completa.del_equipo(equipo)
+empleados = parametros.empleados()
+mapa_usuarios = parametros.mapa_usuarios
+
+# Correcciones de 'Tipo de Pedido': las de motor_fte.normalizacion más las aceptadas en la Validación
+almacen_correcciones = AlmacenCorrecciones()
+correcciones = almacen_correcciones.vigentes()
+huella_correcciones = hash_contenido(repr(sorted(correcciones.items())).encode())
+if vaciar_tickets:
+    almacen_tickets().vaciar()
+    st.session_state.pop('_cubo_clave', None)
+
+
+# ==============================================================================
+# PESTAÑA 1: VALIDACIÓN
+# ==============================================================================
+if tab1:
+    st.subheader("🕵️ Validación de Pesos y Solicitudes")
+    st.info("Acá verificamos que todos los procesos del PowerAPP tienen su peso respectivo en el excel de Pesos")
+    if file_solicitudes and file_pesos:
+        st.info("Analizando coincidencias...")
+        try:
+            df_sol = cargar_solicitudes(copiar=False)
+            df_pesos_data = cargar_pesos(copiar=False)
+        except Exception as e:
+            st.error(f"Error al leer archivos: {e}")
+            st.stop()
+
+        try:
+            validacion = resultado_vista(
+                "validacion",
+                (cache_ingesta.huella(clave_solicitudes), cache_ingesta.huella("pesos"), huella_plantilla, equipo, huella_correcciones),
+                lambda: motor.validar_pesos(df_sol, df_pesos_data, empleados, correcciones)
+            )
+        except motor.ErrorDatos as e:
+            st.error(str(e))
+            st.stop()
+
+        if validacion.filtro_personal:
+            st.success(f"✅ Filtro de personal aplicado: {len(validacion.solicitudes)} registros.")
+        else:
+            st.warning("⚠️ No encontré columna 'Resolutor'.")
+
+        if not validacion.completo:
+            st.error(f"⛔ Faltan {int(validacion.faltantes['CANTIDAD'].sum())} Scores.")
+            st.warning(f"""1. Copia el nombre y agrega el proceso al excel de Pesos
+2. Asignale un Peso 
+3. Cambiale la columna Peso y Score (IMPORTANTE CAMBIAR AMBOS)
+4. Sube el archivo actualizado""")
+            st.table(validacion.faltantes)
+
+            st.markdown("#### 💡 Sugerencias del Excel de Pesos")
+            indice = resultado_vista("indice_pesos", cache_ingesta.huella("pesos"), lambda: indice_pesos(df_pesos_data))
+            sugerencias = indice.sugerir(validacion.faltantes['NOMBRE EXACTO A COPIAR'])
+            if sugerencias.empty:
+                st.info("No encontré tipos parecidos en el Excel de Pesos: hay que agregarlos a mano.")
+            else:
+                st.caption("Los tipos con Score más parecidos a cada nombre (similitud de 0 a 1). Si uno es el mismo proceso, márcalo y guárdalo como corrección: desde ahí ese nombre se cruza con el tipo elegido.")
+                sugerencias.insert(0, 'Aceptar', False)
+                editadas = st.data_editor(
+                    sugerencias, hide_index=True, use_container_width=True, disabled=COLUMNAS_SUGERENCIAS, key="sugerencias_tipos",
+                    column_config={"Similitud": st.column_config.ProgressColumn(min_value=0.0, max_value=1.0, format="%.2f")}
+                )
+                # Si se marcan dos sugerencias para el mismo nombre, queda la más parecida
+                aceptadas = editadas[editadas['Aceptar']].drop_duplicates('Tipo de Pedido')
+                if st.button(f"💾 Guardar {len(aceptadas)} correcciones", disabled=aceptadas.empty):
+                    almacen_correcciones.agregar(dict(zip(aceptadas['Tipo de Pedido'], aceptadas['Sugerencia'])))
+                    st.session_state.pop("sugerencias_tipos", None)
+                    st.rerun()
+        else:
+            st.success("✅ Todos los procesos tienen Score.")
+            
+            boton_descarga("📥 Descargar Scores", {"Scores": validacion.solicitudes}, "Solicitudes_Scores", "scores")
+    else:
+        st.warning("👈 Carga 'Solicitudes' y 'Pesos' en la barra lateral.")
+
+    guardadas = almacen_correcciones.cargar()
+    if guardadas:
+        with st.expander(f"📚 Correcciones guardadas ({len(guardadas)})"):
+            if carga_incremental:
+                st.caption("Con la carga incremental, una corrección nueva se aplica a los tickets que entren desde ahora.")
+            tabla_correcciones = pd.DataFrame({'Quitar': False, 'Nombre en Solicitudes': list(guardadas), 'Tipo en Pesos': list(guardadas.values())})
+            editadas_c = st.data_editor(
+                tabla_correcciones, hide_index=True, use_container_width=True,
+                disabled=['Nombre en Solicitudes', 'Tipo en Pesos'], key="correcciones_guardadas"
+            )
+            quitar = editadas_c.loc[editadas_c['Quitar'], 'Nombre en Solicitudes']
+            if st.button(f"🗑️ Quitar {len(quitar)} correcciones", disabled=quitar.empty):
+                almacen_correcciones.quitar(quitar)
+                st.session_state.pop("correcciones_guardadas", None)
+                st.rerun()
+
+# ==============================================================================
+# PESTAÑA 2: CÁLCULO DE FTE MENSUAL
+# ==============================================================================
+if tab2:
+    st.subheader("🚀 Cálculo de FTE Mensual")
+    st.markdown("Cruce de **Scores** + **Tiempos** para calcular carga laboral.")
+    
+    st.write("Configuración de parámetros:")
+    col_conf1, col_conf2, col_conf3 = st.columns(3)
+    with col_conf1:
+        OLE_USADO_M = st.number_input("Factor OLE (Eficiencia)", value=0.66, step=0.01, min_value=0.1, max_value=1.0, key="ole_m")
+    with col_conf2:
+        HORA_DIARIA_M = st.number_input("Horas Diarias Contrato", value=7.9, step=0.01, key="hora_m")
+    with col_conf3:
+        ANIO_SELECCIONADO_M = st.number_input("📅 Año a Procesar", value=2025, step=1, min_value=2023, max_value=2030, key="anio_m")
+    st.caption("Los resultados se actualizan al cambiar los valores.")
+
+    st.session_state['calculo_realizado'] = False
+    diagnostico_m, barra_m = diagnostico_vista("fte_mensual")
+    if not (file_solicitudes and file_pesos and file_prod):
+        st.warning("⚠️ Faltan archivos. Por favor carga **Solicitudes**, **Pesos** y **Días Trabajados** en el menú lateral.")
+    else:
+        try:
+            cubo = cargar_cubo(diagnostico_m)
+            df_prod = diagnostico_m.medir("lectura", cargar_dias_trabajados, copiar=False)
+
+            def calcular_cargas_mensuales():
+                if modo_multi_anio:
+                    if trabajadores > 1:
+                        diagnostico_m.omitir("pivote", "incluido en cruce (procesos en paralelo)")
+                        return diagnostico_m.medir("cruce", lambda: cargas_paralelas().mensual)
+                    with diagnostico_m.etapa("pivote") as medicion:
+                        resumenes = cubo.mensual_por_anio()
+                        dias = motor.dias_trabajados_por_anio(df_prod, resumenes, mapa_usuarios)
+                        medicion['filas'] = contar_filas(resumenes)
+                    return diagnostico_m.medir("cruce", lambda: {
+                        anio: motor.carga_mensual(resumen, dias[anio], anio, parametros) for anio, resumen in resumenes.items()
+                    })
+                anio = int(ANIO_SELECCIONADO_M)
+                cubo_anio = cubo.filtrar_anio(anio)
+                if cubo_anio.vacio:
+                    return {}
+                with diagnostico_m.etapa("pivote") as medicion:
+                    resumen = cubo_anio.mensual()
+                    dias_m = motor.preparar_dias_trabajados(df_prod, anio, mapa_usuarios)
+                    medicion['filas'] = len(resumen)
+                return diagnostico_m.medir("cruce", lambda: {anio: motor.carga_mensual(resumen, dias_m, anio, parametros)})
+
+            cargas_m = cargas_vista(
+                "cargas_mensual", ANIO_SELECCIONADO_M, calcular_cargas_mensuales, cache_ingesta.huella("dias_trabajados")
+            )
+            for etapa in ("pivote", "cruce"):
+                diagnostico_m.omitir(etapa, filas=contar_filas(cargas_m))
+            if not cargas_m:
+                if modo_multi_anio:
+                    st.error("⚠️ No hay registros con fecha válida en Solicitudes.")
+                else:
+                    st.error(f"⚠️ No hay registros en Solicitudes para el año {int(ANIO_SELECCIONADO_M)}.")
+            else:
+                st.session_state['resultados_mensual'] = diagnostico_m.medir("fte", lambda: {
+                    anio: motor.fte_mensual_desde_carga(carga, motor.ParametrosFTE(OLE_USADO_M, HORA_DIARIA_M, anio), parametros)
+                    for anio, carga in cargas_m.items()
+                })
+                st.session_state['calculo_realizado'] = True
+
+        except motor.ErrorDatos as e:
+            st.error(str(e))
+        except Exception as e:
+            st.error(f"Ocurrió un error en el cálculo: {e}")
+            st.write("Detalle del error:", e)
+    
+    if st.session_state.get('calculo_realizado'):
+        # Solo cuenta lo que arma Python; el dibujo en el navegador no se mide acá
+        with diagnostico_m.etapa("render") as medicion:
+            resultados_m = st.session_state['resultados_mensual']
+            resultado_m = resultados_m[elegir_anio(resultados_m, "anio_vista_m", ANIO_SELECCIONADO_M)]
+            # El Desglose de Tiempos trabaja sobre el año que se está viendo acá
+            st.session_state['resultado_mensual'] = resultado_m
+            st.session_state['resultado_mensual_clave'] = (
+                st.session_state['_vista_cargas_mensual'][0], OLE_USADO_M, HORA_DIARIA_M, resultado_m.anio
+            )
+            df_final = resultado_m.detalle
+            df_fte_mes = resultado_m.por_mes
+            medicion['filas'] = len(df_final)
+            anio_actual = resultado_m.anio
+        
+            st.success(f"Visualizando datos del año: **{anio_actual}**")
+
+            subtab_graf, subtab_datos = st.tabs(["📈 Visualización Gráfica", "📋 Tablas y Descarga"])
+        
+            with subtab_graf:
+                st.markdown("#### Análisis Gráfico de FTE")
+                lista_personas = ["Todos"] + list(df_final['Resolutor'].unique())
+                seleccion = st.selectbox("Filtrar por:", lista_personas)
+            
+                if seleccion == "Todos":
+                    df_grafico = df_fte_mes.melt(
+                        id_vars=['Mes_Num', 'Año'], 
+                        value_vars=['FTE', 'Personas Efectivas'],
+                        var_name='Indicador', 
+                        value_name='Valor'
+                    )
+                    df_grafico['Mes_Num'] = df_grafico['Mes_Num'].astype(str)
+                
+                    fig = px.bar(
+                        df_grafico, x='Mes_Num', y='Valor', color='Indicador',
+                        barmode='group', title=f'FTE Mensual {anio_actual} vs Capacidad Mínima',
+                        text_auto='.2f',
+                        color_discrete_map={'FTE': '#1f77b4', 'Personas Efectivas': '#ff7f0e'}
+                    )
+                
+                    # Línea de capacidad real
+                    df_capacidad_linea = resultado_m.capacidad_real
+                
+                    if not df_capacidad_linea.empty:
+                        fig.add_scatter(
+                            x=df_capacidad_linea['Mes_Num'].astype(str),
+                            y=df_capacidad_linea['Capacidad_Real'],
+                            mode='lines+markers',
+                            name='Capacidad Real (Personas Activas)',
+                            line=dict(color='#00CC96', width=3, dash='dot')
+                        )
+
+                    fig.update_layout(xaxis_title="Mes", yaxis_title="Valor FTE / Personas")
+                    st.plotly_chart(fig, use_container_width=True)
+
+                    if len(resultados_m) > 1:
+                        df_comparativo = motor.comparativo_anual(resultados_m)
+                        df_comparativo['Año'] = df_comparativo['Año'].astype(str)
+                        fig_anual = px.line(
+                            df_comparativo, x='Mes_Num', y='FTE', color='Año', markers=True,
+                            title='Comparativo Año contra Año (FTE Total por Mes)'
+                        )
+                        fig_anual.update_layout(xaxis_title="Mes", yaxis_title="FTE")
+                        st.plotly_chart(fig_anual, use_container_width=True)
+                
+                else:
+                    df_persona = df_final[df_final['Resolutor'] == seleccion].copy()
+                    df_persona['Mes_Num'] = df_persona['Mes_Num'].astype(str)
+                
+                    fig = px.bar(
+                        df_persona, x='Mes_Num', y='FTE',
+                        title=f'Evolución FTE {anio_actual}: {seleccion}',
+                        text_auto='.2f',
+                        color_discrete_sequence=['#2ca02c']
+                    )
+                    fig.add_hline(y=1, line_dash="dash", line_color="red", annotation_text="Límite (1.0)", annotation_position="top right")
+                    fig.add_hline(y=0.8, line_dash="dash", line_color="green", annotation_text="Meta (0.8)", annotation_position="bottom right")
+                    fig.update_layout(xaxis_title="Mes", yaxis_title="FTE (Carga Laboral)")
+                    st.plotly_chart(fig, use_container_width=True)
+
+            with subtab_datos:
+                st.subheader("1. Detalle por Persona y Mes")
+                mostrar_tabla(df_final, "fte_detalle", {"FTE": "%.2f", "Score_Unitario": "%.0f", "Año": "%d"})
+                st.subheader("2. Resumen Gerencial (FTE Total x Mes)")
+                mostrar_tabla(df_fte_mes, "fte_mes", {"FTE": "%.2f", "Año": "%d"})
+                boton_descarga(
+                    "📥 Descargar Reporte FTE Completo", {"Detalle_FTE": df_final, "Resumen_Mes": df_fte_mes},
+                    f"Reporte_FTE_{anio_actual}", "reporte_fte", anio_actual
+                )
+    barra_m.empty()
+    panel_diagnostico(diagnostico_m)
+
+# ==============================================================================
+# PESTAÑA 3: CÁLCULO DE FTE DIARIO
+# ==============================================================================
+if tab_diario:
+    st.subheader("⏱️ Cálculo de FTE Diario")
+    st.markdown("Análisis granular día por día para detectar cuellos de botella específicos.")
+
+    st.write("Configuración de parámetros (Diario):")
+    col_d1, col_d2, col_d3 = st.columns(3)
+    with col_d1:
+        OLE_USADO_D = st.number_input("Factor OLE (Eficiencia)", value=0.66, step=0.01, min_value=0.1, max_value=1.0, key="ole_d")
+    with col_d2:
+        HORA_DIARIA_D = st.number_input("Horas Diarias Contrato", value=7.9, step=0.01, key="hora_d")
+    with col_d3:
+        ANIO_SELECCIONADO_D = st.number_input("📅 Año a Procesar", value=2025, step=1, min_value=2023, max_value=2030, key="anio_d")
+    st.caption("Los resultados se actualizan al cambiar los valores.")
+
+    st.session_state['calc_diario_ok'] = False
+    diagnostico_d, barra_d = diagnostico_vista("fte_diario")
+    if not (file_solicitudes and file_pesos):
+        st.warning("⚠️ Faltan archivos. Por favor carga **Solicitudes** y **Pesos** en el menú lateral.")
+    else:
+        try:
+            cubo = cargar_cubo(diagnostico_d)
+
+            def calcular_cargas_diarias():
+                if modo_multi_anio:
+                    if trabajadores > 1:
+                        diagnostico_d.omitir("pivote", "incluido en cruce (procesos en paralelo)")
+                        return diagnostico_d.medir("cruce", lambda: cargas_paralelas().diaria)
+                    resumenes = diagnostico_d.medir("pivote", cubo.diario_por_anio)
+                    return diagnostico_d.medir("cruce", lambda: {
+                        anio: motor.carga_diaria(resumen, anio, parametros) for anio, resumen in resumenes.items()
+                    })
+                anio = int(ANIO_SELECCIONADO_D)
+                cubo_anio = cubo.filtrar_anio(anio)
+                if cubo_anio.vacio:
+                    return {}
+                resumen = diagnostico_d.medir("pivote", cubo_anio.diario)
+                return diagnostico_d.medir("cruce", lambda: {anio: motor.carga_diaria(resumen, anio, parametros)})
+
+            cargas_d = cargas_vista("cargas_diario", ANIO_SELECCIONADO_D, calcular_cargas_diarias)
+            for etapa in ("pivote", "cruce"):
+                diagnostico_d.omitir(etapa, filas=contar_filas(cargas_d))
+            if not cargas_d:
+                if modo_multi_anio:
+                    st.error("No hay datos con fecha válida en Solicitudes")
+                else:
+                    st.error(f"No hay datos para el año {int(ANIO_SELECCIONADO_D)}")
+            else:
+                st.session_state['resultados_diario'] = diagnostico_d.medir("fte", lambda: {
+                    anio: motor.fte_diario_desde_carga(carga, motor.ParametrosFTE(OLE_USADO_D, HORA_DIARIA_D, anio), parametros)
+                    for anio, carga in cargas_d.items()
+                })
+                st.session_state['calc_diario_ok'] = True
+
+        except motor.ErrorDatos as e:
+            st.error(str(e))
+        except Exception as e:
+            st.error(f"Error en cálculo diario: {e}")
+
+    UMBRAL_WEBGL = 1_000  # puntos desde los que el gráfico se dibuja con WebGL
+
+    def linea_diaria(df, y, titulo, color, serie):
+        # Series largas: WebGL + LTTB (conserva los picos); acotar el rango de fechas
+        # funciona como zoom y vuelve a la resolución completa cuando caben todos los puntos.
+        # Cada serie (persona, año y fechas) tiene su propio zoom: uno guardado de otra serie puede quedar fuera de rango
+        if len(df) > MAX_PUNTOS_GRAFICO:
+            inicio, fin = df['Fecha'].min(), df['Fecha'].max()
+            desde, hasta = st.slider(
+                "🔍 Rango de fechas", min_value=inicio, max_value=fin, value=(inicio, fin),
+                key=f"rango_{y}_{serie}_{anio_d}_{inicio:%Y%m%d}_{fin:%Y%m%d}"
+            )
+            df = df[(df['Fecha'] >= desde) & (df['Fecha'] <= hasta)]
+        df_grafico = decimar(df, 'Fecha', y)
+        if len(df_grafico) < len(df):
+            st.caption(f"Mostrando {len(df_grafico)} de {len(df)} días (LTTB). Acota el rango de fechas para ver el detalle completo.")
+        grande = len(df_grafico) > UMBRAL_WEBGL
+        return px.line(
+            df_grafico, x='Fecha', y=y, title=titulo, markers=not grande,
+            color_discrete_sequence=[color], render_mode='webgl' if grande else 'auto'
+        )
+
+    if st.session_state.get('calc_diario_ok'):
+        # Solo cuenta lo que arma Python; el dibujo en el navegador no se mide acá
+        with diagnostico_d.etapa("render") as medicion:
+            resultados_d = st.session_state['resultados_diario']
+            if len(resultados_d) > 1 and st.checkbox("📆 Ver todos los años juntos", key="diario_todos_anios"):
+                resultado_d = motor.unir_diarios(resultados_d)
+                anio_d = f"{min(resultados_d)}-{max(resultados_d)}"
+            else:
+                resultado_d = resultados_d[elegir_anio(resultados_d, "anio_vista_d", ANIO_SELECCIONADO_D)]
+                anio_d = resultado_d.anio
+            df_diario = resultado_d.detalle
+            medicion['filas'] = len(df_diario)
+        
+            st.success(f"Visualizando Detalle Diario: **{anio_d}**")
+            tab_d_graf, tab_d_data = st.tabs(["📈 Gráficos de Línea", "📋 Datos Diarios"])
+
+            with tab_d_graf:
+                st.markdown("#### Evolución Diaria de Carga Laboral")
+                lista_personas_d = ["Todos"] + list(df_diario['Resolutor'].unique())
+                seleccion_d = st.selectbox("Filtrar por Resolutor (Diario):", lista_personas_d)
+
+                if seleccion_d == "Todos":
+                    df_total_diario = resultado_d.total
+
+                    fig_fte = linea_diaria(df_total_diario, 'FTE_Logrado', f" Productividad Diaria (FTE) - {anio_d}", '#ff7f0e', "Todos")
+                    fig_fte.update_layout(yaxis_title="FTE (Exacto)")
+                    st.plotly_chart(fig_fte, use_container_width=True)
+
+                    st.markdown("---")
+                    st.markdown("Si el FTE es de 4,6 lo aproximamos a 5, ya que no existen 4,6 personas. Por ende, acá podemos ver cuanta gente tuvo que trabajar ese día:")
+                
+                    fig_comparativo = linea_diaria(
+                        df_total_diario, 'Personas_Necesarias', f"Productividad Diaria Redondeada (FTE) - {anio_d}", '#d62728', "Todos"
+                    )
+                    fig_comparativo.update_layout(yaxis_title="Cantidad de Personas", hovermode="x unified")
+                    fig_comparativo.update_yaxes(tick0=0, dtick=1)
+                    st.plotly_chart(fig_comparativo, use_container_width=True)
+
+                else:
+                    df_persona_d = df_diario[df_diario['Resolutor'] == seleccion_d].copy()
+                    fig_d = linea_diaria(df_persona_d, 'FTE_Diario', f"FTE Diario - {seleccion_d} ({anio_d})", '#1f77b4', seleccion_d)
+                    fig_d.add_hline(y=1, line_dash="dash", line_color="red", annotation_text="Límite (1.0)")
+                    fig_d.add_hline(y=0.8, line_dash="dash", line_color="green", annotation_text="Meta (0.8)")
+                    fig_d.update_layout(yaxis_title="FTE Diario")
+                    st.plotly_chart(fig_d, use_container_width=True)
+
+            with tab_d_data:
+                mostrar_tabla(df_diario, "fte_diario", {"FTE_Diario": "%.2f", "Carga_Minutos": "%.0f"})
+                boton_descarga(
+                    "📥 Descargar Detalle Diario", {"FTE_Diario_Detalle": df_diario},
+                    f"FTE_Diario_{anio_d}", "fte_diario", anio_d
+                )
+    barra_d.empty()
+    panel_diagnostico(diagnostico_d)
+
+# ==============================================================================
+# PESTAÑA 4: DEMANDA FTE (IDEAL)
+# ==============================================================================
+def mostrar_demanda(resultado, titulo_resultado, titulo_grafico, titulo_detalle, color_redondeo, texto_expander, nota=None):
+    df_mes = resultado.por_mes
+    st.markdown(titulo_resultado)
+    fig = px.bar(
+        df_mes, x='Mes_Num', y='Headcount_Requerido',
+        title=titulo_grafico,
+        text_auto='.2f', labels={'Headcount_Requerido': 'Plantilla Exacta (Decimales)'},
+        color_discrete_sequence=['#ff7f0e'] 
+    )
+    
+    fig.add_trace(go.Bar(
+        x=df_mes['Mes_Num'], y=df_mes['Personas_A_Contratar'],
+        name='Contratación Sugerida (Redondeo)', text=df_mes['Personas_A_Contratar'],
+        textposition='auto', marker_color=color_redondeo,
+        marker_line_width=2, marker_line_color='red'
+    ))
+
+    fig.update_layout(barmode='overlay')
+    st.plotly_chart(fig, use_container_width=True)
+    
+    st.write(titulo_detalle)
+    if nota:
+        st.info(nota)
+    st.dataframe(df_mes)
+    
+    with st.expander(texto_expander):
+        st.dataframe(resultado.detalle)
+
+def cargas_demanda_app(anio, contingencia=False):
+    # {año: CargaDemanda}; en modo multi-año trae todos los años de una vez
+    cubo = cargar_cubo()
+    con_carga_admin = not contingencia
+
+    def calcular():
+        if modo_multi_anio:
+            if trabajadores > 1:
+                cargas = cargas_paralelas()
+                return cargas.contingencia if contingencia else cargas.demanda
+            return motor.cargas_demanda_por_anio(cubo, calendario, parametros, con_carga_admin)
+        resumen = cubo.filtrar_anio(int(anio)).mensual()
+        return {int(anio): motor.carga_demanda(resumen, int(anio), calendario, parametros, con_carga_admin)}
+
+    clave = "cargas_contingencia" if contingencia else "cargas_demanda"
+    return cargas_vista(clave, anio, calcular, cache_ingesta.huella("feriados"))
+
+def calcular_demanda_app(ole, horas, anio, contingencia=False):
+    # Devuelve {año: ResultadoDemanda}: sobre la carga guardada solo se aplica OLE, horas y shrinkage
+    shrinkage = motor.FACTOR_SHRINKAGE_CONTINGENCIA if contingencia else motor.FACTOR_SHRINKAGE_DEMANDA
+    return {
+        a: motor.demanda_desde_carga(carga, motor.ParametrosFTE(ole, horas, a), parametros, shrinkage)
+        for a, carga in cargas_demanda_app(anio, contingencia).items()
+    }
+
+if tab_demanda:
+    st.subheader("🔮 Demanda FTE (Carga Ideal según Días Hábiles)")
+    st.markdown("""
+    Esta simulación calcula cuántas personas se necesitan en un escenario ideal:
+    - **Numerador:** Carga real (Scores) + Carga Administrativa proyectada (Reuniones/Chat x Días Hábiles x Personas).
+    - **Denominador:** Capacidad ideal de una persona trabajando **todos los días hábiles** del mes.
+    """)
+
+    c_dem1, c_dem2, c_dem3 = st.columns(3)
+    with c_dem1:
+        OLE_DEMANDA = st.number_input("Factor OLE", value=0.66, step=0.01, key="ole_dem")
+    with c_dem2:
+        HORA_DEMANDA = st.number_input("Horas Diarias", value=7.95, step=0.01, key="hor_dem")
+    with c_dem3:
+        ANIO_DEMANDA = st.number_input("📅 Año a Analizar", value=2025, step=1, key="anio_dem")
+
+    st.session_state['resultados_demanda'] = None
+    if not (file_solicitudes and file_pesos):
+         st.warning("⚠️ Carga Solicitudes y Pesos primero.")
+    else:
+        try:
+            st.session_state['resultados_demanda'] = calcular_demanda_app(OLE_DEMANDA, HORA_DEMANDA, ANIO_DEMANDA)
+        except motor.ErrorDatos as e:
+            st.error(str(e))
+        except Exception as e:
+            st.error(f"Error en Demanda FTE: {e}")
+
+    resultados_dem = st.session_state.get('resultados_demanda')
+    if resultados_dem is not None:
+        resultado_dem = resultados_dem[elegir_anio(resultados_dem, "anio_vista_dem", int(ANIO_DEMANDA))] if resultados_dem else None
+        if resultado_dem is not None and not resultado_dem.detalle.empty:
+            mostrar_demanda(
+                resultado_dem,
+                "#### Resultado: Plantilla Necesaria ",
+                f"Dimensionamiento FTE {resultado_dem.anio} (Plantilla Necesaria)",
+                "### Detalle de Cálculo",
+                'rgba(255, 0, 0, 0.3)',
+                "Ver desglose por Resolutor (Ideal)",
+                nota="Nota: Se muestra únicamente la **Plantilla Necesaria** (que incluye el Shrinkage de 17%)."
+            )
+        else:
+            st.warning("No se generaron datos. Revisa el año seleccionado.")
+
+# ==============================================================================
+# PESTAÑA 5: DEMANDA FTE (CONTINGENCIA)
+# ==============================================================================
+if tab_contingencia:
+    st.subheader("🚨 Demanda FTE (Caso Contingencia)")
+    st.markdown("""
+    **Escenario de Emergencia/Contingencia:**
+    - Se eliminan tiempos de reuniones y chats.
+    - Se asume que el personal está **100% dedicado a Procesos (Full Proceso)**.
+    """)
+
+    c_cont1, c_cont2, c_cont3 = st.columns(3)
+    with c_cont1:
+        OLE_CONT = st.number_input("Factor OLE", value=0.66, step=0.01, key="ole_cont")
+    with c_cont2:
+        HORA_CONT = st.number_input("Horas Diarias", value=7.95, step=0.01, key="hor_cont")
+    with c_cont3:
+        ANIO_CONT = st.number_input("📅 Año a Analizar", value=2025, step=1, key="anio_cont")
+
+    st.session_state['resultados_contingencia'] = None
+    if not (file_solicitudes and file_pesos):
+         st.warning("⚠️ Carga Solicitudes y Pesos primero.")
+    else:
+        try:
+            st.session_state['resultados_contingencia'] = calcular_demanda_app(OLE_CONT, HORA_CONT, ANIO_CONT, contingencia=True)
+        except motor.ErrorDatos as e:
+            st.error(str(e))
+        except Exception as e:
+            st.error(f"Error en Contingencia FTE: {e}")
+
+    resultados_cont = st.session_state.get('resultados_contingencia')
+    if resultados_cont is not None:
+        resultado_cont = resultados_cont[elegir_anio(resultados_cont, "anio_vista_cont", int(ANIO_CONT))] if resultados_cont else None
+        if resultado_cont is not None and not resultado_cont.detalle.empty:
+            mostrar_demanda(
+                resultado_cont,
+                "#### Resultado Contingencia: Plantilla Necesaria (Sin Admin Load)",
+                f"Dimensionamiento CONTINGENCIA {resultado_cont.anio} (Solo Procesos)",
+                "### Detalle de Cálculo (Contingencia)",
+                'rgba(214, 39, 40, 0.3)',
+                "Ver desglose por Resolutor (Contingencia)"
+            )
+        else:
+            st.warning("No se generaron datos. Revisa el año seleccionado.")
+
+
+# ==============================================================================
+# PESTAÑA 6: DESGLOSE DE TIEMPOS OLE
+# ==============================================================================
+if tab_desglose:
+    st.subheader("📊 Desglose de Tiempos (Operación, Reuniones y OLE)")
+    st.markdown("""
+    Esta pestaña desglosa la distribución del tiempo total utilizado por el equipo, 
+    agrupando la operación y separando el OLE en sus correspondientes categorías.
+    """)
+
+    # ----------------------------------------------------------------------
+    # A. PANEL DE CONFIGURACIÓN DINÁMICA DEL OLE
+    # ----------------------------------------------------------------------
+    with st.expander("⚙️ Configurar Minutos Diarios del OLE", expanded=False):
+        with st.form("form_config_ole"):
+            st.markdown("Ajusta los tiempos de pérdida diarios para ver el impacto visual y calcular tu OLE Teórico:")
+            c_ole1, c_ole2, c_ole3, c_ole4 = st.columns(4)
+            with c_ole1:
+                val_horas = st.number_input("Horas Diarias", value=7.95, step=0.01)
+                val_almuerzo = st.number_input("Cat A: Alimentación", value=40.0, step=1.0)
+            with c_ole2:
+                val_fisiologicas = st.number_input("Cat A: Necesidades Fisiológicas (Baño)", value=24.0, step=1.0)
+                val_fatiga = st.number_input("Cat A: Fatiga Básica y Variable", value=28.0, step=1.0)
+            with c_ole3:
+                val_fallas = st.number_input("Cat B: Fallas de Sist.", value=10.0, step=1.0)
+            with c_ole4:
+                val_reu_no_est = st.number_input("Cat C: Reu. No Est.", value=30.4, step=0.1)
+                val_micro = st.number_input("Cat C: MicroTareas", value=30.0, step=1.0)
+            
+            btn_recalcular = st.form_submit_button("🔄 Calcular y Actualizar Gráficos")
+            
+        config_ole = motor.ConfigOLE(
+            horas=val_horas, almuerzo=val_almuerzo, fisiologicas=val_fisiologicas, fatiga=val_fatiga,
+            fallas=val_fallas, reu_no_est=val_reu_no_est, micro=val_micro
+        )
+        # Cálculo del OLE directamente fuera del if para que siempre se muestre
+        st.info(f"📊 **OLE Teórico Calculado:** **{config_ole.ole_teorico:.1%}** (Se restan {config_ole.minutos_perdidos:.1f} min de un total de {config_ole.minutos_totales:.0f} min diarios)")
+    
+    if st.session_state.get('calculo_realizado'):
+        resultado_m = st.session_state['resultado_mensual']
+        # Matriz de categorías una vez por (resultado mensual, configuración OLE): el filtro
+        # de mes y el toggle de pausas solo seleccionan filas y columnas ya calculadas
+        df_desglose = resultado_vista(
+            "desglose", (st.session_state['resultado_mensual_clave'], config_ole),
+            lambda: motor.desglose_tiempos(resultado_m.detalle, config_ole, parametros)
+        )
+        anio_desglose = resultado_m.anio
+        
+        # 1. Filtro por Mes
+        meses_disponibles = ["Todos"] + sorted(list(df_desglose['Mes_Num'].unique()))
+        mes_seleccionado = st.selectbox("📅 Filtrar por Mes:", meses_disponibles)
+        
+        if mes_seleccionado != "Todos":
+            df_desglose = df_desglose[df_desglose['Mes_Num'] == mes_seleccionado]
+            st.success(f"Visualizando desglose del año: **{anio_desglose}** - Mes: **{mes_seleccionado}**")
+        else:
+            st.success(f"Visualizando desglose de todo el año: **{anio_desglose}**")
+
+        cols_base = motor.COLS_DESGLOSE_BASE
+        cols_pausas = motor.COLS_DESGLOSE_PAUSAS
+
+        # 2. Toggle para controlar la visualización
+        st.markdown("---")
+        mostrar_pausas = st.toggle("👁️ Mostrar tiempos de Alimentación y Necesidades Fisiológicas en el análisis", value=False)
+        st.caption("Por defecto estos tiempos se ocultan para analizar estrictamente la carga y fricción operativa. Actívalo para ver la jornada en su totalidad.")
+        
+        if mostrar_pausas:
+            cols_analisis = cols_base + cols_pausas
+        else:
+            cols_analisis = cols_base
+
+        # ----------------------------------------------------------------------
+        # A. Análisis General (Total Equipo)
+        # ----------------------------------------------------------------------
+        df_total = motor.resumen_desglose(df_desglose, cols_analisis)
+
+        col_g1, col_g2 = st.columns([1.5, 1])
+        with col_g1:
+            st.markdown("#### ¿En qué se va el tiempo del equipo?")
+            
+            # Asignamos un color específico para 'Capacidad Libre'
+            color_map = {
+                'Operación (Tickets + Sin Tickets)': '#636EFA',
+                'Reuniones Estandarizadas (Fijas)': '#EF553B',
+                'Cat. C: Reuniones No Estandarizadas': '#00CC96',
+                'Cat. B: Fallas de Sistema': '#AB63FA',
+                'Cat. C: MicroTareas (Gestión/Cursos/Soporte/Setup)': '#FFA15A',
+                'Cat. A: Necesidades Fisiológicas y Fatiga': '#19D3F3',
+                'Cat. A: Alimentación': '#FF6692',
+                'Capacidad Libre (Ocio / Proyectos)': "#D3D3D3" # Color distintivo claro
+            }
+            
+            fig_pie = px.pie(
+                df_total, 
+                names='Categoría', 
+                values='Minutos Totales',
+                hole=0.3,
+                color='Categoría',
+                color_discrete_map=color_map
+            )
+            fig_pie.update_traces(textposition='inside', textinfo='percent+label')
+            st.plotly_chart(fig_pie, use_container_width=True)
+            
+        with col_g2:
+            st.markdown("#### Resumen en Horas")
+            st.dataframe(df_total[['Categoría', 'Horas Totales', '%']].style.format({
+                'Horas Totales': "{:,.0f} hrs",
+                '%': "{:.1f}%"
+            }), use_container_width=True)
+            
+            # Tarjeta de resumen de Capacidad Libre
+            if 'Capacidad Libre (Ocio / Proyectos)' in df_total['Categoría'].values:
+                libre_pct = df_total.loc[df_total['Categoría'] == 'Capacidad Libre (Ocio / Proyectos)', '%'].values[0]
+                libre_hrs = df_total.loc[df_total['Categoría'] == 'Capacidad Libre (Ocio / Proyectos)', 'Horas Totales'].values[0]
+                st.info(f"**💡 Capacidad Libre (Ocio / Proyectos):** El equipo tiene un **{libre_pct:.1f}%** ({libre_hrs:,.0f} hrs) de su tiempo disponible o no registrado operativamente.")
+
+        st.markdown("---")
+
+        # ----------------------------------------------------------------------
+        # B. Análisis Detallado por Persona (Resolutor)
+        # ----------------------------------------------------------------------
+        st.markdown("#### Desglose de Tiempos por Resolutor (En Horas)")
+        df_melt = motor.desglose_por_resolutor(df_desglose, cols_analisis)
+
+        fig_bar = px.bar(
+            df_melt, x='Resolutor', y='Horas', color='Categoría',
+            text_auto='.0f', title="Distribución de Horas por Empleado",
+            color_discrete_map=color_map
+        )
+        st.plotly_chart(fig_bar, use_container_width=True)
+
+        # ----------------------------------------------------------------------
+        # C. Tabla y Descarga
+        # ----------------------------------------------------------------------
+        st.markdown("#### Datos Crudos (Base Mensual)")
+        # Mostramos siempre todas las columnas en la tabla y descarga para no perder data
+        columnas_mostrar = ['Mes_Num', 'Resolutor', 'Dias_Trabajados'] + cols_base + cols_pausas
+        mostrar_tabla(df_desglose[columnas_mostrar], "desglose", decimales=1)
+
+        boton_descarga(
+            "📥 Descargar Base Completa del Desglose OLE", {"Desglose_Tiempos": df_desglose[columnas_mostrar]},
+            f"Desglose_Tiempos_OLE_{anio_desglose}", "desglose", anio_desglose
+        )
+
+    else:
+        st.warning("⚠️ Debes correr primero el cálculo en la pestaña 'Productividad FTE MENSUAL' (Pestaña 2) para generar los datos de tiempo.")
+
+
+# ==============================================================================
+# PESTAÑA 7: DETALLE DE TIEMPOS
+# ==============================================================================
+if tab3:
+    st.subheader("⚙️ Días Trabajados (Detalle)")
+    
+    col_t3_1, col_t3_2 = st.columns([1, 3])
+    with col_t3_1:
+        ANIO_DETALLE = st.number_input("📅 Filtro Año", value=2025, step=1, key="anio_tab3")
+
+    def calcular_dias_trabajados(df_prod, anio):
+        dias = motor.preparar_dias_trabajados(df_prod, anio, mapa_usuarios)
+        return dias, dias.tabla().astype(int), motor.capacidad_real(dias)
+
+    if file_prod:
+        try:
+            df_prod = cargar_dias_trabajados(copiar=False)
+            dias_detalle, tabla_dias, df_capacidad = resultado_vista(
+                "dias_trabajados", (cache_ingesta.huella("dias_trabajados"), ANIO_DETALLE, huella_plantilla, equipo),
+                lambda: calcular_dias_trabajados(df_prod, ANIO_DETALLE)
+            )
+            if dias_detalle.filtrado_por_anio:
+                st.info(f"Visualizando datos filtrados por año: {ANIO_DETALLE}")
+            else:
+                st.warning("⚠️ No se detectó columna de Año en el Excel. Se muestran todos los registros disponibles.")
+
+            st.write("**Días Trabajados:**")
+            st.dataframe(tabla_dias, use_container_width=True)
+            
+            st.markdown("---")
+            st.subheader("👥 Capacidad Real (Personas Disponibles)")
+            st.caption("Cálculo: (Total Días Trabajados del Mes / Días Hábiles del Mes)")
+
+            if not df_capacidad.empty:
+                fig_capacidad = px.bar(
+                    df_capacidad, x='Mes', y='Personas_Reales_Disponibles',
+                    title=f"Capacidad Efectiva del Equipo (FTE Disponible) - {ANIO_DETALLE}",
+                    text_auto='.2f', labels={'Personas_Reales_Disponibles': 'Personas Completas (FTE)'},
+                    color_discrete_sequence=['#00CC96']
+                )
+                
+                fig_capacidad.add_scatter(
+                    x=df_capacidad['Mes'], y=df_capacidad['Personas_Activas'],
+                    mode='lines+markers', name='Personas Activas (Headcount > 0 días)',
+                    line=dict(color='red', width=2, dash='dot')
+                )
+                
+                st.plotly_chart(fig_capacidad, use_container_width=True)
+                
+                format_dict = {
+                    'Personas_Reales_Disponibles': '%.2f',
+                    'Dias_Totales_Trabajados': '%.0f',
+                    'Dias_Habiles_Mes': '%.0f',
+                    'Personas_Activas': '%.0f'
+                }
+                mostrar_tabla(df_capacidad, "capacidad", format_dict)
+            else:
+                st.info("No hay datos de días trabajados para generar el gráfico de capacidad.")
+            
+            st.write("**Cálculo Rápido:**")
+            st.markdown(f"- Minutos Reunión Diarios: **{MINUTOS_REU_DIARIA}**")
+            especiales = ", ".join(
+                f"{nombre.title()}: {minutos:.0f}" for nombre, minutos in zip(parametros.nombres, parametros.minutos_chat)
+                if minutos != MIN_CHAT_STD
+            )
+            st.markdown(f"- Minutos Chats y Correos Estándar: **{MIN_CHAT_STD}**" + (f" (Especiales: {especiales})" if especiales else ""))
+        except motor.ErrorDatos as e:
+            st.error(str(e))
+        except Exception as e:
+            st.error(f"Error: {e}")
+    else:
+        st.warning("👈 Carga 'Productividad' para ver el detalle.")
+
+
+# ==============================================================================
+# PESTAÑA 8: SENSIBILIDAD OLE × HORAS × SHRINKAGE
+# ==============================================================================
+if tab_sensibilidad:
+    st.subheader("🧪 Sensibilidad OLE / Horas / Shrinkage")
+    st.markdown("Calcula de una vez todos los escenarios de la grilla: la carga (Scores + reuniones + chats) no depende de estos parámetros, así que solo se repite la división final.")
+
+    BASES_BARRIDO = ["FTE Mensual (días trabajados)", "Demanda estándar", "Contingencia"]
+
+    def grilla(rango, paso):
+        return np.round(np.arange(rango[0], rango[1] + paso / 2, paso), 2)
+
+    with st.form("form_sensibilidad"):
+        c_s1, c_s2 = st.columns(2)
+        with c_s1:
+            BASE_BARRIDO = st.selectbox("Base del cálculo", BASES_BARRIDO, key="base_barrido")
+        with c_s2:
+            ANIO_BARRIDO = st.number_input("📅 Año a Analizar", value=2025, step=1, key="anio_barrido")
+        RANGO_OLE = st.slider("Factor OLE", 0.40, 1.00, (0.55, 0.80), step=0.01, key="rango_ole")
+        RANGO_HORAS = st.slider("Horas Diarias Contrato", 6.0, 9.0, (7.0, 8.5), step=0.05, key="rango_horas")
+        RANGO_SHRINKAGE = st.slider("Factor Shrinkage (1.0 = sin ajuste)", 0.60, 1.00, (0.75, 1.00), step=0.05, key="rango_shrinkage")
+        bt_barrido = st.form_submit_button("🧪 Calcular Escenarios", type="primary")
+
+    if bt_barrido:
+        mensual = BASE_BARRIDO == BASES_BARRIDO[0]
+        if not (file_solicitudes and file_pesos and (file_prod or not mensual)):
+            st.warning("⚠️ Carga Solicitudes y Pesos (y Días Trabajados para la base mensual) primero.")
+        else:
+            try:
+                anio_b = int(ANIO_BARRIDO)
+                resumen = cargar_cubo().filtrar_anio(anio_b).mensual()
+                oles, horas = grilla(RANGO_OLE, 0.01), grilla(RANGO_HORAS, 0.05)
+                shrinkages = grilla(RANGO_SHRINKAGE, 0.05)
+                if mensual:
+                    dias_b = motor.preparar_dias_trabajados(cargar_dias_trabajados(copiar=False), anio_b, mapa_usuarios)
+                    carga = motor.carga_mensual(resumen, dias_b, anio_b, parametros)
+                    escenarios = motor.barrido_mensual(carga, oles, horas, shrinkages, parametros)
+                else:
+                    con_carga_admin = BASE_BARRIDO == BASES_BARRIDO[1]
+                    carga = motor.carga_demanda(resumen, anio_b, calendario, parametros, con_carga_admin)
+                    escenarios = motor.barrido_demanda(carga, oles, horas, shrinkages, parametros)
+                st.session_state['barrido'] = (BASE_BARRIDO, anio_b, escenarios)
+            except motor.ErrorDatos as e:
+                st.error(str(e))
+            except Exception as e:
+                st.error(f"Error en Sensibilidad: {e}")
+
+    if 'barrido' in st.session_state:
+        base_b, anio_b, escenarios = st.session_state['barrido']
+        st.success(f"{len(escenarios)} escenarios calculados — {base_b} {anio_b}")
+
+        METRICAS_BARRIDO = {
+            "Personas_Pico": "Personas necesarias (mes pico)",
+            "Headcount_Pico": "Headcount exacto (mes pico)",
+            "FTE_Pico": "FTE del mes pico",
+            "FTE_Promedio": "FTE mensual promedio",
+        }
+        c_m1, c_m2 = st.columns(2)
+        with c_m1:
+            metrica = st.selectbox("Métrica", list(METRICAS_BARRIDO), format_func=METRICAS_BARRIDO.get, key="metrica_barrido")
+        with c_m2:
+            shrinkage_vista = st.select_slider("Shrinkage del mapa de calor", sorted(escenarios['Shrinkage'].unique()), key="shrinkage_vista")
+
+        df_mapa = escenarios[np.isclose(escenarios['Shrinkage'], shrinkage_vista)].pivot(index='OLE', columns='Horas', values=metrica)
+        fig_barrido = px.imshow(
+            df_mapa, origin='lower', aspect='auto', color_continuous_scale='RdYlGn_r',
+            labels={'x': 'Horas Diarias', 'y': 'Factor OLE', 'color': METRICAS_BARRIDO[metrica]},
+            title=f"{METRICAS_BARRIDO[metrica]} — Shrinkage {shrinkage_vista:.2f}",
+            text_auto='.1f' if df_mapa.size <= 400 else False
+        )
+        st.plotly_chart(fig_barrido, use_container_width=True)
+
+        mostrar_tabla(escenarios, "barrido", {
+            "OLE": "%.2f", "Horas": "%.2f", "Shrinkage": "%.2f",
+            "FTE_Promedio": "%.2f", "FTE_Pico": "%.2f", "Headcount_Pico": "%.2f", "Personas_Pico": "%d",
+        })
+        boton_descarga("📥 Descargar Escenarios", {"Escenarios": escenarios}, f"Sensibilidad_FTE_{anio_b}", "barrido", base_b)
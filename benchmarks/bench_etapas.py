@@ -0,0 +1,247 @@
+"""Tiempo y memoria máxima de cada etapa del cálculo sobre datos sintéticos.
+
+Mide por separado la ingesta, la normalización, la asignación de Scores, el FTE
+mensual, el FTE diario, la demanda, el desglose OLE y la exportación, para cada
+tamaño pedido. El tiempo es el mejor de `--repeticiones` corridas (las etapas
+que tardan más de unos segundos se corren una vez: su ruido relativo ya es
+bajo); la memoria se mide en una corrida aparte (tracemalloc hace más lento el
+código medido, por eso no se mezcla con el tiempo): el pico de `tracemalloc` (objetos de Python y
+arreglos NumPy) más lo que la etapa deja reservado en el pool de Arrow, donde
+pandas guarda las columnas de texto y que tracemalloc no ve.
+
+Compara contra `linea_base.json` y termina con código 1 si alguna etapa supera
+la línea base más la tolerancia. Los tiempos de la línea base son segundos de la
+máquina donde se midieron; con cada tamaño se guarda cuánto tardó ahí una carga
+fija de calibración (`calibracion`), y al comparar se escalan por la relación
+entre esa calibración y la de la máquina actual. La escala corrige la velocidad
+general del procesador, no las diferencias de caché, disco o versiones de
+librerías: para usar la comparación como control, la línea base se regenera en
+la máquina donde va a correr (y después de una mejora intencional) con
+`--actualizar-linea-base`. La memoria no se escala.
+
+    python benchmarks/bench_etapas.py --filas 10000 100000
+    python benchmarks/bench_etapas.py --filas 10000 100000 1000000 --actualizar-linea-base
+    python benchmarks/bench_etapas.py --filas 100000 --compacto
+    python benchmarks/bench_etapas.py --filas 100000 --directorio /tmp/datos_fte
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.generar_datos import DIRECTORIO_DATOS, generar  # noqa: E402
+from motor_fte import motor  # noqa: E402
+from motor_fte.cubo import construir_cubo  # noqa: E402
+from motor_fte.exportacion import exportar  # noqa: E402
+from motor_fte.ingesta import compactar, leer_dias_trabajados, leer_pesos, leer_solicitudes  # noqa: E402
+
+try:
+    import pyarrow
+except ImportError:  # sin pyarrow las columnas de texto son objetos de Python y tracemalloc las ve
+    pyarrow = None
+
+LINEA_BASE = Path(__file__).resolve().parent / "linea_base.json"
+TAMANIOS_DEFECTO = [10_000, 100_000]
+TOLERANCIA_TIEMPO = 0.50
+TOLERANCIA_MEMORIA = 0.25
+# Debajo de estos márgenes absolutos una diferencia es ruido de medición, no una regresión
+MARGEN_SEGUNDOS = 0.10
+MARGEN_MB = 2.0
+SEGUNDOS_SIN_REPETIR = 2.0
+
+OLE, HORAS = 0.66, 7.9
+
+
+# ==============================================================================
+# ETAPAS
+# ==============================================================================
+# Cada etapa recibe el contexto con lo que produjeron las anteriores y devuelve lo suyo
+def etapa_ingesta(ctx):
+    solicitudes = leer_solicitudes(ctx['bytes_solicitudes'])
+    return {
+        'solicitudes': compactar(solicitudes) if ctx['compacto'] else solicitudes,
+        'pesos': leer_pesos(ctx['bytes_pesos']),
+        'dias_trabajados': leer_dias_trabajados(ctx['bytes_dias_trabajados']),
+    }
+
+
+def etapa_normalizacion(ctx):
+    return {'normalizado': motor.normalizar(ctx['solicitudes'])}
+
+
+def etapa_scores(ctx):
+    cubo = construir_cubo(ctx['normalizado'])
+    return {'cubo': motor.puntuar_cubo(cubo.compactado() if ctx['compacto'] else cubo, ctx['pesos'])}
+
+
+def etapa_fte_mensual(ctx):
+    return {'mensual': motor.fte_mensual_por_anio(ctx['cubo'], ctx['dias_trabajados'], OLE, HORAS)}
+
+
+def etapa_fte_diario(ctx):
+    return {'diario': motor.fte_diario_por_anio(ctx['cubo'], OLE, HORAS)}
+
+
+def etapa_demanda(ctx):
+    return {
+        'demanda': motor.demanda_por_anio(ctx['cubo'], OLE, HORAS),
+        'contingencia': motor.contingencia_por_anio(ctx['cubo'], OLE, HORAS),
+    }
+
+
+def etapa_desglose(ctx):
+    config = motor.ConfigOLE()
+    return {'desglose': {a: motor.desglose_tiempos(r.detalle, config) for a, r in ctx['mensual'].items()}}
+
+
+def etapa_exportacion(ctx):
+    hojas = {'FTE_Diario_Detalle': motor.unir_diarios(ctx['diario']).detalle}
+    hojas.update({f'Detalle_FTE_{a}': r.detalle for a, r in ctx['mensual'].items()})
+    return {'exportacion': exportar(hojas, 'xlsx')}
+
+
+ETAPAS = {
+    'ingesta': etapa_ingesta,
+    'normalizacion': etapa_normalizacion,
+    'scores': etapa_scores,
+    'fte_mensual': etapa_fte_mensual,
+    'fte_diario': etapa_fte_diario,
+    'demanda': etapa_demanda,
+    'desglose': etapa_desglose,
+    'exportacion': etapa_exportacion,
+}
+
+
+# ==============================================================================
+# MEDICIÓN
+# ==============================================================================
+def medir(etapa, ctx, repeticiones: int) -> tuple[dict, float, float]:
+    """(salida, mejor tiempo en segundos, pico de memoria en MB) de una etapa."""
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        salida = etapa(ctx)
+        mejor = min(mejor, time.perf_counter() - inicio)
+        if mejor > SEGUNDOS_SIN_REPETIR:
+            break
+
+    arrow_antes = pyarrow.total_allocated_bytes() if pyarrow is not None else 0
+    tracemalloc.start()
+    try:
+        salida_memoria = etapa(ctx)
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    arrow = pyarrow.total_allocated_bytes() - arrow_antes if pyarrow is not None else 0
+    del salida_memoria
+    return salida, mejor, (pico + max(arrow, 0)) / 2**20
+
+
+def calibrar(repeticiones: int = 5) -> float:
+    """Mejor tiempo, en segundos, de una carga fija parecida a las etapas: qué tan rápida es esta máquina."""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({'clave': rng.integers(0, 1_000, 1_000_000), 'valor': rng.random(1_000_000)})
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        df.groupby('clave')['valor'].sum()
+        np.sort(df['valor'].to_numpy())
+        sum(len(str(i)) for i in range(1_000_000))  # Python puro, como el parseo de openpyxl
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def correr(filas: int, repeticiones: int = 3, directorio: Path = DIRECTORIO_DATOS,
+           compacto: bool = False) -> dict[str, dict]:
+    rutas = generar(filas, directorio)
+    ctx = {f'bytes_{nombre}': ruta.read_bytes() for nombre, ruta in rutas.items()}
+    ctx['compacto'] = compacto
+    resultados = {}
+    for nombre, etapa in ETAPAS.items():
+        salida, segundos, memoria_mb = medir(etapa, ctx, repeticiones)
+        ctx.update(salida)
+        resultados[nombre] = {'segundos': round(segundos, 4), 'memoria_mb': round(memoria_mb, 2)}
+        print(f"  {nombre:<14} {segundos:>9.3f} s {memoria_mb:>10.1f} MB", flush=True)
+    return resultados
+
+
+def regresiones(resultados: dict, linea_base: dict, tolerancia_tiempo: float, tolerancia_memoria: float,
+                calibracion: float | None = None) -> list[str]:
+    """Etapas que empeoraron más que la tolerancia respecto de la línea base.
+
+    Con `calibracion`, los tiempos de cada tamaño de la línea base se escalan por la
+    relación entre ella y la calibración guardada con ese tamaño.
+    """
+    avisos = []
+    for filas, etapas in resultados.items():
+        medidas_base = linea_base.get(filas, {})
+        calibracion_base = medidas_base.get('calibracion', {}).get('segundos')
+        escala = calibracion / calibracion_base if calibracion and calibracion_base else 1.0
+        for etapa, medida in etapas.items():
+            base = medidas_base.get(etapa)
+            if base is None:
+                continue
+            segundos_base = base['segundos'] * escala
+            limite_s = max(segundos_base * (1 + tolerancia_tiempo), segundos_base + MARGEN_SEGUNDOS)
+            if medida['segundos'] > limite_s:
+                avisos.append(f"{filas} filas / {etapa}: {medida['segundos']:.3f} s (línea base {segundos_base:.3f} s)")
+            limite_mb = max(base['memoria_mb'] * (1 + tolerancia_memoria), base['memoria_mb'] + MARGEN_MB)
+            if medida['memoria_mb'] > limite_mb:
+                avisos.append(f"{filas} filas / {etapa}: {medida['memoria_mb']:.1f} MB (línea base {base['memoria_mb']:.1f} MB)")
+    return avisos
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--filas", type=int, nargs="+", default=TAMANIOS_DEFECTO)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--linea-base", type=Path, default=LINEA_BASE)
+    parser.add_argument("--actualizar-linea-base", action="store_true",
+                        help="Guarda las mediciones como nueva línea base en vez de compararlas")
+    parser.add_argument("--tolerancia-tiempo", type=float, default=TOLERANCIA_TIEMPO)
+    parser.add_argument("--tolerancia-memoria", type=float, default=TOLERANCIA_MEMORIA)
+    parser.add_argument("--salida", type=Path, help="Escribe las mediciones en este JSON")
+    parser.add_argument("--compacto", action="store_true",
+                        help="Solicitudes y cubo con columnas categóricas (se comparan contra '<filas>_compacto')")
+    parser.add_argument("--directorio", type=Path, default=DIRECTORIO_DATOS,
+                        help="Dónde se generan (o ya están) los Excel sintéticos")
+    args = parser.parse_args(argv)
+
+    calibracion = calibrar()
+    print(f"Calibración: {calibracion:.3f} s")
+    resultados = {}
+    for filas in args.filas:
+        print(f"{filas:,} filas" + (" (compacto)" if args.compacto else ""))
+        resultados[f"{filas}_compacto" if args.compacto else str(filas)] = correr(
+            filas, args.repeticiones, args.directorio, compacto=args.compacto
+        )
+    if args.salida:
+        args.salida.write_text(json.dumps(resultados, indent=2))
+
+    linea_base = json.loads(args.linea_base.read_text()) if args.linea_base.exists() else {}
+    if args.actualizar_linea_base:
+        # Cada tamaño guarda la calibración de la corrida en que se midió
+        linea_base.update({filas: {**etapas, 'calibracion': {'segundos': round(calibracion, 4)}}
+                           for filas, etapas in resultados.items()})
+        args.linea_base.write_text(json.dumps(linea_base, indent=2, sort_keys=True) + "\n")
+        print(f"Línea base actualizada: {args.linea_base}")
+        return 0
+
+    avisos = regresiones(resultados, linea_base, args.tolerancia_tiempo, args.tolerancia_memoria, calibracion)
+    for aviso in avisos:
+        print(f"REGRESIÓN {aviso}")
+    if not avisos:
+        print("Sin regresiones respecto de la línea base.")
+    return 1 if avisos else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""Genera libros sintéticos de Solicitudes, Pesos y Días Trabajados para los benchmarks.
+
+Los archivos tienen las mismas columnas que las exportaciones reales: 'Fin Real',
+'Resolutor' y 'Tipo de Pedido' en Solicitudes; 'TIPO DE PEDIDO' y 'Score' en
+Pesos; la hoja 'HorasTotales' con 'Nombre Técnico', 'Número Mes' y 'Dias
+Trabajados'. También reproducen el desorden habitual: nombres en minúsculas,
+tipos con espacios dobles o sin tildes, personas de otros equipos y fechas vacías.
+
+    python benchmarks/generar_datos.py --filas 10000 100000 1000000
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from motor_fte.equipo import EMPLEADOS_PERMITIDOS, MAPA_EMPLEADOS  # noqa: E402
+from motor_fte.normalizacion import CORRECCIONES_MANUALES  # noqa: E402
+
+try:
+    import xlsxwriter
+except ImportError:  # sin xlsxwriter se escribe con openpyxl (bastante más lento a 1M de filas)
+    xlsxwriter = None
+
+DIRECTORIO_DATOS = Path(__file__).resolve().parent / "datos"
+TAMANIOS = [10_000, 100_000, 1_000_000]
+ANIOS = [2024, 2025]
+N_TIPOS_EXTRA = 150
+OTROS_RESOLUTORES = ["PEDRO SOTO ROJAS", "MARIA PAZ FUENTES", "JUAN CARLOS VERA", "SIN ASIGNAR"]
+SEMILLA = 2024
+
+
+def tipos_de_pedido() -> tuple[list[str], list[str]]:
+    """(tipos tal como vienen en Solicitudes, tipos limpios del Excel de Pesos)."""
+    limpios = sorted(set(CORRECCIONES_MANUALES.values())) + [f"PROCESO BACK OFFICE {i:03d}" for i in range(N_TIPOS_EXTRA)]
+    crudos = list(CORRECCIONES_MANUALES) + [f"Proceso back office {i:03d}" for i in range(N_TIPOS_EXTRA)]
+    crudos += [f"proceso  back office {i:03d} " for i in range(0, N_TIPOS_EXTRA, 7)]  # espacios de más
+    return crudos, limpios
+
+
+def generar_solicitudes(filas: int, rng: np.random.Generator) -> pd.DataFrame:
+    crudos, _ = tipos_de_pedido()
+    # Pocos tipos concentran la mayoría de los tickets
+    pesos_tipo = rng.zipf(1.6, len(crudos)).astype(float)
+    tipo = rng.choice(len(crudos), filas, p=pesos_tipo / pesos_tipo.sum())
+
+    nombres = EMPLEADOS_PERMITIDOS + [n.lower() for n in EMPLEADOS_PERMITIDOS] + OTROS_RESOLUTORES
+    prob = np.r_[np.full(len(EMPLEADOS_PERMITIDOS), 0.10), np.full(len(EMPLEADOS_PERMITIDOS), 0.01),
+                 np.full(len(OTROS_RESOLUTORES), 0.0)]
+    prob[-len(OTROS_RESOLUTORES):] = (1 - prob.sum()) / len(OTROS_RESOLUTORES)
+    resolutor = rng.choice(len(nombres), filas, p=prob)
+
+    # Días hábiles de los años del benchmark, en horario de oficina
+    dias = pd.bdate_range(f"{ANIOS[0]}-01-01", f"{ANIOS[-1]}-12-31").to_numpy()
+    fin_real = (dias[rng.integers(0, len(dias), filas)]
+                + (rng.integers(8 * 3600, 19 * 3600, filas) * 1_000_000_000).astype('timedelta64[ns]'))
+    fin_real = pd.Series(fin_real)
+    fin_real[rng.random(filas) < 0.002] = pd.NaT  # tickets abiertos, sin fecha de cierre
+
+    return pd.DataFrame({
+        'ID': np.arange(1, filas + 1),
+        'Fin Real': fin_real,
+        'Resolutor': np.asarray(nombres, dtype=object)[resolutor],
+        'Tipo de Pedido': np.asarray(crudos, dtype=object)[tipo],
+        'Estado': rng.choice(np.array(['Cerrado', 'Cerrado', 'Cerrado', 'Anulado'], dtype=object), filas),
+        'Comentario': rng.choice(np.array(['', 'OK', 'Revisado por jefatura', 'Reingreso'], dtype=object), filas),
+    })
+
+
+def generar_pesos(rng: np.random.Generator) -> pd.DataFrame:
+    _, limpios = tipos_de_pedido()
+    # Algunos tipos quedan sin Score, como pasa cuando aparece un proceso nuevo
+    limpios = [t for t in limpios if rng.random() > 0.03]
+    return pd.DataFrame({
+        'TIPO DE PEDIDO': limpios,
+        'Peso': rng.integers(1, 4, len(limpios)),
+        'Score': rng.integers(5, 90, len(limpios)),
+    })
+
+
+def generar_dias_trabajados(rng: np.random.Generator) -> pd.DataFrame:
+    filas = [
+        (anio, usuario, mes, int(rng.integers(0, 23) if rng.random() < 0.1 else rng.integers(17, 23)))
+        for anio in ANIOS for usuario in MAPA_EMPLEADOS for mes in range(1, 13)
+    ]
+    return pd.DataFrame(filas, columns=['Año', 'Nombre Técnico', 'Número Mes', 'Dias Trabajados'])
+
+
+def escribir_xlsx(df: pd.DataFrame, ruta: Path, hoja: str = "Sheet1") -> None:
+    if xlsxwriter is None:
+        df.to_excel(ruta, sheet_name=hoja, index=False)
+        return
+    libro = xlsxwriter.Workbook(str(ruta), {'constant_memory': True, 'default_date_format': 'yyyy-mm-dd hh:mm:ss'})
+    pagina = libro.add_worksheet(hoja)
+    pagina.write_row(0, 0, list(df.columns))
+    columnas = [df[c].astype(object).where(df[c].notna(), None).to_numpy() for c in df.columns]
+    for i, fila in enumerate(zip(*columnas), start=1):
+        pagina.write_row(i, 0, fila)
+    libro.close()
+
+
+def generar(filas: int, directorio: Path = DIRECTORIO_DATOS, semilla: int = SEMILLA) -> dict[str, Path]:
+    """Escribe los tres libros de `filas` tickets (si no existen) y devuelve sus rutas."""
+    destino = directorio / str(filas)
+    rutas = {
+        'solicitudes': destino / "solicitudes.xlsx",
+        'pesos': destino / "pesos.xlsx",
+        'dias_trabajados': destino / "dias_trabajados.xlsx",
+    }
+    if all(r.exists() for r in rutas.values()):
+        return rutas
+    destino.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(semilla)
+    escribir_xlsx(generar_solicitudes(filas, rng), rutas['solicitudes'])
+    escribir_xlsx(generar_pesos(rng), rutas['pesos'])
+    escribir_xlsx(generar_dias_trabajados(rng), rutas['dias_trabajados'], hoja="HorasTotales")
+    return rutas
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--filas", type=int, nargs="+", default=TAMANIOS)
+    parser.add_argument("--directorio", type=Path, default=DIRECTORIO_DATOS)
+    parser.add_argument("--semilla", type=int, default=SEMILLA)
+    args = parser.parse_args(argv)
+    for filas in args.filas:
+        rutas = generar(filas, args.directorio, args.semilla)
+        print(f"{filas:>9,} filas -> {rutas['solicitudes'].parent}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+"""Motor de cálculo de la FTE App (lectura, limpieza y cálculo de FTE)."""
+
+from motor_fte.ingesta import (
+    CacheIngesta,
+    hash_contenido,
+    leer_dias_trabajados,
+    leer_pesos,
+    leer_solicitudes,
+)
+
+__all__ = [
+    "CacheIngesta",
+    "hash_contenido",
+    "leer_dias_trabajados",
+    "leer_pesos",
+    "leer_solicitudes",
+]
@@ -0,0 +1,169 @@
+"""Núcleo vectorizado del cálculo de FTE.
+
+Los parámetros por persona (equipo, ajuste de horas de contrato, minutos de chat
+y de reunión) se compilan desde la plantilla de resolutores a arreglos alineados
+con un índice de nombres. Cada fila se cruza con ellos por código entero y el
+FTE de toda la tabla sale de una sola expresión NumPy, sin llamar una función
+de Python por fila.
+"""
+
+from dataclasses import dataclass, replace
+
+import numpy as np
+import pandas as pd
+
+from motor_fte.equipo import (
+    MIN_CHAT_STD,
+    MINUTOS_REU_DIARIA,
+    plantilla_por_defecto,
+)
+
+
+@dataclass(frozen=True)
+class ParametrosResolutor:
+    """Parámetros por resolutor alineados con `nombres`.
+
+    Los arreglos tienen un elemento extra al final con el valor por defecto, así
+    el código -1 (resolutor que no está en la tabla) cae directo en ese valor.
+    `equipos` guarda el código de cada persona en `nombres_equipo` (-1 sin equipo).
+    """
+
+    nombres: pd.Index
+    ajuste_horas: np.ndarray
+    minutos_chat: np.ndarray
+    minutos_reunion: np.ndarray
+    equipos: np.ndarray
+    nombres_equipo: pd.Index
+    usuarios: np.ndarray  # usuario del Excel de Días Trabajados (None si no tiene), sin elemento extra
+
+    def codificar(self, resolutores) -> np.ndarray:
+        return self.nombres.get_indexer(pd.Index(resolutores))
+
+    def horas(self, codigos: np.ndarray, horas_contrato: float) -> np.ndarray:
+        return horas_contrato + self.ajuste_horas[codigos]
+
+    def chat(self, codigos: np.ndarray) -> np.ndarray:
+        return self.minutos_chat[codigos]
+
+    def reunion(self, codigos: np.ndarray) -> np.ndarray:
+        return self.minutos_reunion[codigos]
+
+    def empleados(self) -> list[str]:
+        return list(self.nombres)
+
+    def del_equipo(self, equipo: str | None) -> 'ParametrosResolutor':
+        """Solo las personas de `equipo` (todas si es None); los códigos de equipo no cambian."""
+        if equipo is None:
+            return self
+        miembros = self.equipos[:-1] == self.nombres_equipo.get_loc(equipo)
+        con_defecto = np.append(miembros, True)
+        return replace(
+            self, nombres=self.nombres[miembros], ajuste_horas=self.ajuste_horas[con_defecto],
+            minutos_chat=self.minutos_chat[con_defecto], minutos_reunion=self.minutos_reunion[con_defecto],
+            equipos=self.equipos[con_defecto], usuarios=self.usuarios[miembros],
+        )
+
+    @property
+    def mapa_usuarios(self) -> dict:
+        """Usuario del Excel de Días Trabajados -> nombre en Solicitudes."""
+        return {u: n for u, n in zip(self.usuarios, self.nombres) if u is not None}
+
+
+def compilar_plantilla(plantilla: pd.DataFrame) -> ParametrosResolutor:
+    """Pasa la plantilla (ver `equipo.COLUMNAS_PLANTILLA`) a códigos enteros y arreglos por persona."""
+    nombres = pd.Index(plantilla['Resolutor'])
+    codigos_equipo, nombres_equipo = pd.factorize(plantilla['Equipo'])
+    usuarios = plantilla['Usuario'].astype(object)
+    return ParametrosResolutor(
+        nombres=nombres,
+        ajuste_horas=np.append(plantilla['Ajuste Horas'].to_numpy(dtype=float), 0.0),
+        minutos_chat=np.append(plantilla['Minutos Chat'].to_numpy(dtype=float), MIN_CHAT_STD),
+        minutos_reunion=np.append(plantilla['Minutos Reunión'].to_numpy(dtype=float), MINUTOS_REU_DIARIA),
+        equipos=np.append(codigos_equipo, -1),
+        nombres_equipo=pd.Index(nombres_equipo),
+        usuarios=usuarios.where(usuarios.notna(), None).to_numpy(),
+    )
+
+
+def parametros_por_defecto() -> ParametrosResolutor:
+    return compilar_plantilla(plantilla_por_defecto())
+
+
+def calcular_fte(numerador, dias, horas, ole) -> np.ndarray:
+    """FTE = carga / (horas * 60 * días * OLE); 0 cuando no hay capacidad."""
+    numerador = np.asarray(numerador, dtype=float)
+    denominador = np.asarray(horas, dtype=float) * 60 * np.asarray(dias, dtype=float) * ole
+    numerador, denominador = np.broadcast_arrays(numerador, denominador)
+    return np.divide(numerador, denominador, out=np.zeros(numerador.shape), where=denominador > 0)
+
+
+def calcular_fte_barrido(numerador, dias, ajuste_horas, oles, horas) -> np.ndarray:
+    """`calcular_fte` de cada fila para cada combinación (OLE, horas), sin recorrer la grilla.
+
+    Devuelve un arreglo (len(oles), len(horas), filas); `ajuste_horas` es el ajuste
+    de contrato de cada fila (ver `ParametrosResolutor.horas`).
+    """
+    numerador = np.asarray(numerador, dtype=float)
+    horas_fila = np.asarray(horas, dtype=float)[:, None] + np.asarray(ajuste_horas, dtype=float)[None, :]
+    capacidad = horas_fila * 60 * np.asarray(dias, dtype=float)[None, :]
+    numerador, capacidad = np.broadcast_arrays(numerador[None, :], capacidad)
+    por_hora = np.divide(numerador, capacidad, out=np.zeros(capacidad.shape), where=capacidad > 0)
+    return por_hora[None, :, :] / np.asarray(oles, dtype=float)[:, None, None]
+
+
+# ==============================================================================
+# DEMANDA FTE (CASO ESTÁNDAR Y CONTINGENCIA)
+# ==============================================================================
+def calcular_carga_demanda(df_base: pd.DataFrame, dias_habiles: pd.DataFrame, parametros: ParametrosResolutor,
+                           con_carga_admin: bool = True) -> pd.DataFrame:
+    """Carga de minutos por resolutor y mes si cada persona trabajara todos los días hábiles.
+
+    `df_base` trae 'Año', 'Mes_Num', 'Resolutor' y 'Score_Unitario' sumado; se cruza
+    con la tabla de `CalendarioHabil`. En contingencia (`con_carga_admin=False`) no se
+    suman reuniones ni chats. No depende del OLE ni de las horas de contrato.
+    """
+    df = df_base.merge(dias_habiles, on=['Año', 'Mes_Num'], how='left')
+    dias = df['Dias_Habiles'].fillna(0).to_numpy()
+    codigos = parametros.codificar(df['Resolutor'])
+
+    if con_carga_admin:
+        carga_admin = (parametros.reunion(codigos) + parametros.chat(codigos)) * dias
+    else:
+        carga_admin = np.zeros(len(df))
+
+    return pd.DataFrame({
+        'Mes_Num': df['Mes_Num'].astype(int),
+        'Resolutor': df['Resolutor'],
+        'Dias_Habiles': dias.astype(int),
+        'Score_Tickets': df['Score_Unitario'],
+        'Carga_Admin': carga_admin,
+        'Carga_Total': df['Score_Unitario'].to_numpy() + carga_admin,
+    })
+
+
+def calcular_fte_demanda(df_carga: pd.DataFrame, parametros: ParametrosResolutor,
+                         ole: float, horas: float) -> pd.DataFrame:
+    """Agrega 'Capacidad_Individual' y 'FTE_Ideal' a la carga de `calcular_carga_demanda`."""
+    df = df_carga.copy()
+    dias = df['Dias_Habiles'].to_numpy()
+    horas_p = parametros.horas(parametros.codificar(df['Resolutor']), horas)
+    df['Capacidad_Individual'] = horas_p * 60 * dias * ole
+    df['FTE_Ideal'] = calcular_fte(df['Carga_Total'], dias, horas_p, ole)
+    return df
+
+
+def calcular_demanda(df_base: pd.DataFrame, dias_habiles: pd.DataFrame, parametros: ParametrosResolutor,
+                     ole: float, horas: float, con_carga_admin: bool = True) -> pd.DataFrame:
+    """FTE ideal por resolutor y mes: `calcular_carga_demanda` + `calcular_fte_demanda`."""
+    df_carga = calcular_carga_demanda(df_base, dias_habiles, parametros, con_carga_admin)
+    return calcular_fte_demanda(df_carga, parametros, ole, horas)
+
+
+def resumir_demanda(df_demanda: pd.DataFrame, factor_shrinkage: float) -> pd.DataFrame:
+    df_mes = df_demanda.groupby('Mes_Num').agg(
+        FTE_Ideal_Total=('FTE_Ideal', 'sum'),
+        Dias_Habiles_Prom=('Dias_Habiles', 'max')
+    ).reset_index()
+    df_mes['Headcount_Requerido'] = df_mes['FTE_Ideal_Total'] / factor_shrinkage
+    df_mes['Personas_A_Contratar'] = np.ceil(df_mes['Headcount_Requerido'])
+    return df_mes
@@ -0,0 +1,46 @@
+"""Días hábiles por (año, mes), con soporte para un archivo local de feriados."""
+
+import io
+
+import numpy as np
+import pandas as pd
+
+
+def leer_feriados(datos: bytes) -> pd.DataFrame:
+    """Lee un CSV o XLSX de feriados y devuelve una columna 'Fecha' (datetime64[D]).
+
+    Se usa la columna 'Fecha' si existe; si no, la primera columna del archivo.
+    """
+    # Los XLSX son archivos zip: empiezan con 'PK'
+    if datos[:2] == b'PK':
+        df = pd.read_excel(io.BytesIO(datos))
+    else:
+        df = pd.read_csv(io.BytesIO(datos), sep=None, engine='python')
+    df.columns = [str(c).strip() for c in df.columns]
+    columna = next((c for c in df.columns if c.lower() == 'fecha'), df.columns[0])
+    fechas = pd.to_datetime(df[columna], errors='coerce', dayfirst=True).dropna()
+    return pd.DataFrame({'Fecha': fechas.values.astype('datetime64[D]')})
+
+
+class CalendarioHabil:
+    """Días hábiles (lunes a viernes, menos feriados) de cada mes.
+
+    La tabla de un conjunto de años se calcula con una sola llamada a
+    `np.busday_count` y queda guardada para los siguientes cruces.
+    """
+
+    def __init__(self, feriados=None):
+        feriados = [] if feriados is None else feriados
+        self.feriados = np.unique(np.asarray(feriados, dtype='datetime64[D]'))
+        self._tablas = {}
+
+    def tabla(self, anios) -> pd.DataFrame:
+        anios = tuple(sorted({int(a) for a in anios}))
+        if anios not in self._tablas:
+            anio_col = np.repeat(np.array(anios, dtype=int), 12)
+            mes_col = np.tile(np.arange(1, 13), len(anios))
+            inicio = ((anio_col - 1970) * 12 + (mes_col - 1)).astype('datetime64[M]')
+            fin = inicio + np.timedelta64(1, 'M')
+            dias = np.busday_count(inicio.astype('datetime64[D]'), fin.astype('datetime64[D]'), holidays=self.feriados)
+            self._tablas[anios] = pd.DataFrame({'Año': anio_col, 'Mes_Num': mes_col, 'Dias_Habiles': dias})
+        return self._tablas[anios]
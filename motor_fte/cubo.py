@@ -0,0 +1,134 @@
+"""Cubo de tickets Resolutor × Fecha × Tipo.
+
+Se arma una sola vez por carga de Solicitudes. Las vistas mensual, diaria, de
+demanda y de desglose son sumas sobre el cubo (miles de filas) en vez de
+groupbys sobre la tabla de tickets completa.
+"""
+
+from dataclasses import dataclass, replace
+
+import numpy as np
+import pandas as pd
+
+from motor_fte.ingesta import compactar, detectar_columna_fecha
+
+CLAVES_CUBO = ['Resolutor', 'Fecha', 'Tipo Limpio']
+CLAVES_PARTICION = ['Resolutor', 'Año', 'Mes_Num']
+
+
+@dataclass(frozen=True)
+class CuboTickets:
+    """Una fila por (Resolutor, Fecha, Tipo Limpio) con 'Año', 'Mes_Num', 'Tickets' y 'Score_Unitario'.
+
+    'Fecha' es datetime64 (día); 'Score_Unitario' es la suma de minutos de los
+    tickets de la celda y vale 0 hasta que el cubo se puntúa.
+    """
+    tabla: pd.DataFrame
+
+    @property
+    def anios(self) -> list[int]:
+        return sorted(int(a) for a in self.tabla['Año'].unique())
+
+    @property
+    def vacio(self) -> bool:
+        return self.tabla.empty
+
+    def compactado(self) -> 'CuboTickets':
+        """El mismo cubo con 'Resolutor' y 'Tipo Limpio' categóricos y los enteros en el tipo más chico."""
+        return replace(self, tabla=compactar(self.tabla))
+
+    def filtrar_anio(self, anio: int) -> 'CuboTickets':
+        return replace(self, tabla=self.tabla[self.tabla['Año'] == anio])
+
+    def filtrar_anios(self, anios) -> 'CuboTickets':
+        return replace(self, tabla=self.tabla[self.tabla['Año'].isin([int(a) for a in anios])])
+
+    def con_scores(self, minutos_por_tipo: pd.Series, particiones: pd.DataFrame | None = None) -> 'CuboTickets':
+        """Puntúa el cubo con los minutos de un ticket de cada tipo (índice = 'Tipo Limpio').
+
+        Con `particiones` solo se puntúan las celdas de esos (Resolutor, Año, Mes_Num);
+        el resto conserva el score que ya tenía.
+        """
+        tabla = self.tabla.copy()
+        if particiones is None:
+            tabla['Score_Unitario'] = tabla['Tickets'] * np.asarray(tabla['Tipo Limpio'].map(minutos_por_tipo), dtype=float)
+            return replace(self, tabla=tabla)
+        filas = self._en_particiones(particiones)
+        celdas = tabla[filas]
+        tabla['Score_Unitario'] = tabla['Score_Unitario'].astype(float)
+        tabla.loc[filas, 'Score_Unitario'] = celdas['Tickets'] * np.asarray(celdas['Tipo Limpio'].map(minutos_por_tipo), dtype=float)
+        return replace(self, tabla=tabla)
+
+    def _en_particiones(self, particiones: pd.DataFrame) -> np.ndarray:
+        afectadas = pd.MultiIndex.from_frame(particiones[CLAVES_PARTICION])
+        return pd.MultiIndex.from_frame(self.tabla[CLAVES_PARTICION]).isin(afectadas)
+
+    def recalcular_particiones(self, tickets: pd.DataFrame, particiones: pd.DataFrame) -> 'CuboTickets':
+        """Rehace solo las celdas de las particiones (Resolutor, Año, Mes_Num) indicadas.
+
+        `tickets` es la tabla completa de tickets ya normalizados (Resolutor,
+        Fecha del día, Tipo Limpio); el resto del cubo se conserva tal cual.
+        Las celdas recalculadas vuelven sin puntuar.
+        """
+        if particiones.empty:
+            return self
+        afectadas = pd.MultiIndex.from_frame(particiones[CLAVES_PARTICION])
+        fechas = tickets['Fecha'].dt
+        en_tickets = pd.MultiIndex.from_arrays(
+            [tickets['Resolutor'], fechas.year, fechas.month], names=CLAVES_PARTICION
+        ).isin(afectadas)
+        en_cubo = self._en_particiones(particiones)
+        recalculado = _contar(tickets[en_tickets])
+        return replace(self, tabla=pd.concat([self.tabla[~en_cubo], recalculado], ignore_index=True))
+
+    def _sumar(self, claves: list[str]) -> pd.DataFrame:
+        return self.tabla.groupby(claves, observed=True)['Score_Unitario'].sum().reset_index()
+
+    def mensual(self) -> pd.DataFrame:
+        """Equivale a `agregar_mensual` sobre los tickets puntuados."""
+        return self._sumar(['Resolutor', 'Mes_Num'])
+
+    def diario(self) -> pd.DataFrame:
+        """Equivale a `agregar_diario`; 'Fecha' vuelve como fecha (sin hora), igual que en los tickets."""
+        resumen = self._sumar(['Resolutor', 'Fecha'])
+        resumen['Fecha'] = resumen['Fecha'].dt.date
+        return resumen
+
+    def _por_anio(self, vista) -> dict[int, pd.DataFrame]:
+        return {
+            int(anio): vista(replace(self, tabla=grupo)).reset_index(drop=True)
+            for anio, grupo in self.tabla.groupby('Año', observed=True)
+        }
+
+    def mensual_por_anio(self) -> dict[int, pd.DataFrame]:
+        return self._por_anio(CuboTickets.mensual)
+
+    def diario_por_anio(self) -> dict[int, pd.DataFrame]:
+        return self._por_anio(CuboTickets.diario)
+
+
+def _contar(tickets: pd.DataFrame) -> pd.DataFrame:
+    tabla = tickets.groupby(CLAVES_CUBO, sort=True, observed=True).size().rename('Tickets').reset_index()
+    tabla.insert(0, 'Año', tabla['Fecha'].dt.year.astype(int))
+    tabla.insert(1, 'Mes_Num', tabla['Fecha'].dt.month.astype(int))
+    tabla['Score_Unitario'] = 0.0
+    return tabla
+
+
+def tickets_del_cubo(df_normalizado: pd.DataFrame) -> pd.DataFrame:
+    """Resolutor, Fecha (día, datetime64) y Tipo Limpio de cada ticket con fecha válida."""
+    col_fecha = detectar_columna_fecha(df_normalizado.columns)
+    return pd.DataFrame({
+        'Resolutor': df_normalizado['Resolutor'],
+        'Fecha': pd.to_datetime(df_normalizado[col_fecha]).dt.normalize(),
+        'Tipo Limpio': df_normalizado['Tipo Limpio'],
+    }).dropna(subset=['Fecha'])
+
+
+def construir_cubo(df_normalizado: pd.DataFrame) -> CuboTickets:
+    """Cuenta tickets por (Resolutor, Fecha, Tipo Limpio); los tickets sin fecha válida quedan fuera."""
+    return cubo_desde_tickets(tickets_del_cubo(df_normalizado))
+
+
+def cubo_desde_tickets(tickets: pd.DataFrame) -> CuboTickets:
+    return CuboTickets(_contar(tickets))
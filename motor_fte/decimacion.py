@@ -0,0 +1,49 @@
+"""Reducción de series largas para gráficos, conservando su forma (LTTB).
+
+Largest-Triangle-Three-Buckets divide la serie en tramos y de cada tramo se
+queda con el punto que forma el triángulo más grande con el punto elegido en
+el tramo anterior y el promedio del siguiente: los picos y valles sobreviven,
+a diferencia de promediar o tomar uno de cada N puntos.
+"""
+
+import numpy as np
+import pandas as pd
+
+MAX_PUNTOS_GRAFICO = 1_500
+
+
+def lttb(x, y, n_puntos: int) -> np.ndarray:
+    """Índices (ordenados) de los `n_puntos` que conserva LTTB; `x` debe venir ordenado."""
+    n = len(x)
+    if n_puntos >= n or n_puntos < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    # El primer y el último punto se conservan; el resto se reparte en n_puntos - 2 tramos
+    bordes = np.linspace(1, n - 1, n_puntos - 1).astype(int)
+    indices = np.empty(n_puntos, dtype=int)
+    indices[0], indices[-1] = 0, n - 1
+    elegido = 0
+    for i in range(n_puntos - 2):
+        inicio, fin = bordes[i], bordes[i + 1]
+        fin_siguiente = bordes[i + 2] if i + 2 < len(bordes) else n
+        x_prom = x[fin:fin_siguiente].mean()
+        y_prom = y[fin:fin_siguiente].mean()
+        area = np.abs(
+            (x[elegido] - x_prom) * (y[inicio:fin] - y[elegido])
+            - (x[elegido] - x[inicio:fin]) * (y_prom - y[elegido])
+        )
+        elegido = inicio + int(np.argmax(area))
+        indices[i + 1] = elegido
+    return indices
+
+
+def decimar(df: pd.DataFrame, x: str, y: str, n_puntos: int = MAX_PUNTOS_GRAFICO) -> pd.DataFrame:
+    """Las filas de `df` (ordenado por `x`) que conserva LTTB; sin cambios si ya tiene pocos puntos."""
+    if len(df) <= n_puntos:
+        return df
+    eje_x = df[x]
+    if not pd.api.types.is_numeric_dtype(eje_x):
+        eje_x = pd.to_datetime(eje_x).astype('int64')
+    return df.iloc[lttb(eje_x.to_numpy(), df[y].to_numpy(), n_puntos)]
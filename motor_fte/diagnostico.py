@@ -0,0 +1,215 @@
+"""Medición de las etapas reales de un cálculo: duración, filas y memoria.
+
+Cada vista arma un `Diagnostico` con la lista de etapas que espera (lectura,
+limpieza, scores, pivote, cruce, fte, render) y envuelve cada una con
+`etapa(...)`. Las etapas que no se ejecutan porque su resultado ya estaba en
+cache se anotan con `omitir(...)`, así la barra de progreso avanza igual y el
+panel muestra por qué no tardaron nada. La memoria es la diferencia del RSS del
+proceso antes y después de la etapa (puede ser negativa si la etapa libera más
+de lo que reserva).
+
+Las mediciones se agregan a un JSONL local (una línea por etapa) para seguir
+la evolución de los tiempos entre versiones o tamaños de archivo. El registro
+guarda solo las últimas `EJECUCIONES_GUARDADAS` ejecuciones y se lee desde el
+final, así su costo no crece con el historial.
+"""
+
+import json
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows: sin /proc ni resource la memoria queda sin medir
+    resource = None
+
+REGISTRO_DEFECTO = Path(os.environ.get("FTE_CACHE_DIR", ".fte_cache")) / "diagnostico.jsonl"
+COLUMNAS = ['etapa', 'segundos', 'filas', 'memoria_mb', 'nota']
+ETAPAS_CALCULO = ["lectura", "limpieza", "scores", "pivote", "cruce", "fte", "render"]
+# Las etapas cuyo resultado queda en cache; las demás se repiten (baratas) en cada rerun
+ETAPAS_CACHEADAS = ["limpieza", "scores", "pivote", "cruce"]
+EJECUCIONES_GUARDADAS = 500
+LIMITE_REGISTRO_BYTES = 2 * 2**20  # al superarlo se recorta a las últimas EJECUCIONES_GUARDADAS
+
+
+def memoria_proceso_mb() -> float | None:
+    """RSS actual del proceso en MB (en macOS, el máximo alcanzado; None si no se puede medir)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, AttributeError):
+        pass
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2**20  # bytes en macOS
+
+
+def contar_filas(resultado) -> int | None:
+    """Filas de lo que devolvió una etapa: DataFrame, cubo, carga o dict/lista de ellos."""
+    if isinstance(resultado, (pd.DataFrame, pd.Series)):
+        return len(resultado)
+    for atributo in ('tabla', 'detalle'):
+        if isinstance(getattr(resultado, atributo, None), pd.DataFrame):
+            return len(getattr(resultado, atributo))
+    if isinstance(resultado, dict):
+        resultado = list(resultado.values())
+    if isinstance(resultado, (list, tuple)):
+        filas = [contar_filas(r) for r in resultado]
+        return sum(f for f in filas if f is not None) if any(f is not None for f in filas) else None
+    return None
+
+
+@dataclass(frozen=True)
+class MedicionEtapa:
+    etapa: str
+    segundos: float
+    filas: int | None = None
+    memoria_mb: float | None = None
+    nota: str = ""  # por qué la etapa no se midió (en cache, incluida en otra...)
+
+
+class Diagnostico:
+    """Mediciones de una ejecución de una vista.
+
+    `al_medir(medicion, avance)` se llama al cerrar cada etapa, con el avance
+    entre 0 y 1 según las etapas esperadas; sirve para mover una barra de progreso.
+    Si una etapa se mide varias veces (p. ej. la lectura de cada archivo), se acumula.
+    """
+
+    def __init__(self, vista: str = "", etapas: list[str] | None = None, al_medir=None):
+        self.vista = vista
+        self.etapas = list(etapas or [])
+        self.al_medir = al_medir
+        self.mediciones: dict[str, MedicionEtapa] = {}
+
+    @contextmanager
+    def etapa(self, nombre: str, filas: int | None = None):
+        """Mide el bloque; el bloque puede completar las filas con `medicion['filas'] = n`."""
+        medicion = {'filas': filas}
+        memoria = memoria_proceso_mb()
+        inicio = time.perf_counter()
+        yield medicion
+        segundos = time.perf_counter() - inicio
+        delta = memoria_proceso_mb() - memoria if memoria is not None else None
+        self._agregar(MedicionEtapa(nombre, segundos, medicion['filas'], delta))
+
+    def medir(self, nombre: str, funcion, *args, **kwargs):
+        """Ejecuta `funcion` como la etapa `nombre` y cuenta las filas de lo que devuelve."""
+        with self.etapa(nombre) as medicion:
+            resultado = funcion(*args, **kwargs)
+            medicion['filas'] = contar_filas(resultado)
+        return resultado
+
+    def omitir(self, nombre: str, nota: str = "en cache", filas: int | None = None) -> None:
+        """Anota una etapa que no se ejecutó en esta corrida (si no se midió ya)."""
+        if nombre not in self.mediciones:
+            self._agregar(MedicionEtapa(nombre, 0.0, filas, None, nota))
+
+    def _agregar(self, medicion: MedicionEtapa) -> None:
+        previa = self.mediciones.get(medicion.etapa)
+        if previa is not None:
+            medicion = MedicionEtapa(
+                medicion.etapa, previa.segundos + medicion.segundos,
+                _sumar(previa.filas, medicion.filas), _sumar(previa.memoria_mb, medicion.memoria_mb),
+                previa.nota if previa.nota == medicion.nota else "",
+            )
+        self.mediciones[medicion.etapa] = medicion
+        if self.al_medir is not None:
+            hechas = sum(e in self.mediciones for e in self.etapas)
+            self.al_medir(medicion, min(hechas / len(self.etapas), 1.0) if self.etapas else 1.0)
+
+    @property
+    def recalculo(self) -> bool:
+        """Si alguna etapa con cache se ejecutó en esta corrida (y no salió de la cache)."""
+        return any(e in self.mediciones and not self.mediciones[e].nota for e in ETAPAS_CACHEADAS)
+
+    @property
+    def segundos_totales(self) -> float:
+        return sum(m.segundos for m in self.mediciones.values())
+
+    def ordenadas(self) -> list[MedicionEtapa]:
+        """Las mediciones en el orden esperado de las etapas (las no previstas van al final)."""
+        orden = [e for e in self.etapas if e in self.mediciones] + [e for e in self.mediciones if e not in self.etapas]
+        return [self.mediciones[e] for e in orden]
+
+    def tabla(self) -> pd.DataFrame:
+        return pd.DataFrame([asdict(m) for m in self.ordenadas()], columns=COLUMNAS)
+
+    def registrar(self, ruta: Path = REGISTRO_DEFECTO) -> None:
+        """Agrega las mediciones al JSONL; todas las líneas de esta ejecución comparten 'ejecucion'."""
+        if not self.mediciones:
+            return
+        base = {'fecha': datetime.now().isoformat(timespec='seconds'), 'ejecucion': uuid.uuid4().hex[:12], 'vista': self.vista}
+        ruta = Path(ruta)
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        with open(ruta, "a", encoding="utf-8") as f:
+            for medicion in self.ordenadas():
+                f.write(json.dumps({**base, **asdict(medicion)}, ensure_ascii=False) + "\n")
+        if ruta.stat().st_size > LIMITE_REGISTRO_BYTES:
+            _recortar(ruta, EJECUCIONES_GUARDADAS)
+
+
+def _sumar(a, b):
+    return b if a is None else a if b is None else a + b
+
+
+def _lineas_desde_el_final(ruta: Path, bloque: int = 2**16):
+    """Las líneas no vacías del archivo, de la última a la primera, leyendo de a bloques."""
+    with open(ruta, "rb") as f:
+        posicion = f.seek(0, os.SEEK_END)
+        resto = b""
+        while posicion > 0:
+            tamano = min(bloque, posicion)
+            posicion -= tamano
+            f.seek(posicion)
+            lineas = (f.read(tamano) + resto).split(b"\n")
+            resto = lineas.pop(0)  # puede estar cortada: se completa con el bloque anterior
+            for linea in reversed(lineas):
+                if linea.strip():
+                    yield linea.decode("utf-8")
+        if resto.strip():
+            yield resto.decode("utf-8")
+
+
+def _ultimas_ejecuciones(ruta: Path, ejecuciones: int, vista: str | None = None) -> list[dict]:
+    """Los registros de las últimas `ejecuciones` (de una vista, si se indica), en orden de escritura."""
+    registros, vistas = [], set()
+    for linea in _lineas_desde_el_final(ruta):
+        try:
+            registro = json.loads(linea)
+        except ValueError:
+            continue  # línea a medio escribir o dañada
+        if vista is not None and registro.get('vista') != vista:
+            continue
+        if registro.get('ejecucion') not in vistas:
+            if len(vistas) == ejecuciones:
+                break
+            vistas.add(registro.get('ejecucion'))
+        registros.append(registro)
+    registros.reverse()
+    return registros
+
+
+def _recortar(ruta: Path, ejecuciones: int) -> None:
+    # Temporal y rename: quien lee el registro nunca ve un archivo a medias
+    temporal = ruta.with_suffix(".tmp")
+    with open(temporal, "w", encoding="utf-8") as f:
+        for registro in _ultimas_ejecuciones(ruta, ejecuciones):
+            f.write(json.dumps(registro, ensure_ascii=False) + "\n")
+    os.replace(temporal, ruta)
+
+
+def leer_registro(ruta: Path = REGISTRO_DEFECTO, vista: str | None = None, ejecuciones: int = 30) -> pd.DataFrame:
+    """Las últimas `ejecuciones` del registro (de una vista, si se indica); vacío si no hay registro."""
+    ruta = Path(ruta)
+    columnas = ['fecha', 'ejecucion', 'vista', *COLUMNAS]
+    if not ruta.exists():
+        return pd.DataFrame(columns=columnas)
+    return pd.DataFrame(_ultimas_ejecuciones(ruta, ejecuciones, vista), columns=columnas)
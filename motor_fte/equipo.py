@@ -0,0 +1,88 @@
+"""Personal del equipo de back-office que entra en el cálculo.
+
+Las constantes describen el equipo original; para otros equipos se carga una
+plantilla (CSV o XLSX) con los mismos datos por persona, ver `leer_plantilla`.
+"""
+
+import io
+
+import pandas as pd
+
+EMPLEADOS_PERMITIDOS = [
+    "JESSICA ACUNA VELASQUEZ", "ALEJANDRA MATUS DURAN", "DIANA CARRASCO HERRERA",
+    "CLEMENTINA GALAZ MATTA", "BRENDA OLGUIN QUIROZ",
+    "STEPHANIE CIFUENTES LUENGO", "KARINNA ALVAREZ MORALES"
+]
+
+# Usuario del Excel de Días Trabajados -> nombre en Solicitudes
+MAPA_EMPLEADOS = {
+    "JACUNVE": "JESSICA ACUNA VELASQUEZ", "AMATUSD": "ALEJANDRA MATUS DURAN",
+    "DCARRAH": "DIANA CARRASCO HERRERA", "CGALAZ": "CLEMENTINA GALAZ MATTA",
+    "BOLGUIQ": "BRENDA OLGUIN QUIROZ", "SCIFUEN": "STEPHANIE CIFUENTES LUENGO",
+    "KARINNA": "KARINNA ALVAREZ MORALES"
+}
+
+# Tiempos administrativos diarios (minutos)
+REU_SEMANAL_TOTAL = (20 * 3) + 50 + 50
+MINUTOS_REU_DIARIA = REU_SEMANAL_TOTAL / 5
+MIN_CHAT_STD = 47
+
+# Excepciones por persona
+MINUTOS_CHAT_ESPECIALES = {"BRENDA OLGUIN QUIROZ": 90}
+AJUSTE_HORAS_CONTRATO = {"STEPHANIE CIFUENTES LUENGO": -1}
+
+
+# ==============================================================================
+# PLANTILLA DE RESOLUTORES
+# ==============================================================================
+# Una fila por persona; el archivo solo necesita 'Resolutor', el resto toma el valor estándar
+EQUIPO_DEFECTO = "BACK-OFFICE"
+COLUMNAS_PLANTILLA = ['Resolutor', 'Usuario', 'Equipo', 'Ajuste Horas', 'Minutos Chat', 'Minutos Reunión']
+VALORES_DEFECTO_PLANTILLA = {
+    'Usuario': None,
+    'Equipo': EQUIPO_DEFECTO,
+    'Ajuste Horas': 0.0,
+    'Minutos Chat': MIN_CHAT_STD,
+    'Minutos Reunión': MINUTOS_REU_DIARIA,
+}
+
+
+def plantilla_por_defecto() -> pd.DataFrame:
+    """La plantilla del equipo de back-office armada con las constantes de este módulo."""
+    usuarios = {nombre: usuario for usuario, nombre in MAPA_EMPLEADOS.items()}
+    return pd.DataFrame({
+        'Resolutor': EMPLEADOS_PERMITIDOS,
+        'Usuario': [usuarios.get(n) for n in EMPLEADOS_PERMITIDOS],
+        'Equipo': EQUIPO_DEFECTO,
+        'Ajuste Horas': [float(AJUSTE_HORAS_CONTRATO.get(n, 0)) for n in EMPLEADOS_PERMITIDOS],
+        'Minutos Chat': [float(MINUTOS_CHAT_ESPECIALES.get(n, MIN_CHAT_STD)) for n in EMPLEADOS_PERMITIDOS],
+        'Minutos Reunión': MINUTOS_REU_DIARIA,
+    })
+
+
+def leer_plantilla(datos: bytes) -> pd.DataFrame:
+    """Lee un CSV o XLSX de plantilla y lo deja con `COLUMNAS_PLANTILLA`.
+
+    Los encabezados se comparan sin mayúsculas; las columnas o celdas que falten
+    toman los valores de `VALORES_DEFECTO_PLANTILLA`.
+    """
+    # Los XLSX son archivos zip: empiezan con 'PK'
+    if datos[:2] == b'PK':
+        df = pd.read_excel(io.BytesIO(datos))
+    else:
+        df = pd.read_csv(io.BytesIO(datos), sep=None, engine='python')
+    por_nombre = {str(c).strip().lower(): c for c in df.columns}
+    if 'resolutor' not in por_nombre:
+        raise ValueError("La plantilla necesita una columna 'Resolutor'.")
+
+    plantilla = pd.DataFrame({'Resolutor': df[por_nombre['resolutor']].astype(str).str.upper().str.strip()})
+    for columna, defecto in VALORES_DEFECTO_PLANTILLA.items():
+        original = por_nombre.get(columna.lower())
+        valores = df[original] if original is not None else pd.Series(defecto, index=df.index, dtype=object)
+        if columna in ('Usuario', 'Equipo'):
+            valores = valores.where(valores.isna(), valores.astype(str).str.strip())
+            plantilla[columna] = valores if defecto is None else valores.fillna(defecto).str.upper()
+        else:
+            plantilla[columna] = pd.to_numeric(valores, errors='coerce').fillna(defecto).astype(float)
+    plantilla = plantilla[plantilla['Resolutor'].ne('') & plantilla['Resolutor'].ne('NAN')]
+    return plantilla.drop_duplicates('Resolutor', keep='last', ignore_index=True)
@@ -0,0 +1,153 @@
+"""Exportación de resultados a XLSX, CSV o Parquet, generada solo cuando se pide.
+
+Los archivos se arman al momento de la descarga (no en cada rerun) y quedan en
+una cache pequeña indexada por el hash de las tablas y los parámetros, así una
+segunda descarga del mismo resultado no vuelve a serializar nada. El XLSX se
+escribe fila a fila con xlsxwriter en modo `constant_memory`: la memoria no
+crece con el tamaño del detalle diario.
+"""
+
+import hashlib
+import io
+import threading
+import zipfile
+from collections import OrderedDict
+
+import pandas as pd
+
+try:
+    import xlsxwriter
+except ImportError:  # sin xlsxwriter el XLSX se escribe con el motor por defecto de pandas
+    xlsxwriter = None
+
+try:
+    import pyarrow
+except ImportError:  # pyarrow es opcional: sin él no se ofrece Parquet
+    pyarrow = None
+
+FILAS_POR_BLOQUE_XLSX = 20_000
+LIMITE_EXPORTACIONES = 8
+
+FORMATOS = {"Excel (.xlsx)": "xlsx", "CSV": "csv", "Parquet": "parquet"}
+TIPOS_MIME = {
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+    "zip": "application/zip",
+}
+
+
+def formatos_disponibles() -> dict:
+    return {nombre: ext for nombre, ext in FORMATOS.items() if ext != "parquet" or pyarrow is not None}
+
+
+def huella_hojas(hojas: dict[str, pd.DataFrame], *parametros) -> str:
+    """Hash del contenido de cada tabla (valores, índice y columnas) más los parámetros."""
+    h = hashlib.sha256(repr(parametros).encode())
+    for nombre, df in hojas.items():
+        h.update(nombre.encode())
+        h.update(repr(list(df.columns)).encode())
+        h.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def extension(formato: str, n_hojas: int) -> str:
+    # CSV y Parquet guardan una tabla por archivo: con varias hojas se entregan en un zip
+    return formato if formato == "xlsx" or n_hojas == 1 else "zip"
+
+
+def nombre_archivo(base: str, formato: str, n_hojas: int) -> str:
+    return f"{base}.{extension(formato, n_hojas)}"
+
+
+# ==============================================================================
+# ESCRITORES
+# ==============================================================================
+def _filas_xlsx(df: pd.DataFrame):
+    # Bloques de filas como listas de Python, con los vacíos como None (celda en blanco)
+    for inicio in range(0, len(df), FILAS_POR_BLOQUE_XLSX):
+        bloque = df.iloc[inicio:inicio + FILAS_POR_BLOQUE_XLSX].astype(object)
+        yield from bloque.where(bloque.notna(), None).to_numpy().tolist()
+
+
+def _escribir_xlsx(hojas: dict[str, pd.DataFrame]) -> bytes:
+    buffer = io.BytesIO()
+    if xlsxwriter is None:
+        with pd.ExcelWriter(buffer) as writer:
+            for nombre, df in hojas.items():
+                df.to_excel(writer, sheet_name=nombre, index=False)
+        return buffer.getvalue()
+
+    # constant_memory exige escribir fila por fila en orden: solo se guarda la fila actual
+    libro = xlsxwriter.Workbook(buffer, {
+        'constant_memory': True, 'default_date_format': 'dd/mm/yyyy',
+        'strings_to_formulas': False, 'strings_to_urls': False,
+    })
+    negrita = libro.add_format({'bold': True})
+    for nombre, df in hojas.items():
+        hoja = libro.add_worksheet(nombre[:31])
+        hoja.write_row(0, 0, [str(c) for c in df.columns], negrita)
+        for i, fila in enumerate(_filas_xlsx(df), start=1):
+            hoja.write_row(i, 0, fila)
+    libro.close()
+    return buffer.getvalue()
+
+
+def _escribir_csv(df: pd.DataFrame) -> bytes:
+    # utf-8-sig para que Excel abra bien los acentos
+    return df.to_csv(index=False).encode('utf-8-sig')
+
+
+def _escribir_parquet(df: pd.DataFrame) -> bytes:
+    df = df.copy()
+    df.columns = [str(c) for c in df.columns]
+    # Arrow necesita un tipo por columna: las columnas de texto mezclado se guardan como texto
+    for c in df.columns:
+        if df[c].dtype == object and pd.api.types.infer_dtype(df[c], skipna=True).startswith('mixed'):
+            df[c] = df[c].where(df[c].isna(), df[c].astype(str))
+    buffer = io.BytesIO()
+    df.to_parquet(buffer, index=False)
+    return buffer.getvalue()
+
+
+def exportar(hojas: dict[str, pd.DataFrame], formato: str) -> bytes:
+    """Serializa las tablas (nombre de hoja -> DataFrame) en 'xlsx', 'csv' o 'parquet'."""
+    if formato == "xlsx":
+        return _escribir_xlsx(hojas)
+    escribir = _escribir_csv if formato == "csv" else _escribir_parquet
+    if len(hojas) == 1:
+        return escribir(next(iter(hojas.values())))
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archivo_zip:
+        for nombre, df in hojas.items():
+            archivo_zip.writestr(f"{nombre}.{formato}", escribir(df))
+    return buffer.getvalue()
+
+
+# ==============================================================================
+# CACHE
+# ==============================================================================
+class CacheExportaciones:
+    """Últimas exportaciones generadas, por huella de (tablas, formato, parámetros).
+
+    Las descargas diferidas de Streamlit se ejecutan fuera del script, por eso la
+    cache es un objeto propio (con lock) y no depende de `st.session_state`.
+    """
+
+    def __init__(self, limite: int = LIMITE_EXPORTACIONES):
+        self.limite = limite
+        self._entradas = OrderedDict()
+        self._lock = threading.Lock()
+
+    def obtener(self, hojas: dict[str, pd.DataFrame], formato: str, *parametros) -> bytes:
+        huella = huella_hojas(hojas, formato, *parametros)
+        with self._lock:
+            if huella in self._entradas:
+                self._entradas.move_to_end(huella)
+                return self._entradas[huella]
+        datos = exportar(hojas, formato)
+        with self._lock:
+            self._entradas[huella] = datos
+            while len(self._entradas) > self.limite:
+                self._entradas.popitem(last=False)
+        return datos
@@ -0,0 +1,155 @@
+"""Carga incremental de Solicitudes sobre un almacén persistente de tickets.
+
+Cada mes se vuelve a subir la exportación del Power APP con el año completo
+hasta la fecha. En vez de recalcular todo, el almacén guarda un ticket por ID
+junto a un hash de su contenido: de cada exportación solo entran los tickets
+nuevos o modificados, y el cubo rehace únicamente las particiones
+(Resolutor, Año, Mes) que esos tickets tocan.
+
+Si la exportación no trae columna de ID, la clave es el hash del contenido más
+el número de repetición dentro del archivo: dos exportaciones que se solapan
+producen las mismas claves y los tickets repetidos no se cuentan dos veces.
+
+Los tickets se guardan ya normalizados (filtrados por el personal del equipo y
+con las correcciones de tipo aplicadas), así que hay un almacén por cada
+combinación de plantilla, equipo y correcciones: la `clave` elige el archivo.
+"""
+
+import os
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from motor_fte.cubo import CLAVES_PARTICION, tickets_del_cubo
+from motor_fte.ingesta import detectar_columna_id
+
+try:
+    import pyarrow.feather as feather
+except ImportError:  # pyarrow es opcional: sin él no hay almacén persistente
+    feather = None
+
+DIRECTORIO_DEFECTO = Path(os.environ.get("FTE_CACHE_DIR", ".fte_cache")) / "tickets"
+
+
+def almacen_disponible() -> bool:
+    return feather is not None
+
+
+@dataclass(frozen=True)
+class CambiosIngesta:
+    nuevos: int
+    modificados: int
+    repetidos: int
+    particiones: pd.DataFrame = field(repr=False)  # Resolutor, Año, Mes_Num afectados
+
+    @property
+    def hay_cambios(self) -> bool:
+        return self.nuevos + self.modificados > 0
+
+
+def tickets_con_clave(df_normalizado: pd.DataFrame) -> pd.DataFrame:
+    """Tickets con fecha válida, con 'ID' (texto) y 'Hash' del contenido que usa el cálculo."""
+    tickets = tickets_del_cubo(df_normalizado)
+    hashes = pd.util.hash_pandas_object(tickets, index=False).to_numpy()
+
+    col_id = detectar_columna_id(df_normalizado.columns)
+    if col_id is not None:
+        ids = df_normalizado.loc[tickets.index, col_id].astype(str).to_numpy()
+    else:
+        repeticion = pd.Series(hashes).groupby(hashes).cumcount().to_numpy()
+        ids = np.char.add(np.char.add(hashes.astype(str), '-'), repeticion.astype(str))
+
+    tickets = tickets.reset_index(drop=True)
+    tickets.insert(0, 'ID', ids)
+    tickets['Hash'] = hashes
+    return tickets
+
+
+def _particiones(tickets: pd.DataFrame) -> pd.DataFrame:
+    fechas = tickets['Fecha'].dt
+    return pd.DataFrame({
+        'Resolutor': tickets['Resolutor'].to_numpy(),
+        'Año': fechas.year.to_numpy(),
+        'Mes_Num': fechas.month.to_numpy(),
+    }).drop_duplicates(ignore_index=True)
+
+
+class AlmacenTickets:
+    """Tickets normalizados de todas las exportaciones cargadas, uno por ID, guardados en Feather."""
+
+    def __init__(self, directorio=DIRECTORIO_DEFECTO, clave=None):
+        self.ruta = Path(directorio) / (f"tickets_{clave}.feather" if clave else "tickets.feather")
+        self.tickets = self._cargar()
+
+    def _version_en_disco(self):
+        try:
+            return self.ruta.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def _cargar(self) -> pd.DataFrame:
+        self._version = self._version_en_disco()
+        if feather is not None and self._version is not None:
+            try:
+                return feather.read_feather(self.ruta)
+            except (OSError, ValueError):
+                pass  # almacén corrupto: se parte de cero
+        return pd.DataFrame({
+            'ID': pd.Series(dtype=object),
+            'Resolutor': pd.Series(dtype=object),
+            'Fecha': pd.Series(dtype='datetime64[ns]'),
+            'Tipo Limpio': pd.Series(dtype=object),
+            'Hash': pd.Series(dtype='uint64'),
+        })
+
+    def guardar(self) -> None:
+        # Temporal con nombre único y rename atómico: otra sesión que escribe el mismo almacén
+        # no pisa el temporal y nadie lee un archivo a medias
+        self.ruta.parent.mkdir(parents=True, exist_ok=True)
+        descriptor, temporal = tempfile.mkstemp(prefix=self.ruta.stem + ".", suffix=".tmp", dir=self.ruta.parent)
+        os.close(descriptor)
+        try:
+            feather.write_feather(self.tickets, temporal)
+            os.replace(temporal, self.ruta)
+        except BaseException:
+            Path(temporal).unlink(missing_ok=True)
+            raise
+        self._version = self._version_en_disco()
+
+    def actualizar(self, df_normalizado: pd.DataFrame) -> CambiosIngesta:
+        """Agrega los tickets nuevos o modificados de una exportación y guarda el almacén."""
+        if self._version_en_disco() != self._version:
+            self.tickets = self._cargar()  # otra sesión lo actualizó desde que se leyó
+        lote = tickets_con_clave(df_normalizado).drop_duplicates('ID', keep='last', ignore_index=True)
+
+        posiciones = pd.Index(self.tickets['ID']).get_indexer(lote['ID'])
+        nuevos = posiciones == -1
+        modificados = ~nuevos
+        modificados[modificados] = (
+            self.tickets['Hash'].to_numpy()[posiciones[modificados]] != lote['Hash'].to_numpy()[modificados]
+        )
+
+        # Las versiones anteriores de los modificados también marcan su partición (pueden cambiar de mes)
+        reemplazados = posiciones[modificados]
+        entrantes = lote[nuevos | modificados]
+        particiones = _particiones(pd.concat([self.tickets.iloc[reemplazados], entrantes]))
+
+        cambios = CambiosIngesta(
+            nuevos=int(nuevos.sum()),
+            modificados=int(modificados.sum()),
+            repetidos=int(len(lote) - nuevos.sum() - modificados.sum()),
+            particiones=particiones[CLAVES_PARTICION],
+        )
+        if cambios.hay_cambios:
+            conservar = np.ones(len(self.tickets), dtype=bool)
+            conservar[reemplazados] = False
+            self.tickets = pd.concat([self.tickets[conservar], entrantes], ignore_index=True)
+            self.guardar()
+        return cambios
+
+    def vaciar(self) -> None:
+        self.ruta.unlink(missing_ok=True)
+        self.tickets = self._cargar()
@@ -0,0 +1,372 @@
+"""Lectura de los Excel cargados: cada archivo se parsea una sola vez por contenido."""
+
+import hashlib
+import io
+from array import array
+from dataclasses import asdict, dataclass
+
+import numpy as np
+import openpyxl
+import pandas as pd
+
+FILAS_POR_BLOQUE = 50_000
+
+# Nombres (en minúscula) con que el Power APP exporta el identificador del ticket
+COLUMNAS_ID = ['id', 'id solicitud', 'n° solicitud', 'nro solicitud', 'número de solicitud', 'ticket']
+
+
+def hash_contenido(datos: bytes) -> str:
+    return hashlib.sha256(datos).hexdigest()
+
+
+# ==============================================================================
+# DETECCIÓN DE COLUMNAS DE SOLICITUDES
+# ==============================================================================
+def detectar_columna_fecha(columnas):
+    columnas = [str(c) for c in columnas]
+    for c in columnas:
+        if 'fin real' in c.lower():
+            return c
+    for c in columnas:
+        if 'fecha de creación' in c.lower():
+            return c
+    return None
+
+
+def detectar_columna_resolutor(columnas):
+    for c in columnas:
+        if 'Resolutor' in str(c) or 'Técnico' in str(c):
+            return c
+    return None
+
+
+def detectar_columna_id(columnas):
+    return next((c for c in columnas if str(c).strip().lower() in COLUMNAS_ID), None)
+
+
+def detectar_columnas(columnas) -> dict:
+    """Columnas que usa el cálculo: fecha ('Fin Real'), Resolutor y 'Tipo de Pedido' (y el ID, si viene)."""
+    columnas = [str(c).strip() for c in columnas]
+    return {
+        'fecha': detectar_columna_fecha(columnas),
+        'resolutor': detectar_columna_resolutor(columnas),
+        'tipo': 'Tipo de Pedido' if 'Tipo de Pedido' in columnas else None,
+        'id': detectar_columna_id(columnas),
+    }
+
+
+# ==============================================================================
+# FECHAS
+# ==============================================================================
+# Formatos que se prueban sobre una muestra de las fechas en texto; ante un
+# empate gana el primero (día antes que mes, como exporta el Power APP)
+FORMATOS_FECHA = [
+    '%d/%m/%Y %H:%M:%S', '%d/%m/%Y %H:%M', '%d/%m/%Y',
+    '%d-%m-%Y %H:%M:%S', '%d-%m-%Y %H:%M', '%d-%m-%Y',
+    '%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M', '%Y-%m-%d', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M:%S.%f',
+    '%m/%d/%Y %H:%M:%S', '%m/%d/%Y %H:%M', '%m/%d/%Y',
+]
+MUESTRA_FORMATO = 500
+EJEMPLOS_INVALIDOS = 3
+
+
+@dataclass(frozen=True)
+class ResumenFechas:
+    """Cómo se convirtió una columna de fechas."""
+    formato: str | None = None  # formato de las fechas en texto; None si venían como fecha o no se detectó
+    vacias: int = 0
+    invalidas: int = 0  # tenían texto pero no se pudieron leer: quedan como NaT
+    ejemplos: tuple = ()  # algunos de esos textos
+
+    def juntar(self, otro: 'ResumenFechas') -> 'ResumenFechas':
+        return ResumenFechas(
+            self.formato or otro.formato, self.vacias + otro.vacias, self.invalidas + otro.invalidas,
+            tuple(dict.fromkeys(self.ejemplos + otro.ejemplos))[:EJEMPLOS_INVALIDOS],
+        )
+
+
+def detectar_formato_fecha(textos: pd.Series) -> str | None:
+    """El formato de FORMATOS_FECHA que lee más fechas de una muestra de `textos` (None si ninguno lee alguna)."""
+    unicos = textos.dropna().drop_duplicates()
+    if unicos.empty:
+        return None
+    muestra = unicos.sample(min(len(unicos), MUESTRA_FORMATO), random_state=0) if len(unicos) > MUESTRA_FORMATO else unicos
+    leidas = {f: pd.to_datetime(muestra, format=f, errors='coerce').notna().sum() for f in FORMATOS_FECHA}
+    formato = max(leidas, key=leidas.get)  # max devuelve el primero entre los empatados
+    return formato if leidas[formato] else None
+
+
+def convertir_fechas(serie: pd.Series, formato: str | None = None) -> tuple[pd.Series, ResumenFechas]:
+    """Convierte una columna de fechas a datetime64 y cuenta las que quedan vacías.
+
+    Las fechas que openpyxl ya entrega como fecha se dejan tal cual. Las que
+    vienen como texto se leen con un solo formato (`formato` o el detectado en
+    una muestra), en vez de que pandas lo adivine con el primer valor: con
+    '03/04/2024' adivina mes/día y después descarta todos los '13/04/2024'.
+    """
+    if pd.api.types.is_datetime64_any_dtype(serie.dtype):
+        return serie, ResumenFechas(vacias=int(serie.isna().sum()))
+
+    indice, serie = serie.index, serie.reset_index(drop=True)
+    tipo = pd.api.types.infer_dtype(serie, skipna=True)
+    if tipo in ('datetime64', 'datetime', 'date', 'empty'):
+        fechas = pd.to_datetime(serie, errors='coerce')
+        resumen = ResumenFechas(vacias=int(serie.isna().sum()), invalidas=int((fechas.isna() & serie.notna()).sum()))
+        return fechas.set_axis(indice), resumen
+
+    if tipo == 'string':
+        es_texto = serie.notna().to_numpy()
+    else:  # mezcla de fechas, números y texto: solo el texto pasa por el formato
+        es_texto = np.fromiter((isinstance(v, str) for v in serie), dtype=bool, count=len(serie))
+    textos = serie[es_texto].astype(str).str.strip()
+    textos = textos[textos != '']
+    if formato is None:
+        formato = detectar_formato_fecha(textos)
+
+    fechas = pd.to_datetime(serie.where(~es_texto), errors='coerce')
+    if not textos.empty:
+        leidas = pd.to_datetime(textos, format=formato, errors='coerce') if formato else pd.to_datetime(textos, errors='coerce')
+        fechas[leidas.index] = leidas
+    vacias = int(fechas.isna().sum())
+    invalidas = textos[fechas[textos.index].isna()]
+    invalidas_otras = int((fechas.isna() & serie.notna() & ~es_texto).sum())  # números u objetos que no son fecha
+    return fechas.set_axis(indice), ResumenFechas(
+        formato, vacias - len(invalidas) - invalidas_otras, len(invalidas) + invalidas_otras,
+        tuple(invalidas.drop_duplicates().head(EJEMPLOS_INVALIDOS)),
+    )
+
+
+def columnas_de_fecha(fechas: pd.Series) -> dict[str, pd.Series]:
+    """'Fecha' (date, sin hora), 'Año' y 'Mes_Num' de una columna datetime64, derivadas una sola vez."""
+    if getattr(fechas.dt, 'tz', None) is not None:
+        dias = fechas.dt.date
+    else:
+        # Igual que .dt.date, pero NumPy crea los objetos date en vez de un bucle de Timestamps
+        dias = pd.Series(fechas.to_numpy().astype('datetime64[D]').astype(object), index=fechas.index)
+        dias = dias.where(fechas.notna(), pd.NaT)
+    return {'Fecha': dias, 'Año': fechas.dt.year, 'Mes_Num': fechas.dt.month}
+
+
+def preparar_fechas(df: pd.DataFrame) -> pd.DataFrame:
+    """Deja la columna de fecha de Solicitudes como datetime64 y guarda su `ResumenFechas` en `df.attrs`.
+
+    Así la conversión se hace una vez al leer el archivo (y queda en la cache
+    de ingesta y en los snapshots) y no cada vez que se normaliza.
+    """
+    col_fecha = detectar_columna_fecha(df.columns)
+    if col_fecha is None:
+        return df
+    columna = df[col_fecha]
+    fechas, resumen = convertir_fechas(columna)
+    if fechas is not columna:
+        df = df.copy(deep=False)
+        df[col_fecha] = fechas
+    df.attrs['fechas'] = asdict(resumen)
+    return df
+
+
+def resumen_fechas(df: pd.DataFrame) -> ResumenFechas | None:
+    """El `ResumenFechas` guardado por `preparar_fechas` o `motor.normalizar` (None si no hay)."""
+    guardado = df.attrs.get('fechas')
+    if guardado is None:
+        return None
+    return ResumenFechas(**{**guardado, 'ejemplos': tuple(guardado.get('ejemplos', ()))})
+
+
+# ==============================================================================
+# LECTORES DE CADA ARCHIVO
+# ==============================================================================
+def leer_solicitudes(datos: bytes) -> pd.DataFrame:
+    return preparar_fechas(pd.read_excel(io.BytesIO(datos)))
+
+
+def leer_pesos(datos: bytes) -> pd.DataFrame:
+    return pd.read_excel(io.BytesIO(datos))
+
+
+def leer_dias_trabajados(datos: bytes) -> pd.DataFrame:
+    # La hoja 'HorasTotales' es la oficial; si no existe se usa la primera hoja
+    try:
+        return pd.read_excel(io.BytesIO(datos), sheet_name='HorasTotales')
+    except ValueError:
+        return pd.read_excel(io.BytesIO(datos))
+
+
+# ==============================================================================
+# LECTURA EN STREAMING DE SOLICITUDES (SOLO COLUMNAS USADAS)
+# ==============================================================================
+class _ColumnaTexto:
+    """Acumula una columna de texto como códigos enteros: cada valor distinto se guarda una vez."""
+
+    def __init__(self):
+        self.codigos = array('l')
+        self.valores = {}
+
+    def agregar(self, valor) -> None:
+        if valor is None:
+            self.codigos.append(-1)
+            return
+        self.codigos.append(self.valores.setdefault(valor, len(self.valores)))
+
+    def filtrar(self, mascara: np.ndarray, desde: int) -> None:
+        # Descarta del último bloque (filas desde `desde`) las que no pasan el filtro
+        bloque = np.frombuffer(self.codigos, dtype=self.codigos.typecode)[desde:][mascara]
+        del self.codigos[desde:]
+        self.codigos.extend(bloque.tolist())
+
+    def a_array(self) -> np.ndarray:
+        categorias = np.empty(len(self.valores) + 1, dtype=object)
+        categorias[:-1] = list(self.valores)
+        categorias[-1] = np.nan
+        return categorias[np.frombuffer(self.codigos, dtype=self.codigos.typecode)]
+
+
+def leer_solicitudes_streaming(datos: bytes, anios=None, resolutores=None) -> pd.DataFrame:
+    """Lee Solicitudes con openpyxl en modo read-only, cargando solo fecha, Resolutor, 'Tipo de Pedido' e ID.
+
+    Primero detecta las columnas desde el encabezado y después recorre las filas
+    una a una, filtrando por `resolutores` (nombres en mayúscula) mientras lee.
+    Las fechas se convierten y se filtran por `anios` en bloques de
+    FILAS_POR_BLOQUE filas, así la memoria depende de las filas que pasan el
+    filtro y no del tamaño del Excel. Las columnas conservan su nombre original.
+    """
+    libro = openpyxl.load_workbook(io.BytesIO(datos), read_only=True, data_only=True)
+    try:
+        filas = libro.worksheets[0].iter_rows(values_only=True)
+        encabezado = next(filas, None)
+        if encabezado is None:
+            return pd.DataFrame()
+        nombres = [str(c).strip() if c is not None else '' for c in encabezado]
+        columnas = detectar_columnas(nombres)
+        i_fecha = nombres.index(columnas['fecha']) if columnas['fecha'] else None
+        i_res = nombres.index(columnas['resolutor']) if columnas['resolutor'] else None
+        i_tipo = nombres.index(columnas['tipo']) if columnas['tipo'] else None
+        i_id = nombres.index(columnas['id']) if columnas['id'] else None
+
+        permitidos = set(resolutores) if resolutores is not None and i_res is not None else None
+        anios = set(int(a) for a in anios) if anios is not None and i_fecha is not None else None
+
+        fechas = []
+        col_res = _ColumnaTexto()
+        col_tipo = _ColumnaTexto()
+        col_id = _ColumnaTexto()
+        bloque_fechas = []
+        inicio_bloque = 0
+        resumen = ResumenFechas()
+
+        def cerrar_bloque():
+            # Convierte las fechas del bloque (con el formato detectado en el primero) y descarta los años que no se piden
+            nonlocal bloque_fechas, inicio_bloque, resumen
+            if not bloque_fechas:
+                return
+            convertidas, resumen_bloque = convertir_fechas(pd.Series(bloque_fechas, dtype=object), resumen.formato)
+            resumen = resumen.juntar(resumen_bloque)
+            convertidas = convertidas.to_numpy()
+            if anios is not None:
+                mascara = pd.DatetimeIndex(convertidas).year.isin(list(anios))
+                convertidas = convertidas[mascara]
+                col_res.filtrar(mascara, inicio_bloque)
+                col_tipo.filtrar(mascara, inicio_bloque)
+                col_id.filtrar(mascara, inicio_bloque)
+            fechas.append(convertidas)
+            inicio_bloque = len(col_res.codigos)
+            bloque_fechas = []
+
+        for fila in filas:
+            resolutor = None
+            if i_res is not None and i_res < len(fila) and fila[i_res] is not None:
+                resolutor = str(fila[i_res]).upper().strip()
+            if permitidos is not None and resolutor not in permitidos:
+                continue
+            col_res.agregar(resolutor)
+            col_tipo.agregar(fila[i_tipo] if i_tipo is not None and i_tipo < len(fila) else None)
+            col_id.agregar(fila[i_id] if i_id is not None and i_id < len(fila) else None)
+            if i_fecha is not None:
+                bloque_fechas.append(fila[i_fecha] if i_fecha < len(fila) else None)
+                if len(bloque_fechas) >= FILAS_POR_BLOQUE:
+                    cerrar_bloque()
+        cerrar_bloque()
+    finally:
+        libro.close()
+
+    df = pd.DataFrame(index=pd.RangeIndex(len(col_res.codigos)))
+    if i_fecha is not None:
+        df[columnas['fecha']] = np.concatenate(fechas) if fechas else np.array([], dtype='datetime64[ns]')
+        df.attrs['fechas'] = asdict(resumen)
+    if i_res is not None:
+        df[columnas['resolutor']] = col_res.a_array()
+    if i_tipo is not None:
+        df[columnas['tipo']] = col_tipo.a_array()
+    if i_id is not None:
+        df[columnas['id']] = col_id.a_array()
+    return df
+
+
+# ==============================================================================
+# TIPOS COMPACTOS
+# ==============================================================================
+# Una columna de texto pasa a categórica si tiene a lo más esta proporción de valores distintos
+PROPORCION_CATEGORICA = 0.5
+
+
+def compactar(df: pd.DataFrame) -> pd.DataFrame:
+    """Texto repetido como categórica y enteros al tipo más chico que los contiene.
+
+    Las categorías quedan en orden alfabético, así ordenar o agrupar por sus
+    códigos da el mismo orden que por el texto. Los decimales se dejan en
+    float64: las sumas de minutos tienen que dar lo mismo que sin compactar.
+    """
+    columnas = {}
+    for c in df.columns:
+        serie = df[c]
+        if pd.api.types.is_integer_dtype(serie.dtype) and not pd.api.types.is_extension_array_dtype(serie.dtype):
+            columnas[c] = pd.to_numeric(serie, downcast='integer')
+        elif (serie.dtype == object or pd.api.types.is_string_dtype(serie.dtype)) \
+                and pd.api.types.infer_dtype(serie, skipna=True) == 'string' \
+                and serie.nunique() <= PROPORCION_CATEGORICA * len(serie):
+            columnas[c] = serie.astype('category')
+    if not columnas:
+        return df
+    compacto = df.copy(deep=False)
+    for c, serie in columnas.items():
+        compacto[c] = serie
+    return compacto
+
+
+def es_categorica(serie) -> bool:
+    return isinstance(getattr(serie, 'dtype', None), pd.CategoricalDtype)
+
+
+# ==============================================================================
+# CACHE POR HASH DE CONTENIDO
+# ==============================================================================
+class CacheIngesta:
+    """Guarda el DataFrame parseado de cada archivo junto al hash de sus bytes.
+
+    `almacen` es cualquier diccionario (en la app, `st.session_state`). Cada
+    clave guarda un solo archivo: al subir otro distinto se reemplaza la
+    entrada y el DataFrame anterior queda liberado.
+    """
+
+    PREFIJO = "_ingesta_"
+
+    def __init__(self, almacen):
+        self.almacen = almacen
+
+    def obtener(self, clave: str, datos: bytes, lector, copiar: bool = True) -> pd.DataFrame:
+        clave_interna = self.PREFIJO + clave
+        huella = hash_contenido(datos)
+        entrada = self.almacen.get(clave_interna)
+        if entrada is None or entrada[0] != huella:
+            self.almacen[clave_interna] = (huella, lector(datos))
+        # Copia para que ninguna pestaña modifique el DataFrame compartido; quien
+        # solo lo lee (p. ej. las etapas del motor, que copian) puede pedir copiar=False
+        df = self.almacen[clave_interna][1]
+        return df.copy() if copiar else df
+
+    def huella(self, clave: str):
+        entrada = self.almacen.get(self.PREFIJO + clave)
+        return entrada[0] if entrada is not None else None
+
+    def descartar(self, clave: str) -> None:
+        self.almacen.pop(self.PREFIJO + clave, None)
@@ -0,0 +1,282 @@
+"""Reportes de FTE en lote, sin Streamlit (p. ej. desde una tarea nocturna).
+
+Cada subdirectorio de la entrada es un trabajo con sus Excel de Solicitudes,
+Pesos y Días Trabajados (y, si se quiere, Feriados y Plantilla de resolutores);
+si la entrada no tiene subdirectorios, ella misma es el único trabajo. Los
+archivos se reconocen por su nombre ('Solicitudes_2025.xlsx', 'Días
+Trabajados.xlsx'...). Para cada equipo de la plantilla y cada año se escriben
+los mismos reportes que descarga la app: Reporte_FTE, FTE_Diario, Demanda_FTE
+y Contingencia_FTE, en `<salida>/<trabajo>/<equipo>/`.
+
+El manifiesto de la salida guarda la huella de las entradas de cada trabajo
+(archivos, parámetros, años, correcciones y formato): en la corrida siguiente
+los trabajos sin cambios se saltan.
+
+    python -m motor_fte.lote entradas/ --parametros parametros.json --salida reportes/
+    python -m motor_fte.lote entradas/ --parametros parametros.json --anios 2023-2025 --trabajadores 4
+
+Archivo de parámetros (JSON; cada clave es opcional y toma el valor de la app):
+
+    {"ole": 0.66, "horas": 7.9, "horas_demanda": 7.95, "anios": "2024-2025",
+     "shrinkage": 0.80, "shrinkage_contingencia": 0.85}
+"""
+
+import argparse
+import json
+import os
+import sys
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from motor_fte import motor
+from motor_fte.calculo import ParametrosResolutor, compilar_plantilla, parametros_por_defecto
+from motor_fte.calendario import CalendarioHabil, leer_feriados
+from motor_fte.cubo import construir_cubo
+from motor_fte.equipo import leer_plantilla
+from motor_fte.exportacion import exportar, formatos_disponibles, nombre_archivo
+from motor_fte.ingesta import hash_contenido, resumen_fechas
+from motor_fte.paralelo import TRABAJADORES_DEFECTO, cargas_en_paralelo
+from motor_fte.sugerencias import RUTA_DEFECTO, AlmacenCorrecciones, texto_comparable
+
+MANIFIESTO = "manifiesto.json"
+EXTENSIONES = {'.xlsx', '.csv'}
+# Palabras del nombre del archivo (sin tildes, en mayúscula) que indican qué archivo es; se revisan en orden
+ROLES_ARCHIVO = [
+    (('DIAS', 'TRABAJADOS', 'HORAS'), 'dias_trabajados'),
+    (('FERIADOS',), 'feriados'),
+    (('PLANTILLA', 'RESOLUTORES'), 'plantilla'),
+    (('PESOS',), 'pesos'),
+    (('SOLICITUDES',), 'solicitudes'),
+]
+ROLES_SOLO_XLSX = {'solicitudes', 'pesos', 'dias_trabajados'}
+
+
+@dataclass(frozen=True)
+class ParametrosLote:
+    ole: float = 0.66
+    horas: float = 7.9  # FTE mensual y diario
+    horas_demanda: float = 7.95  # demanda y contingencia, igual que en la app
+    anios: tuple[int, ...] | None = None  # None: todos los años de Solicitudes
+    shrinkage: float = motor.FACTOR_SHRINKAGE_DEMANDA
+    shrinkage_contingencia: float = motor.FACTOR_SHRINKAGE_CONTINGENCIA
+
+
+def rango_anios(valor) -> tuple[int, ...]:
+    """2025, '2023-2025', '2024,2025' o [2024, 2025] -> (años...)."""
+    if isinstance(valor, (list, tuple)):
+        return tuple(sorted({a for v in valor for a in rango_anios(v)}))
+    if isinstance(valor, int):
+        return (valor,)
+    anios = set()
+    for parte in str(valor).replace(' ', '').split(','):
+        desde, _, hasta = parte.partition('-')
+        if not desde.isdigit() or (hasta and not hasta.isdigit()):
+            raise ValueError(f"Año o rango de años inválido: '{parte}'")
+        anios.update(range(int(desde), int(hasta or desde) + 1))
+    return tuple(sorted(anios))
+
+
+def leer_parametros(ruta: Path | None) -> ParametrosLote:
+    if ruta is None:
+        return ParametrosLote()
+    valores = json.loads(Path(ruta).read_text(encoding="utf-8"))
+    if 'anio' in valores:
+        valores['anios'] = valores.pop('anio')
+    conocidas = {f.name for f in fields(ParametrosLote)}
+    desconocidas = sorted(set(valores) - conocidas)
+    if desconocidas:
+        raise ValueError(f"Parámetros desconocidos en {ruta}: {', '.join(desconocidas)}")
+    if valores.get('anios') is not None:
+        valores['anios'] = rango_anios(valores['anios'])
+    return ParametrosLote(**{k: v if k == 'anios' else float(v) for k, v in valores.items()})
+
+
+# ==============================================================================
+# TRABAJOS Y MANIFIESTO
+# ==============================================================================
+def _archivos(directorio: Path) -> list[Path]:
+    return sorted(r for r in directorio.iterdir() if r.is_file() and r.suffix.lower() in EXTENSIONES
+                  and not r.name.startswith(('.', '~$')))
+
+
+def buscar_trabajos(entrada: Path) -> list[Path]:
+    """La entrada, si tiene los archivos directamente, y cada subdirectorio que los tenga."""
+    trabajos = [entrada] if _archivos(entrada) else []
+    trabajos += [d for d in sorted(entrada.iterdir()) if d.is_dir() and not d.name.startswith('.') and _archivos(d)]
+    return trabajos
+
+
+def archivos_del_trabajo(directorio: Path) -> dict[str, Path]:
+    """Rol ('solicitudes', 'pesos', 'dias_trabajados', 'feriados', 'plantilla') -> archivo."""
+    roles = {}
+    for ruta in _archivos(directorio):
+        palabras = set(texto_comparable(ruta.stem).split())
+        rol = next((r for claves, r in ROLES_ARCHIVO if palabras & set(claves)), None)
+        if rol is None or (rol in ROLES_SOLO_XLSX and ruta.suffix.lower() != '.xlsx'):
+            continue
+        if rol in roles:
+            raise motor.ErrorDatos(f"Hay dos archivos de {rol} en {directorio}: {roles[rol].name} y {ruta.name}.")
+        roles[rol] = ruta
+    faltan = [r for r in ('solicitudes', 'pesos') if r not in roles]
+    if faltan:
+        raise motor.ErrorDatos(f"Faltan archivos de {' y '.join(faltan)} en {directorio}.")
+    return roles
+
+
+def huella_trabajo(datos: dict[str, bytes], parametros: ParametrosLote, correcciones: dict, formato: str) -> str:
+    contenido = {
+        'archivos': {rol: hash_contenido(d) for rol, d in sorted(datos.items())},
+        'parametros': asdict(parametros),
+        'correcciones': sorted(correcciones.items()),
+        'formato': formato,
+    }
+    return hash_contenido(json.dumps(contenido, sort_keys=True, ensure_ascii=False).encode())
+
+
+def leer_manifiesto(salida: Path) -> dict:
+    try:
+        return json.loads((salida / MANIFIESTO).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _escribir_atomico(ruta: Path, datos: bytes) -> None:
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    temporal = ruta.with_name(ruta.name + ".tmp")
+    temporal.write_bytes(datos)
+    os.replace(temporal, ruta)
+
+
+def guardar_manifiesto(salida: Path, manifiesto: dict) -> None:
+    _escribir_atomico(salida / MANIFIESTO, json.dumps(manifiesto, indent=2, ensure_ascii=False).encode("utf-8"))
+
+
+# ==============================================================================
+# CÁLCULO
+# ==============================================================================
+def reportes_equipo(cargas: motor.CargasMultiAnio, p: ParametrosLote,
+                    parametros: ParametrosResolutor) -> dict[str, dict[str, pd.DataFrame]]:
+    """Nombre base del archivo -> hojas, con los mismos nombres que las descargas de la app."""
+    reportes = {}
+    for anio, carga in cargas.mensual.items():
+        resultado = motor.fte_mensual_desde_carga(carga, motor.ParametrosFTE(p.ole, p.horas, anio), parametros)
+        reportes[f"Reporte_FTE_{anio}"] = {"Detalle_FTE": resultado.detalle, "Resumen_Mes": resultado.por_mes}
+    for anio, carga in cargas.diaria.items():
+        resultado = motor.fte_diario_desde_carga(carga, motor.ParametrosFTE(p.ole, p.horas, anio), parametros)
+        reportes[f"FTE_Diario_{anio}"] = {"FTE_Diario_Detalle": resultado.detalle}
+    for nombre, cargas_demanda, shrinkage in (("Demanda_FTE", cargas.demanda, p.shrinkage),
+                                              ("Contingencia_FTE", cargas.contingencia, p.shrinkage_contingencia)):
+        for anio, carga in cargas_demanda.items():
+            resultado = motor.demanda_desde_carga(carga, motor.ParametrosFTE(p.ole, p.horas_demanda, anio), parametros, shrinkage)
+            reportes[f"{nombre}_{anio}"] = {"Detalle": resultado.detalle, "Resumen_Mes": resultado.por_mes}
+    return reportes
+
+
+def _carpeta(nombre) -> str:
+    return "".join(c if c.isalnum() or c in " -_." else "_" for c in str(nombre)).strip() or "_"
+
+
+def procesar_trabajo(datos: dict[str, bytes], destino: Path, p: ParametrosLote, correcciones: dict,
+                     formato: str = "xlsx", trabajadores: int = TRABAJADORES_DEFECTO) -> list[Path]:
+    """Escribe los reportes de cada equipo y año en `destino` y devuelve las rutas escritas."""
+    entradas = motor.ingestar(datos['solicitudes'], datos['pesos'], datos.get('dias_trabajados'))
+    plantilla = compilar_plantilla(leer_plantilla(datos['plantilla'])) if 'plantilla' in datos else parametros_por_defecto()
+    calendario = CalendarioHabil(leer_feriados(datos['feriados'])['Fecha'] if 'feriados' in datos else None)
+
+    fechas = resumen_fechas(entradas.solicitudes)
+    if fechas is not None and fechas.invalidas:
+        print(f"  ⚠️ {fechas.invalidas} filas con fecha ilegible quedan fuera (p. ej. {', '.join(map(repr, fechas.ejemplos))})")
+    if entradas.dias_trabajados is None:
+        print("  Sin Días Trabajados: no se escribe el Reporte_FTE mensual")
+
+    escritos = []
+    for equipo in plantilla.nombres_equipo:
+        parametros = plantilla.del_equipo(equipo)
+        validacion = motor.validar_pesos(entradas.solicitudes, entradas.pesos, parametros.empleados(), correcciones)
+        if not validacion.completo:
+            print(f"  {equipo}: {len(validacion.faltantes)} tipos de pedido sin Score (cuentan solo los minutos base)")
+        cubo = motor.puntuar_cubo(
+            construir_cubo(motor.normalizar(entradas.solicitudes, parametros.empleados(), correcciones)), entradas.pesos
+        )
+        if p.anios is not None:
+            cubo = cubo.filtrar_anios(p.anios)
+        if cubo.vacio:
+            print(f"  {equipo}: sin tickets en los años pedidos")
+            continue
+        cargas = cargas_en_paralelo(cubo, entradas.dias_trabajados, calendario, parametros, trabajadores)
+        for base, hojas in reportes_equipo(cargas, p, parametros).items():
+            ruta = destino / _carpeta(equipo) / nombre_archivo(base, formato, len(hojas))
+            _escribir_atomico(ruta, exportar(hojas, formato))
+            escritos.append(ruta)
+        print(f"  {equipo}: años {', '.join(map(str, cubo.anios))}")
+    return escritos
+
+
+def correr(entrada: Path, salida: Path, p: ParametrosLote, correcciones: dict, formato: str = "xlsx",
+           trabajadores: int = TRABAJADORES_DEFECTO, forzar: bool = False) -> int:
+    """Procesa cada trabajo de `entrada`; devuelve cuántos fallaron."""
+    manifiesto = leer_manifiesto(salida)
+    fallidos = 0
+    for directorio in buscar_trabajos(entrada):
+        nombre = directorio.name if directorio != entrada else "."
+        try:
+            datos = {rol: ruta.read_bytes() for rol, ruta in archivos_del_trabajo(directorio).items()}
+            huella = huella_trabajo(datos, p, correcciones, formato)
+            previo = manifiesto.get(nombre, {})
+            if not forzar and previo.get('huella') == huella and all((salida / r).exists() for r in previo.get('reportes', [])):
+                print(f"{nombre}: sin cambios desde {previo.get('fecha')}, se salta")
+                continue
+            print(f"{nombre}:")
+            destino = salida / nombre
+            escritos = procesar_trabajo(datos, destino, p, correcciones, formato, trabajadores)
+        except motor.ErrorDatos as e:
+            print(f"{nombre}: ❌ {e}")
+            fallidos += 1
+            continue
+        except Exception as e:  # un libro dañado no detiene los demás trabajos
+            print(f"{nombre}: ❌ Ocurrió un error en el cálculo: {e!r}")
+            fallidos += 1
+            continue
+        manifiesto[nombre] = {
+            'huella': huella,
+            'fecha': datetime.now().isoformat(timespec='seconds'),
+            'reportes': sorted(str(r.relative_to(salida)) for r in escritos),
+        }
+        guardar_manifiesto(salida, manifiesto)
+        print(f"  {len(escritos)} reportes en {destino}")
+    return fallidos
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("entrada", type=Path, help="Directorio con los Excel (o con un subdirectorio por trabajo)")
+    parser.add_argument("--parametros", type=Path, help="JSON con ole, horas, horas_demanda, anios, shrinkage...")
+    parser.add_argument("--salida", type=Path, default=Path("reportes"))
+    parser.add_argument("--anios", help="'2025', '2023-2025' o '2024,2025'; reemplaza a 'anios' del archivo de parámetros")
+    parser.add_argument("--trabajadores", type=int, default=TRABAJADORES_DEFECTO,
+                        help="Procesos para repartir los equipos y años de cada trabajo")
+    parser.add_argument("--formato", choices=sorted(set(formatos_disponibles().values())), default="xlsx")
+    parser.add_argument("--correcciones", type=Path, default=RUTA_DEFECTO,
+                        help="JSON de correcciones de 'Tipo de Pedido' guardadas desde la app")
+    parser.add_argument("--forzar", action="store_true", help="Recalcula también los trabajos sin cambios")
+    args = parser.parse_args(argv)
+
+    if not args.entrada.is_dir():
+        parser.error(f"No existe el directorio {args.entrada}")
+    try:
+        parametros = leer_parametros(args.parametros)
+        if args.anios:
+            parametros = ParametrosLote(**{**asdict(parametros), 'anios': rango_anios(args.anios)})
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    correcciones = AlmacenCorrecciones(args.correcciones).vigentes()
+
+    fallidos = correr(args.entrada, args.salida, parametros, correcciones, args.formato, max(args.trabajadores, 1), args.forzar)
+    return 1 if fallidos else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
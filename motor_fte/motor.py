@@ -0,0 +1,772 @@
+"""Motor de cálculo FTE sin Streamlit.
+
+Cada etapa recibe y devuelve DataFrames o dataclasses tipadas, así se puede usar
+desde la app, desde un proceso programado o desde un benchmark:
+
+    ingestar -> normalizar -> construir_cubo -> puntuar_cubo -> cubo.mensual() / cubo.diario()
+             -> fte_mensual / fte_diario / demanda / contingencia -> desglose_tiempos
+
+(`puntuar` + `agregar_mensual` / `agregar_diario` hacen lo mismo ticket por ticket.)
+
+Cada cálculo de FTE se separa en la carga (`carga_mensual`, `carga_diaria`,
+`carga_demanda`: minutos y días, sin OLE ni horas) y la división final
+(`*_desde_carga`), así un cambio de OLE u horas reutiliza la carga.
+
+Los errores de datos (columnas faltantes, años sin registros) se informan con
+`ErrorDatos`, cuyo mensaje está pensado para mostrarse tal cual al usuario.
+"""
+
+from dataclasses import asdict, dataclass
+
+import numpy as np
+import pandas as pd
+
+from motor_fte.calculo import (
+    ParametrosResolutor,
+    calcular_carga_demanda,
+    calcular_fte,
+    calcular_fte_demanda,
+    calcular_fte_barrido,
+    parametros_por_defecto,
+    resumir_demanda,
+)
+from motor_fte.calendario import CalendarioHabil
+from motor_fte.cubo import CuboTickets
+from motor_fte.equipo import EMPLEADOS_PERMITIDOS, MAPA_EMPLEADOS
+from motor_fte.ingesta import (
+    columnas_de_fecha,
+    convertir_fechas,
+    detectar_columna_fecha,
+    detectar_columna_resolutor,
+    es_categorica,
+    leer_dias_trabajados,
+    leer_pesos,
+    leer_solicitudes,
+)
+from motor_fte.normalizacion import limpiar_serie, normalizar_tipo_pedido, por_categorias
+
+# Minutos fijos que se suman a cada ticket además de su Score
+MINUTOS_BASE_TICKET = 2.5
+# Minutos extra de reunión en los meses de planificación (enero y julio)
+MESES_REUNION_EXTRA = [1, 7]
+MINUTOS_REUNION_EXTRA = 60
+
+FACTOR_SHRINKAGE_DEMANDA = 0.80
+FACTOR_SHRINKAGE_CONTINGENCIA = 0.85
+
+COLUMNAS_ANIO = ['año', 'anio', 'year', 'ano']
+
+
+class ErrorDatos(ValueError):
+    """Los archivos cargados no traen lo que el cálculo necesita."""
+
+
+# ==============================================================================
+# PARÁMETROS Y RESULTADOS
+# ==============================================================================
+@dataclass(frozen=True)
+class ParametrosFTE:
+    ole: float
+    horas: float
+    anio: int
+
+
+@dataclass
+class Entradas:
+    solicitudes: pd.DataFrame
+    pesos: pd.DataFrame
+    dias_trabajados: pd.DataFrame | None = None
+
+
+@dataclass
+class ResultadoValidacion:
+    solicitudes: pd.DataFrame
+    faltantes: pd.DataFrame  # tipos sin Score y cuántas veces aparecen
+    filtro_personal: bool
+
+    @property
+    def completo(self) -> bool:
+        return self.faltantes.empty
+
+
+@dataclass
+class DiasTrabajados:
+    equipo: pd.DataFrame  # una fila por persona y mes, con la columna 'Resolutor'
+    filtrado_por_anio: bool
+
+    def tabla(self) -> pd.DataFrame:
+        return self.equipo.pivot_table(
+            index='Resolutor', columns='Número Mes', values='Dias Trabajados', aggfunc='sum'
+        ).fillna(0)
+
+
+@dataclass
+class CargaMensual:
+    """Lo que no depende del OLE ni de las horas: minutos de carga y días por persona y mes."""
+    anio: int
+    detalle: pd.DataFrame  # Resolutor x Mes con reuniones, Score, días y chats (ordenado por mes)
+    capacidad_real: pd.DataFrame  # personas con días trabajados por mes
+
+
+@dataclass
+class CargaDiaria:
+    anio: int
+    detalle: pd.DataFrame  # Resolutor x Fecha con Score y 'Carga_Minutos'
+    total: pd.DataFrame  # 'Carga_Total' del equipo por fecha
+
+
+@dataclass
+class CargaDemanda:
+    anio: int
+    detalle: pd.DataFrame  # Resolutor x Mes con días hábiles y 'Carga_Total'
+    con_carga_admin: bool
+
+
+@dataclass
+class ResultadoMensual:
+    anio: int
+    detalle: pd.DataFrame  # Resolutor x Mes con Score, reuniones, chats, días y FTE
+    por_mes: pd.DataFrame  # FTE total y personas efectivas por mes
+    capacidad_real: pd.DataFrame  # personas con días trabajados por mes
+
+
+@dataclass
+class ResultadoDiario:
+    anio: int
+    detalle: pd.DataFrame  # Resolutor x Fecha con carga y FTE diario
+    total: pd.DataFrame  # carga del equipo por fecha y personas necesarias
+
+
+@dataclass
+class ResultadoDemanda:
+    anio: int
+    detalle: pd.DataFrame
+    por_mes: pd.DataFrame
+    factor_shrinkage: float
+
+
+@dataclass(frozen=True)
+class ConfigOLE:
+    """Minutos diarios de pérdida que componen el OLE (pestaña Desglose)."""
+
+    horas: float = 7.95
+    almuerzo: float = 40.0
+    fisiologicas: float = 24.0
+    fatiga: float = 28.0
+    fallas: float = 10.0
+    reu_no_est: float = 30.4
+    micro: float = 30.0
+
+    @property
+    def minutos_totales(self) -> float:
+        return self.horas * 60
+
+    @property
+    def minutos_perdidos(self) -> float:
+        return self.fisiologicas + self.fatiga + self.almuerzo + self.fallas + self.reu_no_est + self.micro
+
+    @property
+    def ole_teorico(self) -> float:
+        if self.minutos_totales <= 0:
+            return 0
+        return (self.minutos_totales - self.minutos_perdidos) / self.minutos_totales
+
+
+COLS_DESGLOSE_BASE = [
+    'Operación (Tickets + Sin Tickets)',
+    'Reuniones Estandarizadas (Fijas)',
+    'Cat. C: Reuniones No Estandarizadas',
+    'Cat. B: Fallas de Sistema',
+    'Cat. C: MicroTareas (Gestión/Cursos/Soporte/Setup)',
+    'Capacidad Libre (Ocio / Proyectos)'
+]
+COLS_DESGLOSE_PAUSAS = [
+    'Cat. A: Necesidades Fisiológicas y Fatiga',
+    'Cat. A: Alimentación'
+]
+
+
+# ==============================================================================
+# 1. INGESTA
+# ==============================================================================
+def ingestar(solicitudes: bytes, pesos: bytes, dias_trabajados: bytes | None = None) -> Entradas:
+    return Entradas(
+        solicitudes=leer_solicitudes(solicitudes),
+        pesos=leer_pesos(pesos),
+        dias_trabajados=leer_dias_trabajados(dias_trabajados) if dias_trabajados is not None else None,
+    )
+
+
+# ==============================================================================
+# 2. NORMALIZACIÓN
+# ==============================================================================
+def _nombres_resolutor(serie: pd.Series) -> pd.Series:
+    # En una columna categórica se limpia cada nombre distinto una sola vez
+    def limpiar(nombres):
+        return nombres.astype(str).str.upper().str.strip()
+    return por_categorias(serie, limpiar) if es_categorica(serie) else limpiar(serie)
+
+
+def normalizar(df_solicitudes: pd.DataFrame, empleados=EMPLEADOS_PERMITIDOS, correcciones=None) -> pd.DataFrame:
+    """Deja una fila por ticket del equipo con 'Resolutor', 'Tipo Limpio', 'Fecha', 'Año' y 'Mes_Num'.
+
+    Los tickets sin fecha válida se conservan (con 'Año' vacío); `filtrar_anio` los descarta.
+    Cuántos son, y cuántos tenían un texto que no se pudo leer, queda en `ingesta.resumen_fechas(df)`.
+    `correcciones` reemplaza a `CORRECCIONES_MANUALES` (p. ej. con las guardadas desde la validación).
+    """
+    df = df_solicitudes.copy()
+    df.columns = [str(c).strip() for c in df.columns]
+
+    col_fecha = detectar_columna_fecha(df.columns)
+    if not col_fecha:
+        raise ErrorDatos("❌ No encontré la columna de 'Fin Real'.")
+    col_res = detectar_columna_resolutor(df.columns)
+    if not col_res:
+        raise ErrorDatos("⚠️ No encontré columna 'Resolutor'.")
+    if 'Tipo de Pedido' not in df.columns:
+        raise ErrorDatos("Falta la columna 'Tipo de Pedido'.")
+
+    df = df.rename(columns={col_res: 'Resolutor'})
+    df['Resolutor'] = _nombres_resolutor(df['Resolutor'])
+    if empleados is not None:
+        df = df[df['Resolutor'].isin(empleados)].copy()
+        if es_categorica(df['Resolutor']):
+            df['Resolutor'] = df['Resolutor'].cat.remove_unused_categories()
+
+    # Si el lector ya convirtió las fechas (`preparar_fechas`), acá no hay nada que parsear y se conserva su resumen
+    fechas, resumen = convertir_fechas(df[col_fecha])
+    df[col_fecha] = fechas
+    for columna, valores in columnas_de_fecha(fechas).items():
+        df[columna] = valores
+    df.attrs.setdefault('fechas', asdict(resumen))
+    df['Tipo Limpio'] = normalizar_tipo_pedido(df['Tipo de Pedido'], correcciones)
+    return df
+
+
+def filtrar_anio(df: pd.DataFrame, anio: int) -> pd.DataFrame:
+    df = df[df['Año'] == anio].copy()
+    df['Año'] = df['Año'].astype(int)
+    df['Mes_Num'] = df['Mes_Num'].astype(int)
+    return df
+
+
+def anios_disponibles(df: pd.DataFrame) -> list[int]:
+    return sorted(int(a) for a in df['Año'].dropna().unique())
+
+
+# ==============================================================================
+# 3. SCORES
+# ==============================================================================
+def _mapear(serie: pd.Series, tabla) -> pd.Series:
+    # Sobre una categórica, map trabaja por categoría y devuelve otra categórica: se deja numérica
+    mapeada = serie.map(tabla)
+    return mapeada.astype(float) if es_categorica(mapeada) else mapeada
+
+
+def tabla_scores(df_pesos: pd.DataFrame) -> dict:
+    df_p = df_pesos.copy()
+    df_p.columns = [str(c).strip() for c in df_p.columns]
+    df_p['TIPO DE PEDIDO'] = limpiar_serie(df_p['TIPO DE PEDIDO'])
+    return df_p.set_index('TIPO DE PEDIDO')['Score'].to_dict()
+
+
+def puntuar(df: pd.DataFrame, df_pesos: pd.DataFrame) -> pd.DataFrame:
+    """Agrega 'Score_Unitario' (minutos del ticket); los tipos sin peso cuentan solo los minutos base."""
+    df = df.copy()
+    df['Score_Unitario'] = _mapear(df['Tipo Limpio'], tabla_scores(df_pesos)).fillna(0) + MINUTOS_BASE_TICKET
+    return df
+
+
+def puntuar_cubo(cubo: CuboTickets, df_pesos: pd.DataFrame, particiones: pd.DataFrame | None = None) -> CuboTickets:
+    """Igual que `puntuar`, pero una vez por tipo distinto del cubo en vez de una vez por ticket.
+
+    Con `particiones` (Resolutor, Año, Mes_Num) solo se puntúan esas celdas; sirve
+    cuando el resto del cubo ya está puntuado con los mismos Pesos.
+    """
+    tipos = pd.Index(cubo.tabla['Tipo Limpio'].unique(), dtype=object)
+    minutos = pd.Series(tipos.map(tabla_scores(df_pesos)), index=tipos).fillna(0) + MINUTOS_BASE_TICKET
+    return cubo.con_scores(minutos, particiones)
+
+
+def validar_pesos(df_solicitudes: pd.DataFrame, df_pesos: pd.DataFrame,
+                  empleados=EMPLEADOS_PERMITIDOS, correcciones=None) -> ResultadoValidacion:
+    """Revisa que cada 'Tipo de Pedido' del equipo tenga Score en el Excel de Pesos."""
+    df_sol = df_solicitudes.copy()
+    df_sol.columns = df_sol.columns.str.strip()
+
+    col_resolutor = None
+    for posible in ['Resolutor', 'RESOLUTOR', 'Nombre Resolutor', 'Nombre Técnico']:
+        if posible in df_sol.columns:
+            col_resolutor = posible
+            break
+    if col_resolutor:
+        df_sol = df_sol.rename(columns={col_resolutor: 'Resolutor'})
+        df_sol['Resolutor'] = _nombres_resolutor(df_sol['Resolutor'])
+        df_sol = df_sol[df_sol['Resolutor'].isin(empleados)].copy()
+
+    if 'Tipo de Pedido' not in df_sol.columns:
+        raise ErrorDatos("Falta la columna 'Tipo de Pedido'.")
+
+    df_sol['Tipo de Pedido Normalizado'] = normalizar_tipo_pedido(df_sol['Tipo de Pedido'], correcciones)
+    df_sol['Score_Encontrado'] = _mapear(df_sol['Tipo de Pedido Normalizado'], tabla_scores(df_pesos))
+
+    df_faltantes = df_sol[df_sol['Score_Encontrado'].isna()]
+    conteo = df_faltantes['Tipo de Pedido Normalizado'].value_counts()
+    faltantes = conteo[conteo > 0].reset_index()  # una categórica cuenta también sus categorías sin filas
+    faltantes.columns = ['NOMBRE EXACTO A COPIAR', 'CANTIDAD']
+    if faltantes.empty:
+        df_sol['Score_Final'] = df_sol['Score_Encontrado'] + MINUTOS_BASE_TICKET
+    return ResultadoValidacion(df_sol, faltantes, col_resolutor is not None)
+
+
+# ==============================================================================
+# 4. AGREGACIÓN
+# ==============================================================================
+def agregar_mensual(df_puntuado: pd.DataFrame) -> pd.DataFrame:
+    return df_puntuado.groupby(['Resolutor', 'Mes_Num'], observed=True)['Score_Unitario'].sum().reset_index()
+
+
+def agregar_diario(df_puntuado: pd.DataFrame) -> pd.DataFrame:
+    return df_puntuado.groupby(['Resolutor', 'Fecha'], observed=True)['Score_Unitario'].sum().reset_index()
+
+
+# ==============================================================================
+# 5. DÍAS TRABAJADOS
+# ==============================================================================
+def _columna_anio(df: pd.DataFrame):
+    return next((c for c in df.columns if str(c).strip().lower() in COLUMNAS_ANIO), None)
+
+
+def _mapear_equipo(df: pd.DataFrame, mapa_empleados) -> pd.DataFrame:
+    df = df.copy()
+    if "Nombre Técnico" in df.columns:
+        df["Resolutor"] = df["Nombre Técnico"].map(mapa_empleados)
+    elif "Resolutor" not in df.columns:
+        raise ErrorDatos("Falta columna 'Nombre Técnico'")
+    return df.dropna(subset=['Resolutor'])
+
+
+def preparar_dias_trabajados(df_prod: pd.DataFrame, anio: int | None = None,
+                             mapa_empleados=MAPA_EMPLEADOS) -> DiasTrabajados:
+    col_anio = _columna_anio(df_prod)
+    if col_anio is not None and anio is not None:
+        df_prod = df_prod[df_prod[col_anio] == anio]
+    return DiasTrabajados(_mapear_equipo(df_prod, mapa_empleados), col_anio is not None)
+
+
+def dias_trabajados_por_anio(df_prod: pd.DataFrame, anios,
+                             mapa_empleados=MAPA_EMPLEADOS) -> dict[int, DiasTrabajados]:
+    """Igual que `preparar_dias_trabajados` para varios años, mapeando y agrupando una sola vez.
+
+    Si el Excel no tiene columna de año, todos los años usan todos los registros.
+    """
+    equipo = _mapear_equipo(df_prod, mapa_empleados)
+    col_anio = _columna_anio(equipo)
+    if col_anio is None:
+        return {int(a): DiasTrabajados(equipo, False) for a in anios}
+    grupos = dict(tuple(equipo.groupby(col_anio)))
+    return {
+        int(a): DiasTrabajados(grupos[a] if a in grupos else equipo.iloc[0:0], True)
+        for a in anios
+    }
+
+
+def capacidad_real(dias: DiasTrabajados) -> pd.DataFrame:
+    """Personas disponibles por mes: días trabajados del equipo / días hábiles del mes."""
+    df_activos = dias.equipo[dias.equipo['Dias Trabajados'] > 0]
+    if df_activos.empty:
+        return pd.DataFrame()
+    df_capacidad = df_activos.groupby('Número Mes').agg(
+        Dias_Totales_Trabajados=('Dias Trabajados', 'sum'),
+        Dias_Habiles_Mes=('Dias Trabajados', 'max'),
+        Personas_Activas=('Resolutor', 'nunique')
+    ).reset_index()
+    df_capacidad['Personas_Reales_Disponibles'] = df_capacidad['Dias_Totales_Trabajados'] / df_capacidad['Dias_Habiles_Mes']
+    df_capacidad['Mes'] = df_capacidad['Número Mes'].astype(str)
+    return df_capacidad
+
+
+# ==============================================================================
+# 6. FTE MENSUAL
+# ==============================================================================
+def _a_formato_largo(df_wide: pd.DataFrame, nombre_valor: str) -> pd.DataFrame:
+    df_wide = df_wide.reset_index()
+    df_wide.columns = [str(c) for c in df_wide.columns]
+    vars_cols = [c for c in df_wide.columns if c != 'Resolutor']
+    df_melted = df_wide.melt(id_vars=['Resolutor'], value_vars=vars_cols, var_name='Mes_Num', value_name=nombre_valor)
+    df_melted['Mes_Num'] = pd.to_numeric(df_melted['Mes_Num'], errors='coerce')
+    return df_melted.dropna(subset=['Mes_Num'])
+
+
+def carga_mensual(resumen_mensual: pd.DataFrame, dias: DiasTrabajados, anio: int,
+                  parametros: ParametrosResolutor | None = None) -> CargaMensual:
+    """Cruza Scores, reuniones, chats y días trabajados por persona y mes (el numerador del FTE)."""
+    parametros = parametros or parametros_por_defecto()
+    tabla_dias = dias.tabla()
+
+    codigos = parametros.codificar(tabla_dias.index)
+    tabla_reuniones = tabla_dias.mul(parametros.reunion(codigos), axis=0)
+    for m in MESES_REUNION_EXTRA:
+        if m in tabla_reuniones.columns:
+            tabla_reuniones.loc[tabla_reuniones[m] > 0, m] += MINUTOS_REUNION_EXTRA
+    tabla_chats = tabla_dias.mul(parametros.chat(codigos), axis=0)
+
+    df_final = pd.merge(_a_formato_largo(tabla_reuniones, 'Minutos_Reunion'), resumen_mensual,
+                        on=['Resolutor', 'Mes_Num'], how='left').fillna(0)
+    df_final = pd.merge(df_final, _a_formato_largo(tabla_dias, 'Dias_Trabajados'),
+                        on=['Resolutor', 'Mes_Num'], how='left').fillna(0)
+    df_final = pd.merge(df_final, _a_formato_largo(tabla_chats, 'Minutos_Chat'),
+                        on=['Resolutor', 'Mes_Num'], how='left').fillna(0)
+    df_final = df_final[(df_final['Dias_Trabajados'] > 0) | (df_final['Score_Unitario'] > 0)]
+    df_final = df_final.sort_values(by=['Mes_Num', 'Resolutor'])
+    return CargaMensual(anio, df_final, capacidad_mensual(df_final))
+
+
+def capacidad_mensual(df_final: pd.DataFrame) -> pd.DataFrame:
+    """'Capacidad_Real': personas con días trabajados en cada mes."""
+    df_capacidad = df_final[df_final['Dias_Trabajados'] > 0].groupby('Mes_Num')['Resolutor'].nunique().reset_index()
+    return df_capacidad.rename(columns={'Resolutor': 'Capacidad_Real'})
+
+
+def fte_mensual_desde_carga(carga: CargaMensual, params: ParametrosFTE,
+                            parametros: ParametrosResolutor | None = None) -> ResultadoMensual:
+    """FTE por persona y mes: (Scores + reuniones + chats) / (horas * 60 * días trabajados * OLE).
+
+    Solo hace la división final: cambiar OLE u horas no vuelve a cruzar las tablas.
+    """
+    parametros = parametros or parametros_por_defecto()
+    df_final = carga.detalle.copy()
+    codigos = parametros.codificar(df_final['Resolutor'])
+    df_final['FTE'] = calcular_fte(
+        df_final['Score_Unitario'] + df_final['Minutos_Reunion'] + df_final['Minutos_Chat'],
+        df_final['Dias_Trabajados'], parametros.horas(codigos, params.horas), params.ole
+    )
+
+    df_fte_mes = df_final.groupby(["Mes_Num"])["FTE"].sum().reset_index()
+    df_fte_mes['Personas Efectivas'] = np.ceil(df_fte_mes['FTE']).astype(int)
+
+    df_final.insert(1, 'Año', params.anio)
+    df_fte_mes.insert(0, 'Año', params.anio)
+    return ResultadoMensual(params.anio, df_final, df_fte_mes, carga.capacidad_real)
+
+
+def fte_mensual(resumen_mensual: pd.DataFrame, dias: DiasTrabajados, params: ParametrosFTE,
+                parametros: ParametrosResolutor | None = None) -> ResultadoMensual:
+    return fte_mensual_desde_carga(carga_mensual(resumen_mensual, dias, params.anio, parametros), params, parametros)
+
+
+# ==============================================================================
+# 7. FTE DIARIO
+# ==============================================================================
+def carga_diaria(resumen_diario: pd.DataFrame, anio: int,
+                 parametros: ParametrosResolutor | None = None) -> CargaDiaria:
+    """Minutos de cada persona por día, suponiendo la jornada completa con reuniones y chats."""
+    parametros = parametros or parametros_por_defecto()
+    df_diario = resumen_diario.copy()
+    codigos = parametros.codificar(df_diario['Resolutor'])
+    df_diario['Carga_Minutos'] = df_diario['Score_Unitario'] + parametros.reunion(codigos) + parametros.chat(codigos)
+    df_diario = df_diario.sort_values(by=['Resolutor', 'Fecha'])
+    return CargaDiaria(anio, df_diario, carga_total_diaria(df_diario))
+
+
+def carga_total_diaria(df_diario: pd.DataFrame) -> pd.DataFrame:
+    return df_diario.groupby('Fecha').agg(Carga_Total=('Carga_Minutos', 'sum')).reset_index()
+
+
+def fte_diario_desde_carga(carga: CargaDiaria, params: ParametrosFTE,
+                           parametros: ParametrosResolutor | None = None) -> ResultadoDiario:
+    parametros = parametros or parametros_por_defecto()
+    df_diario = carga.detalle.copy()
+    codigos = parametros.codificar(df_diario['Resolutor'])
+    df_diario['FTE_Diario'] = calcular_fte(
+        df_diario['Carga_Minutos'], 1, parametros.horas(codigos, params.horas), params.ole
+    )
+
+    df_total = carga.total.copy()
+    df_total['FTE_Logrado'] = calcular_fte(df_total['Carga_Total'], 1, params.horas, params.ole)
+    df_total['Personas_Necesarias'] = np.ceil(df_total['FTE_Logrado'])
+    return ResultadoDiario(params.anio, df_diario, df_total)
+
+
+def fte_diario(resumen_diario: pd.DataFrame, params: ParametrosFTE,
+               parametros: ParametrosResolutor | None = None) -> ResultadoDiario:
+    """FTE de cada persona por día, suponiendo la jornada completa con reuniones y chats."""
+    return fte_diario_desde_carga(carga_diaria(resumen_diario, params.anio, parametros), params, parametros)
+
+
+# ==============================================================================
+# 8. DEMANDA Y CONTINGENCIA
+# ==============================================================================
+def carga_demanda(resumen_mensual: pd.DataFrame, anio: int, calendario: CalendarioHabil | None = None,
+                  parametros: ParametrosResolutor | None = None, con_carga_admin: bool = True) -> CargaDemanda:
+    calendario = calendario or CalendarioHabil()
+    df_base = resumen_mensual.copy()
+    df_base['Año'] = int(anio)
+    df_carga = calcular_carga_demanda(
+        df_base, calendario.tabla([anio]), parametros or parametros_por_defecto(), con_carga_admin=con_carga_admin
+    )
+    return CargaDemanda(int(anio), df_carga, con_carga_admin)
+
+
+def demanda_desde_carga(carga: CargaDemanda, params: ParametrosFTE, parametros: ParametrosResolutor | None = None,
+                        factor_shrinkage: float = FACTOR_SHRINKAGE_DEMANDA) -> ResultadoDemanda:
+    df_demanda = calcular_fte_demanda(carga.detalle, parametros or parametros_por_defecto(), params.ole, params.horas)
+    df_mes = resumir_demanda(df_demanda, factor_shrinkage) if not df_demanda.empty else pd.DataFrame()
+    return ResultadoDemanda(params.anio, df_demanda, df_mes, factor_shrinkage)
+
+
+def demanda(resumen_mensual: pd.DataFrame, params: ParametrosFTE, calendario: CalendarioHabil | None = None,
+            parametros: ParametrosResolutor | None = None, factor_shrinkage: float = FACTOR_SHRINKAGE_DEMANDA,
+            con_carga_admin: bool = True) -> ResultadoDemanda:
+    carga = carga_demanda(resumen_mensual, params.anio, calendario, parametros, con_carga_admin)
+    return demanda_desde_carga(carga, params, parametros, factor_shrinkage)
+
+
+def contingencia(resumen_mensual: pd.DataFrame, params: ParametrosFTE, calendario: CalendarioHabil | None = None,
+                 parametros: ParametrosResolutor | None = None,
+                 factor_shrinkage: float = FACTOR_SHRINKAGE_CONTINGENCIA) -> ResultadoDemanda:
+    """Demanda sin reuniones ni chats: el personal dedicado 100% a procesos."""
+    return demanda(resumen_mensual, params, calendario, parametros, factor_shrinkage, con_carga_admin=False)
+
+
+# ==============================================================================
+# 9. TODOS LOS AÑOS EN UNA PASADA
+# ==============================================================================
+@dataclass
+class ResultadosMultiAnio:
+    mensual: dict[int, ResultadoMensual]
+    diario: dict[int, ResultadoDiario]
+    demanda: dict[int, ResultadoDemanda]
+    contingencia: dict[int, ResultadoDemanda]
+
+    @property
+    def anios(self) -> list[int]:
+        return sorted(set(self.mensual) | set(self.diario) | set(self.demanda))
+
+
+@dataclass
+class CargasMultiAnio:
+    """Las cargas de `ResultadosMultiAnio`, antes de aplicar OLE y horas."""
+    mensual: dict[int, CargaMensual]
+    diaria: dict[int, CargaDiaria]
+    demanda: dict[int, CargaDemanda]
+    contingencia: dict[int, CargaDemanda]
+
+
+def cargas_mensuales_por_anio(cubo: CuboTickets, df_prod: pd.DataFrame,
+                              parametros: ParametrosResolutor | None = None) -> dict[int, CargaMensual]:
+    parametros = parametros or parametros_por_defecto()
+    resumenes = cubo.mensual_por_anio()
+    dias = dias_trabajados_por_anio(df_prod, resumenes, parametros.mapa_usuarios)
+    return {anio: carga_mensual(resumen, dias[anio], anio, parametros) for anio, resumen in resumenes.items()}
+
+
+def cargas_diarias_por_anio(cubo: CuboTickets,
+                            parametros: ParametrosResolutor | None = None) -> dict[int, CargaDiaria]:
+    return {anio: carga_diaria(resumen, anio, parametros) for anio, resumen in cubo.diario_por_anio().items()}
+
+
+def cargas_demanda_por_anio(cubo: CuboTickets, calendario: CalendarioHabil | None = None,
+                            parametros: ParametrosResolutor | None = None,
+                            con_carga_admin: bool = True) -> dict[int, CargaDemanda]:
+    calendario = calendario or CalendarioHabil()
+    resumenes = cubo.mensual_por_anio()
+    calendario.tabla(resumenes)  # días hábiles de todos los años en una sola llamada
+    return {
+        anio: carga_demanda(resumen, anio, calendario, parametros, con_carga_admin)
+        for anio, resumen in resumenes.items()
+    }
+
+
+def fte_mensual_por_anio(cubo: CuboTickets, df_prod: pd.DataFrame, ole: float, horas: float,
+                         parametros: ParametrosResolutor | None = None) -> dict[int, ResultadoMensual]:
+    return {
+        anio: fte_mensual_desde_carga(carga, ParametrosFTE(ole, horas, anio), parametros)
+        for anio, carga in cargas_mensuales_por_anio(cubo, df_prod, parametros).items()
+    }
+
+
+def fte_diario_por_anio(cubo: CuboTickets, ole: float, horas: float,
+                        parametros: ParametrosResolutor | None = None) -> dict[int, ResultadoDiario]:
+    return {
+        anio: fte_diario_desde_carga(carga, ParametrosFTE(ole, horas, anio), parametros)
+        for anio, carga in cargas_diarias_por_anio(cubo, parametros).items()
+    }
+
+
+def demanda_por_anio(cubo: CuboTickets, ole: float, horas: float,
+                     calendario: CalendarioHabil | None = None, parametros: ParametrosResolutor | None = None,
+                     factor_shrinkage: float = FACTOR_SHRINKAGE_DEMANDA,
+                     con_carga_admin: bool = True) -> dict[int, ResultadoDemanda]:
+    return {
+        anio: demanda_desde_carga(carga, ParametrosFTE(ole, horas, anio), parametros, factor_shrinkage)
+        for anio, carga in cargas_demanda_por_anio(cubo, calendario, parametros, con_carga_admin).items()
+    }
+
+
+def contingencia_por_anio(cubo: CuboTickets, ole: float, horas: float,
+                          calendario: CalendarioHabil | None = None, parametros: ParametrosResolutor | None = None,
+                          factor_shrinkage: float = FACTOR_SHRINKAGE_CONTINGENCIA) -> dict[int, ResultadoDemanda]:
+    return demanda_por_anio(cubo, ole, horas, calendario, parametros, factor_shrinkage, con_carga_admin=False)
+
+
+def cargas_todos_los_anios(cubo: CuboTickets, df_prod: pd.DataFrame | None,
+                           calendario: CalendarioHabil | None = None,
+                           parametros: ParametrosResolutor | None = None) -> CargasMultiAnio:
+    calendario = calendario or CalendarioHabil()
+    return CargasMultiAnio(
+        mensual=cargas_mensuales_por_anio(cubo, df_prod, parametros) if df_prod is not None else {},
+        diaria=cargas_diarias_por_anio(cubo, parametros),
+        demanda=cargas_demanda_por_anio(cubo, calendario, parametros),
+        contingencia=cargas_demanda_por_anio(cubo, calendario, parametros, con_carga_admin=False),
+    )
+
+
+def resultados_desde_cargas(cargas: CargasMultiAnio, ole: float, horas: float,
+                            parametros: ParametrosResolutor | None = None) -> ResultadosMultiAnio:
+    return ResultadosMultiAnio(
+        mensual={a: fte_mensual_desde_carga(c, ParametrosFTE(ole, horas, a), parametros) for a, c in cargas.mensual.items()},
+        diario={a: fte_diario_desde_carga(c, ParametrosFTE(ole, horas, a), parametros) for a, c in cargas.diaria.items()},
+        demanda={
+            a: demanda_desde_carga(c, ParametrosFTE(ole, horas, a), parametros, FACTOR_SHRINKAGE_DEMANDA)
+            for a, c in cargas.demanda.items()
+        },
+        contingencia={
+            a: demanda_desde_carga(c, ParametrosFTE(ole, horas, a), parametros, FACTOR_SHRINKAGE_CONTINGENCIA)
+            for a, c in cargas.contingencia.items()
+        },
+    )
+
+
+def calcular_todos_los_anios(cubo: CuboTickets, df_prod: pd.DataFrame | None, ole: float, horas: float,
+                             calendario: CalendarioHabil | None = None,
+                             parametros: ParametrosResolutor | None = None) -> ResultadosMultiAnio:
+    """Mensual, diario, demanda y contingencia de todos los años presentes en los archivos."""
+    return resultados_desde_cargas(cargas_todos_los_anios(cubo, df_prod, calendario, parametros), ole, horas, parametros)
+
+
+def unir_diarios(resultados: dict[int, ResultadoDiario]) -> ResultadoDiario:
+    """Todos los años en un solo resultado diario (con 'anio' = último año), para series largas."""
+    anios = sorted(resultados)
+    return ResultadoDiario(
+        anios[-1],
+        pd.concat([resultados[a].detalle for a in anios], ignore_index=True),
+        pd.concat([resultados[a].total for a in anios], ignore_index=True),
+    )
+
+
+def comparativo_anual(resultados: dict[int, ResultadoMensual]) -> pd.DataFrame:
+    """FTE total por mes de cada año, una fila por (Año, Mes), para comparar año contra año."""
+    if not resultados:
+        return pd.DataFrame(columns=['Año', 'Mes_Num', 'FTE', 'Personas Efectivas'])
+    return pd.concat([resultados[a].por_mes for a in sorted(resultados)], ignore_index=True)
+
+
+# ==============================================================================
+# 10. DESGLOSE DE TIEMPOS
+# ==============================================================================
+def desglose_tiempos(df_fte: pd.DataFrame, config: ConfigOLE,
+                     parametros: ParametrosResolutor | None = None) -> pd.DataFrame:
+    """Reparte los minutos de cada persona y mes en operación, reuniones, categorías OLE y capacidad libre.
+
+    Todas las categorías salen de una sola matriz (filas × categorías); filtrar
+    por mes o mostrar/ocultar pausas después solo selecciona filas y columnas.
+    """
+    parametros = parametros or parametros_por_defecto()
+    dias = df_fte['Dias_Trabajados'].to_numpy(dtype=float)
+
+    minutos_por_dia = np.array([
+        config.fisiologicas + config.fatiga, config.almuerzo, config.fallas, config.reu_no_est, config.micro
+    ])
+    consumidos = np.column_stack([
+        (df_fte['Score_Unitario'] + df_fte['Minutos_Chat']).to_numpy(dtype=float),
+        df_fte['Minutos_Reunion'].to_numpy(dtype=float),
+        dias[:, None] * minutos_por_dia,
+    ])
+
+    # Lo que queda de la jornada teórica; si es negativo hubo horas extra y se deja en 0
+    horas_p = parametros.horas(parametros.codificar(df_fte['Resolutor']), config.horas)
+    libre = np.maximum(horas_p * 60 * dias - consumidos.sum(axis=1), 0)
+
+    categorias = pd.DataFrame(np.column_stack([consumidos, libre]), index=df_fte.index, columns=[
+        'Operación (Tickets + Sin Tickets)',
+        'Reuniones Estandarizadas (Fijas)',
+        'Cat. A: Necesidades Fisiológicas y Fatiga',
+        'Cat. A: Alimentación',
+        'Cat. B: Fallas de Sistema',
+        'Cat. C: Reuniones No Estandarizadas',
+        'Cat. C: MicroTareas (Gestión/Cursos/Soporte/Setup)',
+        'Capacidad Libre (Ocio / Proyectos)',
+    ])
+    return pd.concat([df_fte, categorias], axis=1)
+
+
+def resumen_desglose(df_desglose: pd.DataFrame, columnas: list[str]) -> pd.DataFrame:
+    df_total = df_desglose[columnas].sum().reset_index()
+    df_total.columns = ['Categoría', 'Minutos Totales']
+    df_total['Horas Totales'] = df_total['Minutos Totales'] / 60
+    df_total['%'] = (df_total['Minutos Totales'] / df_total['Minutos Totales'].sum()) * 100
+    return df_total
+
+
+def desglose_por_resolutor(df_desglose: pd.DataFrame, columnas: list[str]) -> pd.DataFrame:
+    df_resolutores = df_desglose.groupby('Resolutor', observed=True)[columnas].sum().reset_index()
+    df_melt = df_resolutores.melt(id_vars='Resolutor', value_vars=columnas, var_name='Categoría', value_name='Minutos')
+    df_melt['Horas'] = df_melt['Minutos'] / 60
+    return df_melt
+
+
+# ==============================================================================
+# 11. SENSIBILIDAD OLE × HORAS × SHRINKAGE
+# ==============================================================================
+def barrido_sensibilidad(numerador, dias, resolutores, meses, oles, horas, shrinkages,
+                         parametros: ParametrosResolutor | None = None) -> pd.DataFrame:
+    """FTE y personas de cada escenario OLE × horas × shrinkage en una sola pasada.
+
+    El numerador (minutos de carga) y los días no dependen de estos parámetros:
+    se calculan una vez y la grilla completa sale de un broadcast NumPy. Devuelve
+    una fila por escenario con el FTE mensual promedio y del mes pico, y el
+    headcount (FTE / shrinkage) del mes pico, redondeado hacia arriba en 'Personas_Pico'.
+    """
+    parametros = parametros or parametros_por_defecto()
+    oles, horas, shrinkages = (np.asarray(v, dtype=float) for v in (oles, horas, shrinkages))
+    ajuste = parametros.ajuste_horas[parametros.codificar(resolutores)]
+    fte = calcular_fte_barrido(numerador, dias, ajuste, oles, horas)  # (OLE, horas, filas)
+
+    # Suma por mes con una matriz de pertenencia: (OLE, horas, filas) @ (filas, meses)
+    codigos_mes, meses_unicos = pd.factorize(np.asarray(meses))
+    pertenencia = np.zeros((len(codigos_mes), len(meses_unicos)))
+    pertenencia[np.arange(len(codigos_mes)), codigos_mes] = 1
+    fte_mes = fte @ pertenencia
+    fte_promedio = fte_mes.mean(axis=-1) if len(meses_unicos) else np.zeros(fte_mes.shape[:2])
+    fte_pico = fte_mes.max(axis=-1, initial=0)
+    headcount_pico = fte_pico[:, :, None] / shrinkages[None, None, :]
+
+    forma = (len(oles), len(horas), len(shrinkages))
+    malla_ole, malla_horas, malla_shrinkage = np.meshgrid(oles, horas, shrinkages, indexing='ij')
+    return pd.DataFrame({
+        'OLE': malla_ole.ravel(),
+        'Horas': malla_horas.ravel(),
+        'Shrinkage': malla_shrinkage.ravel(),
+        'FTE_Promedio': np.broadcast_to(fte_promedio[:, :, None], forma).ravel(),
+        'FTE_Pico': np.broadcast_to(fte_pico[:, :, None], forma).ravel(),
+        'Headcount_Pico': headcount_pico.ravel(),
+        'Personas_Pico': np.ceil(headcount_pico).ravel().astype(int),
+    })
+
+
+def barrido_mensual(carga: CargaMensual, oles, horas, shrinkages=(1.0,),
+                    parametros: ParametrosResolutor | None = None) -> pd.DataFrame:
+    """Sensibilidad del FTE mensual (días trabajados reales); shrinkage 1.0 = sin ajuste."""
+    df = carga.detalle
+    numerador = df['Score_Unitario'] + df['Minutos_Reunion'] + df['Minutos_Chat']
+    return barrido_sensibilidad(numerador, df['Dias_Trabajados'], df['Resolutor'], df['Mes_Num'],
+                                oles, horas, shrinkages, parametros)
+
+
+def barrido_demanda(carga: CargaDemanda, oles, horas, shrinkages,
+                    parametros: ParametrosResolutor | None = None) -> pd.DataFrame:
+    """Sensibilidad de la demanda o la contingencia (días hábiles del calendario)."""
+    df = carga.detalle
+    return barrido_sensibilidad(df['Carga_Total'], df['Dias_Habiles'], df['Resolutor'], df['Mes_Num'],
+                                oles, horas, shrinkages, parametros)
@@ -0,0 +1,107 @@
+"""Limpieza de los nombres de 'Tipo de Pedido' y cruce con las correcciones manuales.
+
+Los mismos pocos cientos de tipos se repiten en decenas de miles de filas, así que
+la columna se factoriza y solo se limpian los valores distintos; el resultado se
+vuelve a expandir por código. Además se guarda un memo a nivel de proceso (compartido
+entre sesiones de Streamlit) para no limpiar dos veces el mismo texto.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Nombres del Power APP que no calzan con el Excel de Pesos (truncados, sin tildes, etc.)
+CORRECCIONES_MANUALES = {
+    "1. SOLICITUDES NIVEL 2": "SOLICITUDES NIVEL 2",
+    "ACLARACIONES DE CARGOS ABONOS": "ACLARACIONES DE CARGOS Y ABONOS",
+    "CERTIFICADO DE SALDO": "CERTIFICADO DE SALDOS",
+    "CONDONACION DE GASTOS": "CONDONACIÓN DE GASTOS",
+    "ENTREGA DE PAGARES ABOGADO ASIGNADO": "ENTREGA DE PAGARÉS ABOGADO ASIGNADO",
+    "INICIO - TERMINO DE DÍA CONTABLE": "INICIO - TÉRMINO DE DÍA CONTABLE",
+    "SIMULACIÓN DE CRÉDITOS": "SIMULACIÓN DE CRÉDITO",
+    "PAGO DE HONORARIOS": "PAGO HONORARIOS",
+    "SOLICITUD EMISIÓN DE PAGARÉ": "SOLICITUD EMISIÓN PAGARÉ",
+    "APLICACIÓN DE REMATE, DACIÓN EN PAGO O CONSIGNACIONES": "APLICACIÓN DE REMATE, DACIÓN EN PAGO O CONSIGNAC",
+    "EMISIÓN DE VALE VISTA VIRTUAL O ABONO A CUENTA BCI U OTRO BANCO": "EMISIÓN DE VALE VISTA VIRTUAL O ABONO A CUENTA BCI",
+    "ANB EMISIÓN DE VALE VISTA VIRTUAL O ABONO A CUENTA BCI U OTRO BANCO": "EMISIÓN DE VALE VISTA VIRTUAL O ABONO A CUENTA BCI",
+    "FOGAPE: CURSES PRORROGAS , MODIFICACIONES Y SEGUIMIENTO": "FOGAPE: CURSES PRÓRROGAS, MODIFICACIONES Y SEGUI",
+    "PROCESO LIR - CONDONACIÓN POR SENTENCIA DE TÉRMINO": "PROCESO LIR - CONDONACIÓN POR SENTENCIA DE TÉRMI",
+    "TRASLADO DE PAGARES": "RECEPCIÓN PAGARÉS OFICINA",
+    "INICIO DE DÍA CONTABLE": "INICIO - TÉRMINO DE DÍA CONTABLE"
+}
+
+# Texto original -> texto limpio. Se vacía si crece más allá del límite.
+_MEMO_LIMPIEZA = {}
+LIMITE_MEMO = 200_000
+
+
+def limpiar_texto(texto):
+    if pd.isna(texto):
+        return ""
+    texto_str = str(texto).upper().strip()
+    texto_str = texto_str.replace('\xa0', ' ')
+    texto_str = " ".join(texto_str.split())
+    return texto_str
+
+
+def _limpiar_unicos(unicos) -> np.ndarray:
+    # Solo los strings pasan por el memo: 1 y 1.0 son la misma clave de dict pero no el mismo texto
+    pendientes = [v for v in unicos if not isinstance(v, str) or v not in _MEMO_LIMPIEZA]
+    if pendientes:
+        # Mismo resultado que limpiar_texto: '\s' incluye el espacio duro (\xa0)
+        limpios = (
+            pd.Series(pendientes, dtype=object).astype(str)
+            .str.upper()
+            .str.replace(r'\s+', ' ', regex=True)
+            .str.strip()
+        )
+        if len(_MEMO_LIMPIEZA) + len(pendientes) > LIMITE_MEMO:
+            _MEMO_LIMPIEZA.clear()
+        limpios_por_valor = dict(zip(pendientes, limpios))
+        _MEMO_LIMPIEZA.update((k, v) for k, v in limpios_por_valor.items() if isinstance(k, str))
+    else:
+        limpios_por_valor = {}
+    return np.array(
+        [_MEMO_LIMPIEZA[v] if isinstance(v, str) and v in _MEMO_LIMPIEZA else limpios_por_valor[v] for v in unicos],
+        dtype=object
+    )
+
+
+def _expandir(serie: pd.Series, transformar) -> pd.Series:
+    # Factoriza, transforma solo los valores distintos y los reparte por código (-1 = vacío)
+    codigos, unicos = pd.factorize(serie)
+    valores = np.append(transformar(np.asarray(unicos, dtype=object)), "")
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        return _categorica(valores, codigos, serie)
+    return pd.Series(valores[codigos], index=serie.index, name=serie.name)
+
+
+def _categorica(valores: np.ndarray, codigos: np.ndarray, serie: pd.Series) -> pd.Series:
+    # Sigue categórica: valores que quedan iguales se unen y las categorías van en orden alfabético
+    nuevos, categorias = pd.factorize(valores, sort=True)
+    return pd.Series(pd.Categorical.from_codes(nuevos[codigos], categorias), index=serie.index, name=serie.name)
+
+
+def por_categorias(serie: pd.Series, transformar) -> pd.Series:
+    """`transformar(serie)` aplicado una vez por categoría; la serie sigue siendo categórica.
+
+    Los vacíos pasan por `transformar` igual que en la serie de texto (p. ej. astype(str) da 'nan').
+    """
+    categorias = pd.Series(list(serie.cat.categories) + [np.nan], dtype=object)
+    valores = np.asarray(transformar(categorias), dtype=object)
+    return _categorica(valores, np.asarray(serie.cat.codes), serie)
+
+
+def limpiar_serie(serie: pd.Series) -> pd.Series:
+    """Equivale a `serie.apply(limpiar_texto)`, limpiando cada valor distinto una sola vez."""
+    return _expandir(serie, _limpiar_unicos)
+
+
+def normalizar_tipo_pedido(serie: pd.Series, correcciones=None) -> pd.Series:
+    """Limpia 'Tipo de Pedido' y aplica las correcciones manuales sobre los valores distintos."""
+    correcciones = CORRECCIONES_MANUALES if correcciones is None else correcciones
+
+    def transformar(unicos):
+        limpios = _limpiar_unicos(unicos)
+        return np.array([correcciones.get(v, v) for v in limpios], dtype=object)
+
+    return _expandir(serie, transformar)
@@ -0,0 +1,108 @@
+"""Cálculo de todos los equipos y años repartido en un pool de procesos.
+
+Cada fragmento (equipo, año) tiene resolutores y meses propios, así que sus
+cargas se calculan por separado y después solo se concatenan: el resultado es
+el mismo que `motor.cargas_todos_los_anios` sobre el cubo completo. El Excel de
+Días Trabajados y el calendario se envían una vez por proceso, no por fragmento.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from motor_fte import motor
+from motor_fte.calculo import ParametrosResolutor, parametros_por_defecto
+from motor_fte.calendario import CalendarioHabil
+from motor_fte.cubo import CuboTickets
+
+# Procesos por defecto; en un servidor dedicado conviene FTE_TRABAJADORES = núcleos disponibles
+TRABAJADORES_DEFECTO = max(int(os.environ.get("FTE_TRABAJADORES", 1)), 1)
+
+# Entradas compartidas por todos los fragmentos de un proceso del pool
+_compartido = {}
+
+
+def _iniciar_proceso(df_prod: pd.DataFrame | None, calendario: CalendarioHabil) -> None:
+    _compartido['df_prod'] = df_prod
+    _compartido['calendario'] = calendario
+
+
+def _cargas_fragmento(cubo: CuboTickets, parametros: ParametrosResolutor) -> motor.CargasMultiAnio:
+    return motor.cargas_todos_los_anios(cubo, _compartido['df_prod'], _compartido['calendario'], parametros)
+
+
+def fragmentar(cubo: CuboTickets, parametros: ParametrosResolutor) -> list[tuple[CuboTickets, ParametrosResolutor]]:
+    """Un cubo (con los parámetros de su equipo) por cada (equipo, año).
+
+    Los resolutores que no están en la plantilla van juntos, con los parámetros completos.
+    """
+    codigos = parametros.equipos[parametros.codificar(cubo.tabla['Resolutor'])]
+    fragmentos = []
+    for (codigo, _anio), tabla in cubo.tabla.groupby([codigos, cubo.tabla['Año'].to_numpy()]):
+        equipo = parametros.nombres_equipo[codigo] if codigo >= 0 else None
+        fragmentos.append((CuboTickets(tabla), parametros.del_equipo(equipo)))
+    return fragmentos
+
+
+def _unir(tablas: list[pd.DataFrame], orden: list[str]) -> pd.DataFrame:
+    return pd.concat(tablas).sort_values(by=orden)
+
+
+def unir_cargas(partes: list[motor.CargasMultiAnio]) -> motor.CargasMultiAnio:
+    """Junta las cargas de varios fragmentos año por año, con el mismo orden que el cálculo completo."""
+    def por_anio(campo):
+        anios = {}
+        for parte in partes:
+            for anio, carga in getattr(parte, campo).items():
+                anios.setdefault(anio, []).append(carga)
+        return dict(sorted(anios.items()))
+
+    mensual = {}
+    for anio, cargas in por_anio('mensual').items():
+        detalle = _unir([c.detalle for c in cargas], ['Mes_Num', 'Resolutor'])
+        mensual[anio] = motor.CargaMensual(anio, detalle, motor.capacidad_mensual(detalle))
+    diaria = {}
+    for anio, cargas in por_anio('diaria').items():
+        detalle = _unir([c.detalle for c in cargas], ['Resolutor', 'Fecha'])
+        diaria[anio] = motor.CargaDiaria(anio, detalle, motor.carga_total_diaria(detalle))
+    demandas = []
+    for campo in ('demanda', 'contingencia'):
+        demandas.append({
+            anio: motor.CargaDemanda(
+                anio, _unir([c.detalle for c in cargas], ['Resolutor', 'Mes_Num']).reset_index(drop=True),
+                cargas[0].con_carga_admin,
+            )
+            for anio, cargas in por_anio(campo).items()
+        })
+    return motor.CargasMultiAnio(mensual, diaria, *demandas)
+
+
+def cargas_en_paralelo(cubo: CuboTickets, df_prod: pd.DataFrame | None,
+                       calendario: CalendarioHabil | None = None, parametros: ParametrosResolutor | None = None,
+                       trabajadores: int = TRABAJADORES_DEFECTO) -> motor.CargasMultiAnio:
+    """`motor.cargas_todos_los_anios` con un fragmento por (equipo, año) en `trabajadores` procesos."""
+    calendario = calendario or CalendarioHabil()
+    parametros = parametros or parametros_por_defecto()
+    if trabajadores <= 1:
+        return motor.cargas_todos_los_anios(cubo, df_prod, calendario, parametros)
+
+    calendario.tabla(cubo.anios)  # los procesos reciben los días hábiles ya calculados
+    fragmentos = fragmentar(cubo, parametros)
+    # 'spawn': la app corre en hilos de Streamlit y hacer fork de un proceso con hilos no es seguro
+    with ProcessPoolExecutor(
+        max_workers=min(trabajadores, len(fragmentos)) or 1, mp_context=multiprocessing.get_context('spawn'),
+        initializer=_iniciar_proceso, initargs=(df_prod, calendario),
+    ) as pool:
+        partes = list(pool.map(_cargas_fragmento, *zip(*fragmentos))) if fragmentos else []
+    return unir_cargas(partes)
+
+
+def calcular_en_paralelo(cubo: CuboTickets, df_prod: pd.DataFrame | None, ole: float, horas: float,
+                         calendario: CalendarioHabil | None = None, parametros: ParametrosResolutor | None = None,
+                         trabajadores: int = TRABAJADORES_DEFECTO) -> motor.ResultadosMultiAnio:
+    """Igual que `motor.calcular_todos_los_anios`, repartiendo las cargas entre procesos."""
+    parametros = parametros or parametros_por_defecto()
+    cargas = cargas_en_paralelo(cubo, df_prod, calendario, parametros, trabajadores)
+    return motor.resultados_desde_cargas(cargas, ole, horas, parametros)
@@ -0,0 +1,122 @@
+"""Snapshots columnares (Feather/Arrow) de Solicitudes guardados en disco local.
+
+Parsear el XLSX de Solicitudes es mucho más lento que el cálculo de FTE. La
+primera vez que se carga un archivo se guarda una copia columnar con tipos
+normalizados; las sesiones siguientes la leen con memory-map en vez de volver a
+parsear el Excel. Las columnas de texto, de fecha y las numéricas sin vacíos
+quedan apuntando al archivo mapeado, sin copiarse a la memoria del proceso (las
+que tienen vacíos sí se copian); el DataFrame cargado es de solo lectura hasta
+que alguien lo copia. Cada snapshot se identifica por el hash del archivo y el
+directorio tiene un tamaño máximo: al superarlo se borran los menos usados.
+"""
+
+import json
+import os
+from dataclasses import asdict
+from pathlib import Path
+
+import pandas as pd
+
+from motor_fte.ingesta import convertir_fechas, detectar_columnas
+
+try:
+    import pyarrow.feather as feather
+except ImportError:  # pyarrow es opcional: sin él simplemente no hay snapshots
+    feather = None
+
+DIRECTORIO_DEFECTO = Path(os.environ.get("FTE_CACHE_DIR", ".fte_cache")) / "snapshots"
+LIMITE_BYTES_DEFECTO = 1024 ** 3  # 1 GB
+
+
+def snapshots_disponibles() -> bool:
+    return feather is not None
+
+
+def normalizar_tipos(df: pd.DataFrame) -> tuple[pd.DataFrame, dict]:
+    """Deja el DataFrame listo para Arrow y devuelve las columnas detectadas."""
+    df = df.copy()
+    df.columns = [str(c).strip() for c in df.columns]
+    columnas = detectar_columnas(df.columns)
+
+    if columnas['fecha']:
+        # Si el lector ya convirtió las fechas, se conserva su resumen (el de acá no vería los textos ilegibles)
+        df[columnas['fecha']], resumen = convertir_fechas(df[columnas['fecha']])
+        df.attrs.setdefault('fechas', asdict(resumen))
+    if columnas['resolutor']:
+        df[columnas['resolutor']] = df[columnas['resolutor']].astype(str).str.upper().str.strip()
+
+    # Las columnas de texto del Power APP pueden mezclar números y strings;
+    # Arrow necesita un tipo único, así que se guardan como texto (los vacíos siguen vacíos)
+    for c in df.columns:
+        if df[c].dtype == object:
+            df[c] = df[c].where(df[c].isna(), df[c].astype(str))
+    return df, columnas
+
+
+class AlmacenSnapshots:
+    def __init__(self, directorio=DIRECTORIO_DEFECTO, limite_bytes=LIMITE_BYTES_DEFECTO):
+        self.directorio = Path(directorio)
+        self.limite_bytes = limite_bytes
+
+    def _ruta(self, huella: str) -> Path:
+        return self.directorio / f"{huella}.feather"
+
+    def _ruta_meta(self, huella: str) -> Path:
+        return self.directorio / f"{huella}.json"
+
+    def existe(self, huella: str) -> bool:
+        return self._ruta(huella).exists()
+
+    def guardar(self, huella: str, df: pd.DataFrame) -> pd.DataFrame:
+        df, columnas = normalizar_tipos(df)
+        self.directorio.mkdir(parents=True, exist_ok=True)
+
+        # Se escribe a un temporal y se renombra para no dejar snapshots a medias;
+        # sin compresión para que la lectura con memory-map no copie los buffers
+        ruta = self._ruta(huella)
+        temporal = ruta.with_suffix(".tmp")
+        feather.write_feather(df, temporal, compression='uncompressed')
+        os.replace(temporal, ruta)
+        self._ruta_meta(huella).write_text(json.dumps({'columnas': columnas, 'filas': len(df)}))
+
+        self._evictar(conservar=huella)
+        return df
+
+    def cargar(self, huella: str) -> pd.DataFrame:
+        ruta = self._ruta(huella)
+        tabla = feather.read_table(ruta, memory_map=True)
+        os.utime(ruta)  # marca de uso para la política de evicción (LRU)
+        # Un bloque por columna en vez de consolidarlas: así pandas usa los buffers mapeados sin copiarlos
+        return tabla.to_pandas(split_blocks=True, self_destruct=True)
+
+    def metadatos(self, huella: str) -> dict:
+        ruta = self._ruta_meta(huella)
+        return json.loads(ruta.read_text()) if ruta.exists() else {}
+
+    def obtener(self, huella: str, datos: bytes, lector) -> pd.DataFrame:
+        """Lee el snapshot si existe; si no, parsea el Excel con `lector` y lo guarda."""
+        if self.existe(huella):
+            try:
+                return self.cargar(huella)
+            except (OSError, ValueError):
+                pass  # snapshot corrupto: se regenera desde el Excel
+        return self.guardar(huella, lector(datos))
+
+    def tamano_total(self) -> int:
+        return sum(r.stat().st_size for r in self.directorio.glob("*.feather"))
+
+    def _evictar(self, conservar: str) -> None:
+        archivos = sorted(self.directorio.glob("*.feather"), key=lambda r: r.stat().st_mtime)
+        total = sum(r.stat().st_size for r in archivos)
+        for ruta in archivos:
+            if total <= self.limite_bytes:
+                break
+            if ruta.stem == conservar:
+                continue
+            tamano = ruta.stat().st_size
+            try:
+                ruta.unlink(missing_ok=True)
+            except OSError:  # en Windows no se puede borrar un snapshot que otra sesión tiene mapeado
+                continue
+            total -= tamano
+            self._ruta_meta(ruta.stem).unlink(missing_ok=True)
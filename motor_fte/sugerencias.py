@@ -0,0 +1,188 @@
+"""Sugerencias para los 'Tipo de Pedido' sin Score y tabla de correcciones guardada.
+
+Los nombres del Power APP que no calzan con el Excel de Pesos suelen ser el
+mismo tipo truncado, sin tildes o con otra puntuación ("...CONSIGNAC",
+"...SEGUI"). `IndiceTipos` arma un índice invertido de trigramas de caracteres
+(pesados con TF-IDF) sobre los tipos de Pesos: para cada nombre sin Score solo
+se recorren las listas de los trigramas que contiene, no todos los tipos, y se
+devuelven los k más parecidos con su similitud coseno (0 a 1).
+
+Las sugerencias que el usuario acepta se guardan en un JSON local y se suman a
+`CORRECCIONES_MANUALES` en la normalización.
+"""
+
+import json
+import os
+import re
+import unicodedata
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from motor_fte.motor import tabla_scores
+from motor_fte.normalizacion import CORRECCIONES_MANUALES, limpiar_texto
+
+RUTA_DEFECTO = Path(os.environ.get("FTE_CACHE_DIR", ".fte_cache")) / "correcciones.json"
+TAMANIO_NGRAMA = 3
+SUGERENCIAS_POR_TIPO = 3
+SIMILITUD_MINIMA = 0.2  # por debajo, el parecido es solo de palabras comunes ('DE', 'SOLICITUD'...)
+CELDAS_POR_LOTE = 2_000_000  # ~16 MB de similitudes por lote
+COLUMNAS_SUGERENCIAS = ['Tipo de Pedido', 'Sugerencia', 'Similitud']
+
+
+# ==============================================================================
+# ÍNDICE DE TRIGRAMAS
+# ==============================================================================
+def texto_comparable(texto) -> str:
+    """Mayúsculas, sin tildes y sin puntuación: 'PRÓRROGAS ,' y 'PRORROGAS,' quedan iguales."""
+    texto = unicodedata.normalize('NFKD', limpiar_texto(texto))
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    return " ".join(re.sub(r'[^0-9A-ZÑ]+', ' ', texto).split())
+
+
+def ngramas(texto: str, n: int = TAMANIO_NGRAMA) -> list[str]:
+    relleno = f" {texto} "
+    return [relleno[i:i + n] for i in range(max(len(relleno) - n + 1, 1))]
+
+
+class IndiceTipos:
+    """Índice invertido trigrama -> (tipos, pesos) sobre los tipos del Excel de Pesos."""
+
+    def __init__(self, tipos, n: int = TAMANIO_NGRAMA):
+        self.n = n
+        self.tipos = np.array(list(dict.fromkeys(t for t in tipos if isinstance(t, str) and t)), dtype=object)
+        self.vocabulario: dict[str, int] = {}
+
+        tipo_ids, gram_ids = [], []
+        for i, tipo in enumerate(self.tipos):
+            for gram in ngramas(texto_comparable(tipo), n):
+                tipo_ids.append(i)
+                gram_ids.append(self.vocabulario.setdefault(gram, len(self.vocabulario)))
+        tipo_ids = np.asarray(tipo_ids, dtype=np.int64)
+        gram_ids = np.asarray(gram_ids, dtype=np.int64)
+
+        # Frecuencia de cada trigrama en cada tipo (pares únicos) e IDF suavizado
+        n_grams = len(self.vocabulario)
+        base = max(n_grams, 1)
+        pares, tf = np.unique(tipo_ids * base + gram_ids, return_counts=True)
+        tipo_ids, gram_ids = pares // base, pares % base
+        frecuencia_doc = np.bincount(gram_ids, minlength=n_grams)
+        self.idf = np.log((1 + len(self.tipos)) / (1 + frecuencia_doc)) + 1
+        self._idf_desconocido = np.log(1 + len(self.tipos)) + 1
+
+        pesos = tf * self.idf[gram_ids]
+        normas = np.sqrt(np.bincount(tipo_ids, weights=pesos ** 2, minlength=len(self.tipos)))
+        pesos = pesos / normas[tipo_ids]
+
+        # Listas invertidas en formato CSR: las del trigrama g están en [inicio[g], inicio[g + 1])
+        orden = np.argsort(gram_ids, kind='stable')
+        self._tipos_lista = tipo_ids[orden]
+        self._pesos_lista = pesos[orden]
+        self._inicio = np.zeros(n_grams + 1, dtype=np.int64)
+        np.cumsum(frecuencia_doc, out=self._inicio[1:])
+
+    def __len__(self) -> int:
+        return len(self.tipos)
+
+    def _similitudes(self, consultas: list[str]) -> np.ndarray:
+        """Matriz (consultas × tipos) de similitud coseno."""
+        fila, ids, tf = [], [], []
+        for i, consulta in enumerate(consultas):
+            for gram, veces in Counter(ngramas(texto_comparable(consulta), self.n)).items():
+                fila.append(i)
+                ids.append(self.vocabulario.get(gram, -1))
+                tf.append(veces)
+        fila, ids = np.asarray(fila, dtype=np.int64), np.asarray(ids, dtype=np.int64)
+        conocidos = ids >= 0
+        # Los trigramas que no están en Pesos no suman similitud, pero sí cuentan en la norma de la consulta
+        pesos = np.asarray(tf) * np.where(conocidos, self.idf[np.maximum(ids, 0)], self._idf_desconocido)
+        pesos = pesos / np.sqrt(np.bincount(fila, weights=pesos ** 2, minlength=len(consultas)))[fila]
+        fila, ids, pesos = fila[conocidos], ids[conocidos], pesos[conocidos]
+
+        # Posiciones de todas las listas invertidas de las consultas, concatenadas sin bucle de Python
+        inicios = self._inicio[ids]
+        largos = self._inicio[ids + 1] - inicios
+        posiciones = np.repeat(inicios - np.cumsum(largos) + largos, largos) + np.arange(largos.sum())
+        celdas = np.repeat(fila, largos) * len(self.tipos) + self._tipos_lista[posiciones]
+        similitudes = np.bincount(
+            celdas, weights=self._pesos_lista[posiciones] * np.repeat(pesos, largos),
+            minlength=len(consultas) * len(self.tipos)
+        )
+        return np.minimum(similitudes, 1.0).reshape(len(consultas), len(self.tipos))
+
+    def sugerir(self, consultas, k: int = SUGERENCIAS_POR_TIPO, similitud_minima: float = SIMILITUD_MINIMA) -> pd.DataFrame:
+        """Una fila por (consulta, sugerencia), de mayor a menor similitud dentro de cada consulta."""
+        consultas = list(dict.fromkeys(consultas))
+        if not len(self.tipos) or not consultas:
+            return pd.DataFrame(columns=COLUMNAS_SUGERENCIAS)
+        k = min(k, len(self.tipos))
+        # Por lotes, para que la matriz consultas × tipos no pase de CELDAS_POR_LOTE
+        lote = max(CELDAS_POR_LOTE // len(self.tipos), 1)
+        partes = []
+        for desde in range(0, len(consultas), lote):
+            bloque = consultas[desde:desde + lote]
+            similitudes = self._similitudes(bloque)
+            mejores = np.argpartition(-similitudes, k - 1, axis=1)[:, :k]
+            valores = np.take_along_axis(similitudes, mejores, axis=1)
+            orden = np.argsort(-valores, axis=1, kind='stable')
+            mejores, valores = np.take_along_axis(mejores, orden, axis=1), np.take_along_axis(valores, orden, axis=1)
+            partes.append(pd.DataFrame({
+                'Tipo de Pedido': np.repeat(np.asarray(bloque, dtype=object), k),
+                'Sugerencia': self.tipos[mejores.ravel()],
+                'Similitud': valores.ravel(),
+            }))
+        sugerencias = pd.concat(partes, ignore_index=True)
+        return sugerencias[sugerencias['Similitud'] >= max(similitud_minima, np.finfo(float).tiny)].reset_index(drop=True)
+
+    def buscar(self, consulta: str, k: int = SUGERENCIAS_POR_TIPO,
+               similitud_minima: float = SIMILITUD_MINIMA) -> list[tuple[str, float]]:
+        """Los k tipos más parecidos a `consulta`, del más al menos parecido."""
+        sugerencias = self.sugerir([consulta], k, similitud_minima)
+        return list(zip(sugerencias['Sugerencia'], sugerencias['Similitud'].astype(float)))
+
+
+def indice_pesos(df_pesos: pd.DataFrame) -> IndiceTipos:
+    """Índice sobre los tipos del Excel de Pesos que tienen Score, con el mismo texto limpio que el cruce."""
+    return IndiceTipos(t for t, score in tabla_scores(df_pesos).items() if pd.notna(score))
+
+
+# ==============================================================================
+# CORRECCIONES GUARDADAS
+# ==============================================================================
+class AlmacenCorrecciones:
+    """Correcciones aceptadas por el usuario (nombre del Power APP -> tipo de Pesos) en un JSON local."""
+
+    def __init__(self, ruta=RUTA_DEFECTO):
+        self.ruta = Path(ruta)
+
+    def cargar(self) -> dict[str, str]:
+        try:
+            return dict(json.loads(self.ruta.read_text(encoding="utf-8")))
+        except (OSError, ValueError):
+            return {}
+
+    def _escribir(self, correcciones: dict[str, str]) -> None:
+        self.ruta.parent.mkdir(parents=True, exist_ok=True)
+        temporal = self.ruta.with_suffix(".tmp")
+        temporal.write_text(json.dumps(dict(sorted(correcciones.items())), ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(temporal, self.ruta)
+
+    def agregar(self, nuevas: dict[str, str]) -> None:
+        correcciones = self.cargar()
+        correcciones.update({limpiar_texto(k): limpiar_texto(v) for k, v in nuevas.items()})
+        self._escribir(correcciones)
+
+    def quitar(self, nombres) -> None:
+        correcciones = self.cargar()
+        for nombre in nombres:
+            correcciones.pop(nombre, None)
+        self._escribir(correcciones)
+
+    def vigentes(self, base: dict[str, str] = CORRECCIONES_MANUALES) -> dict[str, str]:
+        """`base` más las guardadas; si una guardada corrige el destino de una de `base`, se encadenan."""
+        guardadas = self.cargar()
+        combinadas = {k: guardadas.get(v, v) for k, v in base.items()}
+        combinadas.update(guardadas)
+        return combinadas